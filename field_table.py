@@ -0,0 +1,182 @@
+# Virtualized field editor: the fields of a model live in a plain list of
+# FieldSpec objects and are shown through a QTableView. No widget exists per
+# field, editors are created by the delegates only for the cell being edited.
+from PySide6.QtWidgets import QTableView, QStyledItemDelegate, QComboBox, QHeaderView, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from odoomaster import FIELD_TYPES, FieldSpec
+
+
+NAME, TYPE, LABEL, REQUIRED, RULES = range(5)
+HEADERS = ("Field Name", "Type", "Field Label", "Required", "Rules")
+
+# Roles changed by set_issues(), they do not mean the field was edited
+ISSUE_ROLES = (Qt.BackgroundRole, Qt.ToolTipRole)
+ISSUE_COLOR = QColor(255, 220, 220)
+
+
+def describe_rules(field):
+    # Short read-only summary of the validation/selection/database settings of a field
+    rules = _describe_type_rules(field)
+    flags = [flag for flag, enabled in (("unique", field.unique), ("indexed", field.index),
+                                        ("search", field.searchable), ("filter", field.filterable),
+                                        ("group", field.groupable)) if enabled]
+    return ", ".join(([rules] if rules else []) + flags)
+
+
+def _describe_bounds(minimum, maximum):
+    # A missing bound is not checked: '>= 5', '<= 20' or '5 .. 20'
+    if minimum is None:
+        return f"<= {maximum}"
+    if maximum is None:
+        return f">= {minimum}"
+    return f"{minimum} .. {maximum}"
+
+
+def _describe_type_rules(field):
+    if field.field_type == 'Many2one':
+        return f"-> {field.comodel}" if field.comodel else "no comodel"
+    if field.field_type == 'Selection':
+        count = len([key for key, value in field.selection if key and value])
+        return f"{count} option{'s' if count != 1 else ''}"
+    if field.field_type in ('Integer', 'Float') and (field.min_value is not None or field.max_value is not None):
+        return _describe_bounds(field.min_value, field.max_value)
+    if field.field_type == 'Char' and field.size and field.min_length is None and field.max_length is None:
+        return f"size {field.size}"
+    if field.field_type in ('Char', 'Text') and (field.min_length is not None or field.max_length is not None):
+        return "len " + _describe_bounds(field.min_length, field.max_length)
+    return ""
+
+
+class FieldTableModel(QAbstractTableModel):
+    def __init__(self, fields=None, parent=None):
+        super().__init__(parent)
+        self.fields = list(fields or ())
+        # Row -> validation messages, shown as a red row with a tooltip
+        self.issues = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == REQUIRED:
+            flags |= Qt.ItemIsUserCheckable
+        elif index.column() != RULES:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        field = self.fields[index.row()]
+        column = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == NAME:
+                return field.name
+            if column == TYPE:
+                return field.field_type
+            if column == LABEL:
+                # Show the generated fallback label without storing it
+                return field.string if role == Qt.EditRole or field.string else field.label
+            if column == RULES:
+                return describe_rules(field)
+        elif role == Qt.CheckStateRole and column == REQUIRED:
+            return Qt.Checked if field.required else Qt.Unchecked
+        elif role == Qt.ForegroundRole and column == LABEL and not field.string:
+            return QColor(Qt.gray)
+        elif role == Qt.BackgroundRole and index.row() in self.issues:
+            return ISSUE_COLOR
+        elif role == Qt.ToolTipRole and index.row() in self.issues:
+            return "\n".join(self.issues[index.row()])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        field = self.fields[index.row()]
+        column = index.column()
+
+        if role == Qt.CheckStateRole and column == REQUIRED:
+            field.required = Qt.CheckState(value) == Qt.Checked
+        elif role == Qt.EditRole and column == NAME:
+            field.name = value.strip()
+        elif role == Qt.EditRole and column == TYPE and value in FIELD_TYPES:
+            field.field_type = value
+        elif role == Qt.EditRole and column == LABEL:
+            field.string = value
+        else:
+            return False
+
+        self.field_changed(index.row())
+        return True
+
+    def field_changed(self, row):
+        # Called after a FieldSpec was edited, in the table or elsewhere
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    def set_issues(self, issues):
+        # issues: row -> list of messages; only rows whose state changed are repainted
+        changed = {row for row in self.issues.keys() | issues.keys()
+                   if self.issues.get(row) != issues.get(row) and row < len(self.fields)}
+        self.issues = issues
+        for row in changed:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1), list(ISSUE_ROLES))
+
+    def add_field(self, field=None):
+        row = len(self.fields)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.fields.append(field or FieldSpec(''))
+        self.endInsertRows()
+        return row
+
+    def remove_field(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.fields[row]
+        self.endRemoveRows()
+
+
+class FieldTypeDelegate(QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(FIELD_TYPES)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+
+class FieldTable(QTableView):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegateForColumn(TYPE, FieldTypeDelegate(self))
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+                             | QAbstractItemView.AnyKeyPressed | QAbstractItemView.SelectedClicked)
+
+        # Fixed row heights keep scrolling and relayout O(visible rows). The
+        # row header is hidden, sizing it asks the model about every row.
+        vertical = self.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(self.fontMetrics().height() + 10)
+        vertical.hide()
+
+        horizontal = self.horizontalHeader()
+        horizontal.setSectionResizeMode(QHeaderView.Interactive)
+        horizontal.setSectionResizeMode(LABEL, QHeaderView.Stretch)
+        self.setMinimumHeight(180)
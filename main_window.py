@@ -1,16 +1,140 @@
 # Importamos los widgets necesarios de PySide6
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                               QPushButton, QLineEdit, QLabel, QComboBox, 
-                              QTableWidget, QTableWidgetItem, QSpinBox,
-                              QCheckBox, QMessageBox, QFileDialog, QApplication)
-from PySide6.QtCore import Qt
+                              QTableWidget, QTableWidgetItem, QSpinBox, QDoubleSpinBox,
+                              QCheckBox, QMessageBox, QFileDialog, QApplication,
+                              QCompleter, QProgressBar, QScrollArea, QToolButton, QSizePolicy)
+from PySide6.QtCore import Qt, Signal, QStringListModel, QObject, QRunnable, QThreadPool, QTimer
+from PySide6.QtGui import QKeySequence
 import os
 import sys
+import threading
+
+from field_table import ISSUE_ROLES, NAME, FieldTable, FieldTableModel
+
+from odoomaster import (ARCHIVE_FORMATS, FIELD_TYPES, FieldSpec, ModelIndex, ModelSpec, ModuleSpec,
+                        GenerationStats, SpecError, SpecValidator, cache_path, default_addons_paths,
+                        load_spec, save_spec, timed,
+                        generate_archive, generate_bash_script, generate_module,
+                        iter_module_files, module_file_count, validate_spec, verify_module)
+from odoomaster.validation import is_number
+
+
+# Projects are saved as module specs (the JSON read by `python -m odoomaster generate`)
+PROJECT_FILTER = "OdooMaster project (*.json)"
+
+# Autosave runs once edits pause for this long
+AUTOSAVE_DELAY_MS = 1000
+
+# Edited models are revalidated once typing pauses for this long
+VALIDATION_DELAY_MS = 300
+
+
+def autosave_path():
+    # Where a project that was never saved is autosaved, restored on next start
+    return cache_path('autosave.json')
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+class GenerationSignals(QObject):
+    progress = Signal(int, int, str)  # done, total, current artifact
+    writing = Signal()                # the module tree is being written, no more cancelling
+    finished = Signal(object)         # (report, installer message, stats, verification)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class GenerationWorker(QRunnable):
+    # Renders and writes a module on a QThreadPool thread. Rendering can be
+    # cancelled file by file; once the module tree is being written the run
+    # completes, so a cancelled run never leaves a half-written module behind.
+    def __init__(self, spec, output_dir, archive_format=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.spec = spec
+        self.output_dir = output_dir
+        self.archive_format = archive_format
+        self.signals = GenerationSignals()
+        self._cancel = threading.Event()
+        self._done = 0
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            result = self.generate()
+        except GenerationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+    def step(self, total, artifact):
+        self._done += 1
+        self.signals.progress.emit(self._done, total, artifact)
+
+    def generate(self):
+        spec = self.spec
+        count = module_file_count(spec)
+        # Render and write every file, then the installer
+        total = 2 * count + 1
+        stats = GenerationStats()
+        with timed(stats):
+            files = {}
+            for rel_path, content in iter_module_files(spec, stats):
+                if self._cancel.is_set():
+                    raise GenerationCancelled()
+                files[rel_path] = content
+                self.step(total, f"Rendering {rel_path}")
+            if self._cancel.is_set():
+                raise GenerationCancelled()
+
+            self.signals.writing.emit()
+            report = generate_module(spec, self.output_dir, files, stats,
+                                     lambda rel_path: self.step(total, f"Writing {rel_path}"))
+
+            if self.archive_format:
+                archive_path, script_path = generate_archive(spec, self.output_dir, files,
+                                                             self.archive_format)
+                installer_msg = (f"Archive generated at {archive_path}\n"
+                                 f"Installer generated at {script_path}")
+            else:
+                script_path = generate_bash_script(spec, self.output_dir, files, stats)
+                installer_msg = f"Bash script generated at {script_path}"
+            self.step(total, os.path.basename(script_path))
+            # In process: forking from a Qt application is unsafe
+            with stats.phase('verify'):
+                verification = verify_module(report.module_path, workers=1)
+        return report, installer_msg, stats, verification
+
+
+# Range of the value and length spinboxes: Qt's int limit, PostgreSQL's varchar limit
+VALUE_LIMIT = 2 ** 31 - 1
+LENGTH_LIMIT = 10485760
+
+# Attributes shown by the type specific widgets
+TYPE_RULES = ('min_value', 'max_value', 'min_length', 'max_length', 'size', 'comodel')
+
+# Bounds edited together, see ModelFieldWidget.store_rule
+RULE_PAIRS = {'min_value': ('min_value', 'max_value'), 'max_value': ('min_value', 'max_value'),
+              'min_length': ('min_length', 'max_length'), 'max_length': ('min_length', 'max_length')}
+
 
 class ModelFieldWidget(QWidget):
-    def __init__(self):
+    # Detail editor for the field selected in the model's field table
+    changed = Signal()
+
+    def __init__(self, completion_model=None):
         super().__init__()
         layout = QVBoxLayout(self)  # Changed to VBoxLayout for better organization
+        self.completion_model = completion_model
+        self.field = None
+        self._loading = False
         
         # Main field properties layout
         main_layout = QHBoxLayout()
@@ -21,14 +145,20 @@ class ModelFieldWidget(QWidget):
         
         # Tipo de campo
         self.field_type = QComboBox()
-        self.field_type.addItems([
-            'Char', 'Text', 'Integer', 'Float', 'Boolean', 
-            'Date', 'Datetime', 'Selection', 'Many2one'
-        ])
+        self.field_type.addItems(FIELD_TYPES)
         
         # Required checkbox
         self.required = QCheckBox("Required")
         
+        # Database options: btree index and UNIQUE constraint
+        self.index = QCheckBox("Indexed")
+        self.unique = QCheckBox("Unique")
+        
+        # Search view entries (the columns get an index as well)
+        self.searchable = QCheckBox("Searchable")
+        self.filterable = QCheckBox("Filter")
+        self.groupable = QCheckBox("Group By")
+        
         # String (label)
         self.string = QLineEdit()
         self.string.setPlaceholderText("Field Label")
@@ -38,53 +168,126 @@ class ModelFieldWidget(QWidget):
         main_layout.addWidget(self.field_type)
         main_layout.addWidget(self.string)
         main_layout.addWidget(self.required)
+        main_layout.addWidget(self.index)
+        main_layout.addWidget(self.unique)
         layout.addLayout(main_layout)
         
-        # Selection options widget (initialize before connecting signal)
-        self.selection_layout = QVBoxLayout()
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("Search view:"))
+        search_layout.addWidget(self.searchable)
+        search_layout.addWidget(self.filterable)
+        search_layout.addWidget(self.groupable)
+        search_layout.addStretch()
+        layout.addLayout(search_layout)
+        
+        # Selection options and validation spinboxes are only built the first
+        # time a field type needs them (see selection_box/validation_widgets)
         self.selection_options = []
-        self.add_selection_btn = QPushButton("Add Selection Option")
-        self.add_selection_btn.clicked.connect(self.add_selection_option)
-        self.add_selection_btn.hide()
-        layout.addLayout(self.selection_layout)
-        layout.addWidget(self.add_selection_btn)
+        self._selection_box = None
+        # Field type -> (min, max) spinboxes, integer ones for Integer and
+        # decimal ones for Float
+        self.value_bounds = {}
+        self.min_length = self.max_length = None
+        self.size = None
+        self.comodel = None
+        
+        # Selection options container, inserted here when first needed
+        self.selection_slot = QVBoxLayout()
+        layout.addLayout(self.selection_slot)
         
         # Validation layout
         self.validation_layout = QHBoxLayout()
         layout.addLayout(self.validation_layout)
         
-        # Initialize validation widgets
-        self.init_validation_widgets()
-        
         # Connect signal after all widgets are initialized
         self.field_type.currentTextChanged.connect(self.on_field_type_changed)
         self.on_field_type_changed(self.field_type.currentText())
 
-    def init_validation_widgets(self):
-        # Numeric validation
-        self.min_value = QSpinBox()
-        self.min_value.setMinimum(-999999)
-        self.min_value.setMaximum(999999)
-        self.min_value.setValue(0)
-        self.min_value.setPrefix("Min: ")
-        
-        self.max_value = QSpinBox()
-        self.max_value.setMinimum(-999999)
-        self.max_value.setMaximum(999999)
-        self.max_value.setValue(100)
-        self.max_value.setPrefix("Max: ")
-        
-        # String validation
-        self.min_length = QSpinBox()
-        self.min_length.setMinimum(0)
-        self.min_length.setMaximum(1000)
-        self.min_length.setPrefix("Min Length: ")
-        
-        self.max_length = QSpinBox()
-        self.max_length.setMinimum(0)
-        self.max_length.setMaximum(1000)
-        self.max_length.setValue(100)
-        self.max_length.setPrefix("Max Length: ")
+        # Every edit is written back to the bound FieldSpec, only the
+        # attribute the edited widget shows
+        self.name.textEdited.connect(lambda: self.store('name'))
+        self.string.textEdited.connect(lambda: self.store('string'))
+        self.required.toggled.connect(lambda: self.store('required'))
+        self.index.toggled.connect(lambda: self.store('index'))
+        self.unique.toggled.connect(lambda: self.store('unique'))
+        self.searchable.toggled.connect(lambda: self.store('searchable'))
+        self.filterable.toggled.connect(lambda: self.store('filterable'))
+        self.groupable.toggled.connect(lambda: self.store('groupable'))
+        # The rules of the old type are dropped with it
+        self.field_type.currentTextChanged.connect(lambda: self.store('field_type', *TYPE_RULES))
+
+    def _spinbox(self, minimum, maximum, value, prefix, attr, decimals=None):
+        spinbox = QSpinBox() if decimals is None else QDoubleSpinBox()
+        if decimals is not None:
+            spinbox.setDecimals(decimals)
+        spinbox.setMinimum(minimum)
+        spinbox.setMaximum(maximum)
+        spinbox.setValue(value)
+        spinbox.setPrefix(prefix)
+        spinbox.valueChanged.connect(lambda: self.store_rule(attr))
+        return spinbox
+
+    @staticmethod
+    def show_bound(spinbox, value, default):
+        # Only displays the bound: the spec keeps what a spinbox cannot hold
+        # (a fraction in an integer box, a value out of range, not a number)
+        if not is_number(value):
+            value = default
+        value = min(max(value, spinbox.minimum()), spinbox.maximum())
+        spinbox.setValue(int(value) if isinstance(spinbox, QSpinBox) else value)
+
+    def validation_widgets(self, field_type):
+        # Created the first time a field type needs them, then reused
+        if field_type in ['Integer', 'Float']:
+            if field_type not in self.value_bounds:
+                # Numeric validation
+                decimals = 6 if field_type == 'Float' else None
+                self.value_bounds[field_type] = (
+                    self._spinbox(-VALUE_LIMIT, VALUE_LIMIT, 0, "Min: ", 'min_value', decimals),
+                    self._spinbox(-VALUE_LIMIT, VALUE_LIMIT, 100, "Max: ", 'max_value', decimals))
+                self.load_validation_values()
+            return self.value_bounds[field_type]
+        if field_type in ['Char', 'Text']:
+            if self.min_length is None:
+                # String validation
+                self.min_length = self._spinbox(0, LENGTH_LIMIT, 0, "Min Length: ", 'min_length')
+                self.max_length = self._spinbox(0, LENGTH_LIMIT, 100, "Max Length: ", 'max_length')
+                self.load_validation_values()
+            if field_type == 'Text':
+                return self.min_length, self.max_length
+            if self.size is None:
+                # varchar(size) column, 0 means unlimited
+                self.size = self._spinbox(0, LENGTH_LIMIT, 0, "Size: ", 'size')
+                self.size.setSpecialValueText("Size: none")
+                self.load_validation_values()
+            return self.min_length, self.max_length, self.size
+        if field_type == 'Many2one':
+            if self.comodel is None:
+                # Target model, completed from the addons model index
+                self.comodel = QLineEdit()
+                self.comodel.setPlaceholderText("Comodel (e.g., res.partner)")
+                if self.completion_model is not None:
+                    completer = QCompleter(self.completion_model, self.comodel)
+                    completer.setCaseSensitivity(Qt.CaseInsensitive)
+                    completer.setModelSorting(QCompleter.CaseSensitivelySortedModel)
+                    self.comodel.setCompleter(completer)
+                self.comodel.textChanged.connect(lambda: self.store('comodel'))
+                self.load_validation_values()
+            return (self.comodel,)
+        return ()
+
+    def selection_box(self):
+        if self._selection_box is None:
+            self._selection_box = QWidget()
+            box_layout = QVBoxLayout(self._selection_box)
+            box_layout.setContentsMargins(0, 0, 0, 0)
+            self.selection_layout = QVBoxLayout()
+            add_selection_btn = QPushButton("Add Selection Option")
+            add_selection_btn.clicked.connect(lambda: self.add_selection_option())
+            box_layout.addLayout(self.selection_layout)
+            box_layout.addWidget(add_selection_btn)
+            self.selection_slot.addWidget(self._selection_box)
+        return self._selection_box
 
     def on_field_type_changed(self, field_type):
         # Clear current validation widgets
@@ -93,72 +296,129 @@ class ModelFieldWidget(QWidget):
             if item.widget():
                 item.widget().hide()
         
-        # Add appropriate validation widgets based on field type
-        if field_type in ['Integer', 'Float']:
-            self.validation_layout.addWidget(self.min_value)
-            self.validation_layout.addWidget(self.max_value)
-            self.min_value.show()
-            self.max_value.show()
-        elif field_type in ['Char', 'Text']:
-            self.validation_layout.addWidget(self.min_length)
-            self.validation_layout.addWidget(self.max_length)
-            self.min_length.show()
-            self.max_length.show()
+        # Add appropriate validation widgets based on field type (nothing is
+        # built while no field is bound)
+        if self.field is None:
+            return
+        for widget in self.validation_widgets(field_type):
+            self.validation_layout.addWidget(widget)
+            widget.show()
         
         # Show/hide selection options based on field type
-        self.add_selection_btn.setVisible(field_type == 'Selection')
-        
-        # Hide all selection options if not Selection type
-        for i in range(self.selection_layout.count()):
-            layout = self.selection_layout.itemAt(i)
-            if layout:
-                for j in range(layout.count()):
-                    widget = layout.itemAt(j).widget()
-                    if widget:
-                        widget.setVisible(field_type == 'Selection')
-
-    def get_validation_code(self):
+        if field_type == 'Selection':
+            self.selection_box().show()
+        elif self._selection_box is not None:
+            self._selection_box.hide()
+
+    def load_validation_values(self):
+        # Copy the rules of the bound field into whichever spinboxes exist
+        field = self.field
+        if field is None:
+            return
+        loading, self._loading = self._loading, True
+        for minimum, maximum in self.value_bounds.values():
+            self.show_bound(minimum, field.min_value, 0)
+            self.show_bound(maximum, field.max_value, 100)
+        if self.min_length is not None:
+            self.show_bound(self.min_length, field.min_length, 0)
+            self.show_bound(self.max_length, field.max_length, 100)
+        if self.size is not None:
+            self.show_bound(self.size, field.size, 0)
+        if self.comodel is not None:
+            self.comodel.setText(field.comodel)
+        self._loading = loading
+
+    def bind(self, field):
+        # Load a FieldSpec into the widgets without writing it back
+        self._loading = True
+        self.field = field
+        self.name.setText(field.name)
+        self.string.setText(field.string)
+        self.required.setChecked(field.required)
+        self.index.setChecked(field.index)
+        self.unique.setChecked(field.unique)
+        self.searchable.setChecked(field.searchable)
+        self.filterable.setChecked(field.filterable)
+        self.groupable.setChecked(field.groupable)
+        self.field_type.setCurrentText(field.field_type)
+        self.load_validation_values()
+
+        while self.selection_options:
+            self.remove_selection_option(self.selection_layout.itemAt(0))
+        for key, value in field.selection:
+            self.add_selection_option(key, value)
+
+        self.on_field_type_changed(field.field_type)
+        self._loading = False
+
+    def store(self, *attrs):
+        # Writes the given attributes back; the others keep their values even
+        # when their widgets could not show them exactly
+        if self._loading or self.field is None:
+            return
+        edited = self.to_spec()
+        for attr in attrs:
+            setattr(self.field, attr, getattr(edited, attr))
+        self.changed.emit()
+
+    def store_rule(self, attr):
+        # A new rule takes both spinboxes of the pair, an existing one only
+        # the edited side
+        pair = RULE_PAIRS.get(attr, (attr,))
+        if self.field is not None and all(getattr(self.field, side) is None for side in pair):
+            self.store(*pair)
+        else:
+            self.store(attr)
+
+    def to_spec(self):
         field_type = self.field_type.currentText()
-        validation_code = []
-        
-        if field_type in ['Integer', 'Float']:
-            min_val = self.min_value.value()
-            max_val = self.max_value.value()
-            if min_val != 0 or max_val != 100:
-                validation_code.append(f"""
-    @api.constrains('{self.name.text()}')
-    def _check_{self.name.text()}_value(self):
-        for record in self:
-            if record.{self.name.text()}:
-                if record.{self.name.text()} < {min_val} or record.{self.name.text()} > {max_val}:
-                    raise ValidationError(f'El valor de {self.string.text()} debe estar entre {min_val} y {max_val}')
-""")
-        
-        elif field_type in ['Char', 'Text']:
-            min_len = self.min_length.value()
-            max_len = self.max_length.value()
-            if min_len != 0 or max_len != 100:
-                validation_code.append(f"""
-    @api.constrains('{self.name.text()}')
-    def _check_{self.name.text()}_length(self):
-        for record in self:
-            if record.{self.name.text()}:
-                if len(record.{self.name.text()}) < {min_len} or len(record.{self.name.text()}) > {max_len}:
-                    raise ValidationError(f'La longitud de {self.string.text()} debe estar entre {min_len} y {max_len} caracteres')
-""")
-        
-        return validation_code
-
-    def add_selection_option(self):
+        field = FieldSpec(self.name.text(), field_type, self.string.text(),
+                          self.required.isChecked(),
+                          [(key.text(), value.text()) for key, value in self.selection_options],
+                          index=self.index.isChecked(), unique=self.unique.isChecked(),
+                          searchable=self.searchable.isChecked(),
+                          filterable=self.filterable.isChecked(),
+                          groupable=self.groupable.isChecked())
+
+        # Only rules that differ from the spinbox defaults are generated
+        if field_type in self.value_bounds:
+            field.min_value, field.max_value = self.rule_bounds(
+                *self.value_bounds[field_type], 'min_value', 'max_value')
+        elif field_type in ['Char', 'Text'] and self.min_length is not None:
+            field.min_length, field.max_length = self.rule_bounds(
+                self.min_length, self.max_length, 'min_length', 'max_length')
+        if field_type == 'Char' and self.size is not None and self.size.value():
+            field.size = self.size.value()
+        if field_type == 'Many2one' and self.comodel is not None:
+            field.comodel = self.comodel.text().strip()
+
+        return field
+
+    def rule_bounds(self, minimum, maximum, min_attr, max_attr):
+        # Both bounds once either spinbox left its default (0 and 100); a
+        # one-sided rule (e.g. imported) keeps its missing side while that
+        # spinbox still shows the default
+        values = (minimum.value(), maximum.value())
+        current = (getattr(self.field, min_attr), getattr(self.field, max_attr)) \
+            if self.field is not None else (None, None)
+        if current == (None, None):
+            return (None, None) if values == (0, 100) else values
+        return tuple(None if bound is None and value == default else value
+                     for bound, value, default in zip(current, values, (0, 100)))
+
+    def add_selection_option(self, key_text='', value_text=''):
+        self.selection_box()
         option_layout = QHBoxLayout()
         
         # Key input
-        key = QLineEdit()
+        key = QLineEdit(key_text)
         key.setPlaceholderText("Option Key (e.g., 'draft')")
+        key.textEdited.connect(lambda: self.store('selection'))
         
         # Value input
-        value = QLineEdit()
+        value = QLineEdit(value_text)
         value.setPlaceholderText("Option Label (e.g., 'Draft')")
+        value.textEdited.connect(lambda: self.store('selection'))
         
         # Remove button
         remove_btn = QPushButton("X")
@@ -177,17 +437,23 @@ class ModelFieldWidget(QWidget):
         for i in range(self.selection_layout.count()):
             if self.selection_layout.itemAt(i) == layout:
                 self.selection_options.pop(i)
+                self.selection_layout.takeAt(i)
                 while layout.count():
                     item = layout.takeAt(0)
                     if item.widget():
                         item.widget().deleteLater()
                 break
+        self.store('selection')
         
 
 class ModelWidget(QWidget):
-    def __init__(self):
+    # Any edit of the model or of one of its fields
+    changed = Signal()
+
+    def __init__(self, completion_model=None, spec=None):
         super().__init__()
         layout = QVBoxLayout(self)
+        self._syncing = False
         
         # Nombre del modelo
         model_layout = QHBoxLayout()
@@ -195,30 +461,191 @@ class ModelWidget(QWidget):
         self.model_name.setPlaceholderText("Model Name (e.g., res.partner)")
         model_layout.addWidget(QLabel("Model:"))
         model_layout.addWidget(self.model_name)
+        
+        # Default sort order and page size of the list view
+        self.order = QLineEdit()
+        self.order.setPlaceholderText("Order (e.g., date desc, id desc)")
+        self.limit = QSpinBox()
+        self.limit.setMaximum(100000)
+        self.limit.setSpecialValueText("Limit: default")
+        self.limit.setPrefix("Limit: ")
+        model_layout.addWidget(self.order)
+        model_layout.addWidget(self.limit)
         layout.addLayout(model_layout)
         
-        # Lista de campos
-        self.fields = []
-        self.fields_layout = QVBoxLayout()
-        layout.addLayout(self.fields_layout)
+        # Validation problems of the model itself; field problems are shown in the table
+        self.issues_label = QLabel()
+        self.issues_label.setStyleSheet("color: #b00020")
+        self.issues_label.setWordWrap(True)
+        self.issues_label.hide()
+        layout.addWidget(self.issues_label)
         
-        # Botón para añadir campo
+        # Lista de campos: tabla virtualizada y un único editor para la fila activa
+        self.field_model = FieldTableModel(spec.fields if spec else ())
+        self.field_table = FieldTable(self.field_model)
+        self.field_editor = ModelFieldWidget(completion_model)
+        self.field_editor.setEnabled(False)
+        layout.addWidget(self.field_table)
+        layout.addWidget(self.field_editor)
+
+        self.field_table.selectionModel().currentRowChanged.connect(self.on_current_field_changed)
+        self.field_model.dataChanged.connect(self.on_table_edited)
+        self.field_editor.changed.connect(self.on_field_edited)
+        
+        # Botones para añadir y quitar campos
+        fields_buttons = QHBoxLayout()
         add_field_btn = QPushButton("Add Field")
         add_field_btn.clicked.connect(self.add_field)
-        layout.addWidget(add_field_btn)
+        remove_field_btn = QPushButton("Remove Field")
+        remove_field_btn.clicked.connect(self.remove_field)
+        fields_buttons.addWidget(add_field_btn)
+        fields_buttons.addWidget(remove_field_btn)
+        layout.addLayout(fields_buttons)
         
-        self.add_field()  # Añadir un campo inicial
+        if spec is None:
+            self.add_field()  # Añadir un campo inicial
+        else:
+            self.model_name.setText(spec.name)
+            self.order.setText(spec.order)
+            self.limit.setValue(spec.limit or 0)
+            if spec.fields:
+                self.field_table.setCurrentIndex(self.field_model.index(0, NAME))
+
+        for signal in (self.model_name.textChanged, self.order.textChanged, self.limit.valueChanged,
+                       self.field_model.rowsInserted, self.field_model.rowsRemoved):
+            signal.connect(self.changed)
+
+    @property
+    def fields(self):
+        return self.field_model.fields
 
     def add_field(self):
-        field = ModelFieldWidget()
-        self.fields.append(field)
-        self.fields_layout.addWidget(field)
+        row = self.field_model.add_field()
+        index = self.field_model.index(row, NAME)
+        self.field_table.setCurrentIndex(index)
+        self.field_table.scrollTo(index)
+
+    def remove_field(self):
+        row = self.field_table.currentIndex().row()
+        if row >= 0:
+            self.field_model.remove_field(row)
+        row = self.field_table.currentIndex().row()
+        if row >= 0:
+            self.field_editor.bind(self.fields[row])
+        else:
+            self.field_editor.field = None
+            self.field_editor.setEnabled(False)
+
+    def on_current_field_changed(self, current, previous):
+        if current.isValid():
+            self.field_editor.bind(self.fields[current.row()])
+            self.field_editor.setEnabled(True)
+
+    def on_table_edited(self, top_left, bottom_right, roles=()):
+        if roles and all(role in ISSUE_ROLES for role in roles):
+            return
+        self.changed.emit()
+        # Refresh the detail editor when its row was edited in the table
+        row = self.field_table.currentIndex().row()
+        if not self._syncing and top_left.row() <= row <= bottom_right.row():
+            self.field_editor.bind(self.fields[row])
+
+    def show_issues(self, issues):
+        rows = {}
+        for issue in issues:
+            if issue.row is not None:
+                rows.setdefault(issue.row, []).append(issue.message)
+        self.field_model.set_issues(rows)
+        messages = [issue.message for issue in issues if issue.row is None]
+        self.issues_label.setText("\n".join(messages))
+        self.issues_label.setVisible(bool(messages))
+
+    def on_field_edited(self):
+        row = self.field_table.currentIndex().row()
+        if row >= 0:
+            self._syncing = True
+            self.field_model.field_changed(row)
+            self._syncing = False
+
+    def to_spec(self):
+        return ModelSpec(self.model_name.text(), list(self.fields),
+                         self.order.text().strip(), self.limit.value() or None)
+
+
+class ModelPanel(QWidget):
+    # Collapsible entry of the model list. Until it is expanded only the
+    # ModelSpec and a header button exist; the editor is built on first use,
+    # so opening a project with hundreds of models stays fast.
+    changed = Signal()
+
+    def __init__(self, spec, completion_model=None):
+        super().__init__()
+        self.spec = spec
+        self.completion_model = completion_model
+        self.editor = None
+        self.issues = []
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.header = QToolButton()
+        self.header.setCheckable(True)
+        self.header.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.header.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.header.setArrowType(Qt.RightArrow)
+        self.header.toggled.connect(self.set_expanded)
+        layout.addWidget(self.header)
+        self.update_header()
+
+    def update_header(self):
+        spec = self.to_spec()
+        count = len([field for field in spec.fields if field.name])
+        text = f"{spec.name or 'New model'}  ({count} field{'s' if count != 1 else ''})"
+        if self.issues:
+            text += f"  - {len(self.issues)} problem{'s' if len(self.issues) != 1 else ''}"
+        self.header.setText(text)
+
+    def show_issues(self, issues):
+        if not issues and not self.issues:
+            return
+        # Style sheets are slow to apply, only touched when the state flips
+        if bool(issues) != bool(self.issues):
+            self.header.setStyleSheet("color: #b00020" if issues else "")
+        self.issues = issues
+        self.update_header()
+        if self.editor is not None:
+            self.editor.show_issues(issues)
+
+    def set_expanded(self, expanded):
+        if expanded and self.editor is None:
+            self.editor = ModelWidget(self.completion_model, self.spec)
+            self.editor.changed.connect(self.update_header)
+            self.editor.changed.connect(self.changed)
+            self.editor.show_issues(self.issues)
+            self.layout().addWidget(self.editor)
+        if self.editor is not None:
+            self.editor.setVisible(expanded)
+        self.header.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+        if self.header.isChecked() != expanded:
+            self.header.setChecked(expanded)
+
+    def to_spec(self):
+        return self.editor.to_spec() if self.editor is not None else self.spec
 
 class MainWindow(QMainWindow):
+    index_refreshed = Signal(list)
+
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("OdooMaster - Module Generator")
         self.setMinimumSize(800, 600)
+        self.project_path = None
+        self._loading = False
+        
+        # Índice de modelos de los addons para completar los comodel de Many2one.
+        # The saved index is usable at once and refreshed in the background.
+        self.model_index = ModelIndex.load()
+        self.model_completions = QStringListModel(self.model_index.models())
+        self.index_refreshed.connect(self.model_completions.setStringList)
+        threading.Thread(target=self.refresh_model_index, daemon=True).start()
         
         # Widget central
         central_widget = QWidget()
@@ -252,571 +679,354 @@ class MainWindow(QMainWindow):
         category_layout.addWidget(self.category)
         module_layout.addLayout(category_layout)
         
+        # Dependencias además de 'base' y de las que piden los comodels
+        depends_layout = QHBoxLayout()
+        self.depends = QLineEdit()
+        self.depends.setPlaceholderText("Extra depends (e.g., sale, stock)")
+        depends_layout.addWidget(QLabel("Depends:"))
+        depends_layout.addWidget(self.depends)
+        module_layout.addLayout(depends_layout)
+        
+        # Range/length rules as _sql_constraints or as @api.constrains methods
+        self.sql_constraints = QCheckBox("Enforce validations in the database (_sql_constraints)")
+        self.sql_constraints.setChecked(True)
+        module_layout.addWidget(self.sql_constraints)
+        
+        # Registros de demo por modelo (demo/<model>.csv), 0 = sin datos de demo
+        demo_layout = QHBoxLayout()
+        self.demo_rows = QSpinBox()
+        self.demo_rows.setRange(0, 10000000)
+        self.demo_rows.setSingleStep(1000)
+        self.demo_rows.setSpecialValueText("None")
+        demo_layout.addWidget(QLabel("Demo records per model:"))
+        demo_layout.addWidget(self.demo_rows)
+        demo_layout.addStretch()
+        module_layout.addLayout(demo_layout)
+        
         layout.addWidget(module_info)
         
-        # Lista de modelos
+        # Module level validation problems
+        self.module_issues_label = QLabel()
+        self.module_issues_label.setStyleSheet("color: #b00020")
+        self.module_issues_label.hide()
+        layout.addWidget(self.module_issues_label)
+        
+        # Lista de modelos, dentro de un área con scroll
         self.models = []
-        self.models_layout = QVBoxLayout()
-        layout.addLayout(self.models_layout)
+        self.models_scroll = QScrollArea()
+        self.models_scroll.setWidgetResizable(True)
+        layout.addWidget(self.models_scroll, 1)
+        self.clear_models()
         
         # Botones de control
         buttons_layout = QHBoxLayout()
         add_model_btn = QPushButton("Add Model")
         generate_btn = QPushButton("Generate Module")
         
-        add_model_btn.clicked.connect(self.add_model)
+        # Installer type: heredoc bash script or archive + one-shot installer
+        self.output_format = QComboBox()
+        self.output_format.addItem("Bash script", None)
+        for fmt in ARCHIVE_FORMATS:
+            self.output_format.addItem(f"{fmt} archive", fmt)
+        
+        add_model_btn.clicked.connect(lambda: self.add_model())
         generate_btn.clicked.connect(self.generate_module)
         
         buttons_layout.addWidget(add_model_btn)
+        buttons_layout.addWidget(self.output_format)
         buttons_layout.addWidget(generate_btn)
         layout.addLayout(buttons_layout)
+        self.generate_btn = generate_btn
+        
+        # Progress of a running generation, hidden while idle
+        self.worker = None
+        progress_layout = QHBoxLayout()
+        self.progress = QProgressBar()
+        self.progress_label = QLabel()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_generation)
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.progress)
+        progress_layout.addWidget(self.cancel_btn)
+        layout.addLayout(progress_layout)
+        self.set_generating(False)
+        
+        # Menú de proyecto
+        file_menu = self.menuBar().addMenu("&File")
+        for text, shortcut, slot in (("&New", QKeySequence.New, self.new_project),
+                                     ("&Open...", QKeySequence.Open, self.open_project),
+                                     ("&Save", QKeySequence.Save, self.save_project),
+                                     ("Save &As...", QKeySequence.SaveAs, self.save_project_as)):
+            action = file_menu.addAction(text)
+            action.setShortcut(shortcut)
+            action.triggered.connect(slot)
         
-        self.add_model()  # Añadir un modelo inicial
+        # Every edit restarts the timer, the project is written once edits pause
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
+        for signal in (self.module_name.textChanged, self.version.textChanged,
+                       self.category.textChanged, self.depends.textChanged,
+                       self.sql_constraints.toggled, self.demo_rows.valueChanged):
+            signal.connect(self.schedule_autosave)
+        
+        # Validation: only the models edited since the last pass are checked again
+        self.validator = SpecValidator()
+        self.dirty_models = set()
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(VALIDATION_DELAY_MS)
+        self.validation_timer.timeout.connect(self.validate)
+        self.module_name.textChanged.connect(lambda: self.schedule_validation())
+        
+        # Restore the unsaved project of the last session, if any
+        draft = autosave_path()
+        if os.path.exists(draft):
+            try:
+                self.load_project(load_spec(draft, partial=True))
+                self.statusBar().showMessage("Restored the unsaved project of the last session", 5000)
+            except (OSError, SpecError) as e:
+                self.statusBar().showMessage(f"Could not restore the autosaved project: {e}", 5000)
+                self.new_project()
+        else:
+            self.new_project()
+
+    def refresh_model_index(self):
+        # Runs in a worker thread; a single process, forking a Qt app is unsafe
+        addons_paths = default_addons_paths()
+        if not addons_paths:
+            return
+        stats = self.model_index.refresh(addons_paths, workers=1)
+        if stats.parsed or stats.removed:
+            self.model_index.save()
+            self.index_refreshed.emit(self.model_index.models())
+
+    def add_model(self, spec=None, expanded=True):
+        # Un modelo nuevo empieza con un campo vacío
+        panel = ModelPanel(spec or ModelSpec('', [FieldSpec('')]), self.model_completions)
+        panel.changed.connect(self.schedule_autosave)
+        panel.changed.connect(lambda: self.schedule_validation(panel))
+        self.models.append(panel)
+        # Before the trailing stretch
+        self.models_layout.insertWidget(self.models_layout.count() - 1, panel)
+        if expanded:
+            panel.set_expanded(True)
+        self.schedule_autosave()
+        self.schedule_validation(panel)
+        return panel
+
+    def clear_models(self):
+        # A fresh container replaces the old one, which is deleted with all its
+        # panels at once instead of relaying out the list for every removal
+        container = QWidget()
+        self.models_layout = QVBoxLayout(container)
+        self.models_layout.addStretch()
+        self.models_scroll.setWidget(container)
+        self.models = []
+
+    def to_spec(self):
+        return ModuleSpec(self.module_name.text(), self.version.text(),
+                          self.category.text(),
+                          [panel.to_spec() for panel in self.models],
+                          self.sql_constraints.isChecked(), self.demo_rows.value(),
+                          [name.strip() for name in self.depends.text().split(',') if name.strip()])
+
+    def load_project(self, spec, path=None):
+        # Only the data is loaded here: every model starts collapsed and gets
+        # its editor widgets when it is expanded
+        self._loading = True
+        self.setUpdatesEnabled(False)
+        try:
+            self.clear_models()
+            self.validator = SpecValidator()
+            self.dirty_models = set()
+            self.module_name.setText(spec.name)
+            self.version.setText(spec.version)
+            self.category.setText(spec.category)
+            self.depends.setText(', '.join(spec.depends))
+            self.sql_constraints.setChecked(spec.sql_constraints)
+            self.demo_rows.setValue(spec.demo_rows)
+            for model in spec.models:
+                self.add_model(model, expanded=False)
+            if not self.models:
+                self.add_model()
+            if len(self.models) == 1:
+                self.models[0].set_expanded(True)
+        finally:
+            self.setUpdatesEnabled(True)
+            self._loading = False
+        self.autosave_timer.stop()
+        self.set_project_path(path)
+        self.validate()
+
+    def set_project_path(self, path):
+        self.project_path = path
+        title = os.path.basename(path) if path else "Module Generator"
+        self.setWindowTitle(f"OdooMaster - {title}")
+
+    def new_project(self):
+        if self.autosave_timer.isActive():
+            self.autosave()
+        self.load_project(ModuleSpec('', models=[ModelSpec('', [FieldSpec('')])]))
+
+    def open_project(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Project", "", PROJECT_FILTER)
+        if not path:
+            return
+        try:
+            spec = load_spec(path, partial=True)
+        except (OSError, SpecError) as e:
+            QMessageBox.critical(self, "Error", f"Cannot open {path}: {e}")
+            return
+        # Pending edits of the current project are not lost
+        if self.autosave_timer.isActive():
+            self.autosave()
+        self.load_project(spec, path)
+
+    def save_project(self):
+        if self.project_path is None:
+            return self.save_project_as()
+        return self.write_project(self.project_path)
+
+    def save_project_as(self):
+        default = f"{self.module_name.text() or 'project'}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Save Project", default, PROJECT_FILTER)
+        if not path:
+            return False
+        if not self.write_project(path):
+            return False
+        if self.project_path is None and os.path.exists(autosave_path()):
+            # The draft now lives in a real project file
+            os.remove(autosave_path())
+        self.set_project_path(path)
+        return True
+
+    def write_project(self, path):
+        self.autosave_timer.stop()
+        try:
+            save_spec(self.to_spec(), path, indent=None)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Cannot save {path}: {e}")
+            return False
+        self.statusBar().showMessage(f"Saved {path}", 3000)
+        return True
+
+    def schedule_autosave(self):
+        if not self._loading:
+            self.autosave_timer.start()
+
+    def autosave(self):
+        # Projects are autosaved in place, unsaved ones to a draft file
+        self.autosave_timer.stop()
+        path = self.project_path or autosave_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            save_spec(self.to_spec(), path, indent=None)
+        except OSError as e:
+            self.statusBar().showMessage(f"Autosave failed: {e}", 5000)
 
-    def add_model(self):
-        model = ModelWidget()
-        self.models.append(model)
-        self.models_layout.addWidget(model)
+    def schedule_validation(self, panel=None):
+        # Without a panel only the module settings changed
+        if panel is not None:
+            self.dirty_models.add(panel)
+        self.validation_timer.start()
+
+    def validate(self):
+        self.validation_timer.stop()
+        affected = self.validator.set_module(self.module_name.text())
+        for panel in self.dirty_models:
+            affected |= self.validator.update_model(panel, panel.to_spec())
+        self.dirty_models = set()
+        for panel in affected:
+            panel.show_issues(self.validator.issues(panel))
+        messages = [issue.message for issue in self.validator.module_issues]
+        self.module_issues_label.setText("\n".join(messages))
+        self.module_issues_label.setVisible(bool(messages))
+
+    def closeEvent(self, event):
+        if self.autosave_timer.isActive():
+            self.autosave()
+        super().closeEvent(event)
 
     def generate_module(self):
         if not self.module_name.text():
             QMessageBox.warning(self, "Error", "Module name is required!")
             return
-        
-        # Create module directory and basic structure
-        module_path = os.path.join(os.getcwd(), self.module_name.text())
-        models_path = os.path.join(module_path, 'models')
-        security_path = os.path.join(module_path, 'security')
-        views_path = os.path.join(module_path, 'views')
-        static_path = os.path.join(module_path, 'static', 'description')
-        
-        # Create all necessary directories
-        os.makedirs(models_path, exist_ok=True)
-        os.makedirs(security_path, exist_ok=True)
-        os.makedirs(views_path, exist_ok=True)
-        os.makedirs(static_path, exist_ok=True)
-        
-        # Generate all components
-        self.generate_init(module_path)
-        self.generate_manifest(module_path)
-        self.generate_models(models_path)
-        self.generate_security(security_path)
-        self.generate_views(views_path)
-        self.generate_menu_views(views_path)
-        
-        # Create icon placeholder
-        icon_path = os.path.join(static_path, 'icon.png')
-        open(icon_path, 'a').close()
-        
-        # Generate bash script
-        script_path = self.generate_bash_script()
-        
-        QMessageBox.information(self, "Success", 
-                              f"Module generated successfully at {module_path}\n"
-                              f"Bash script generated at {script_path}")
-
-    def generate_manifest(self, module_path):
-        manifest = {
-            'name': self.module_name.text(),
-            'version': self.version.text(),
-            'category': self.category.text(),
-            'summary': 'Generated by OdooMaster',
-            'description': '''
-                This module was automatically generated by OdooMaster.
-            ''',
-            'depends': ['base'],
-            'data': [
-                'security/ir.model.access.csv',
-            ],
-            'installable': True,
-            'application': True,
-        }
-        
-        with open(os.path.join(module_path, "__manifest__.py"), "w") as f:
-            f.write("# -*- coding: utf-8 -*-\n{\n")
-            for key, value in manifest.items():
-                if isinstance(value, str):
-                    f.write(f"    '{key}': '{value}',\n")
-                else:
-                    f.write(f"    '{key}': {value},\n")
-            f.write("}\n")
-
-    def generate_models(self, models_path):
-        # Generar __init__.py
-        with open(os.path.join(models_path, "__init__.py"), "w") as f:
-            for i, model_widget in enumerate(self.models):
-                model_name = model_widget.model_name.text().split('.')[-1]
-                f.write(f"from . import {model_name}\n")
-        
-        # Generar archivos de modelo
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if not model_name:
-                continue
-                
-            filename = f"{model_name.split('.')[-1]}.py"
-            with open(os.path.join(models_path, filename), "w") as f:
-                f.write("# -*- coding: utf-8 -*-\n\n")
-                f.write("from odoo import models, fields, api\n")
-                f.write("from odoo.exceptions import ValidationError\n\n")
-                
-                f.write(f"class {model_name.replace('.', '_')}(models.Model):\n")
-                f.write(f"    _name = '{model_name}'\n")
-                f.write(f"    _description = '{model_name} Model'\n\n")
-                
-                # Generar campos
-                for field_widget in model_widget.fields:
-                    name = field_widget.name.text()
-                    if not name:
-                        continue
-                        
-                    field_type = field_widget.field_type.currentText()
-                    string = field_widget.string.text() or name.capitalize()
-                    required = field_widget.required.isChecked()
-                    
-                    f.write(f"    {name} = fields.{field_type}(\n")
-                    
-                    # Handle Selection field type
-                    if field_type == 'Selection':
-                        options = []
-                        for key, value in field_widget.selection_options:
-                            if key.text() and value.text():
-                                options.append(f"('{key.text()}', '{value.text()}')")
-                        if options:
-                            f.write("        selection=[\n")
-                            for option in options:
-                                f.write(f"            {option},\n")
-                            f.write("        ],\n")
-                    
-                    f.write(f"        string='{string}',\n")
-                    if required:
-                        f.write("        required=True,\n")
-                    f.write("    )\n")
-                
-                # Add validations after fields
-                validations = []
-                for field_widget in model_widget.fields:
-                    validations.extend(field_widget.get_validation_code())
-                
-                if validations:
-                    f.write("\n    # Validations\n")
-                    for validation in validations:
-                        f.write(validation)
-
-    def generate_security(self, module_path):
-        security_path = os.path.join(module_path, 'security')
-        os.makedirs(security_path, exist_ok=True)
-        
-        with open(os.path.join(security_path, 'ir.model.access.csv'), 'w') as f:
-            f.write("id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink\n")
-            for model_widget in self.models:
-                model_name = model_widget.model_name.text()
-                if not model_name:
-                    continue
-                model_id = model_name.replace('.', '_')
-                f.write(f"access_{model_id},access_{model_id},model_{model_id},,1,1,1,1\n")
-
-    def generate_views(self, module_path):
-        views_path = os.path.join(module_path, 'views')
-        os.makedirs(views_path, exist_ok=True)
-        
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if not model_name:
-                continue
-            
-            view_filename = f"{model_name.split('.')[-1]}_views.xml"
-            with open(os.path.join(views_path, view_filename), 'w') as f:
-                f.write('<?xml version="1.0" encoding="utf-8"?>\n<odoo>\n')
-                
-                # Form View
-                f.write(f'''    <record id="{model_name}_form" model="ir.ui.view">
-        <field name="name">{model_name}.form</field>
-        <field name="model">{model_name}</field>
-        <field name="arch" type="xml">
-            <form>
-                <sheet>
-                    <group>
-                        <group>''')
-                
-                # Primera mitad de los campos
-                fields_count = len(model_widget.fields)
-                mid_point = fields_count // 2
-                
-                for field_widget in model_widget.fields[:mid_point]:
-                    field_name = field_widget.name.text()
-                    if field_name:
-                        f.write(f'\n                            <field name="{field_name}"/>')
-                
-                f.write('''
-                        </group>
-                        <group>''')
-                
-                # Segunda mitad de los campos
-                for field_widget in model_widget.fields[mid_point:]:
-                    field_name = field_widget.name.text()
-                    if field_name:
-                        f.write(f'\n                            <field name="{field_name}"/>')
-                
-                f.write('''
-                        </group>
-                    </group>
-                </sheet>
-            </form>
-        </field>
-    </record>\n\n''')
-                
-                # Tree View
-                f.write(f'''    <record id="{model_name}_tree" model="ir.ui.view">
-        <field name="name">{model_name}.tree</field>
-        <field name="model">{model_name}</field>
-        <field name="arch" type="xml">
-            <tree>''')
-                
-                for field_widget in model_widget.fields[:6]:  # Primeros 6 campos para la vista tree
-                    field_name = field_widget.name.text()
-                    if field_name:
-                        f.write(f'\n                <field name="{field_name}"/>')
-                
-                f.write('''
-            </tree>
-        </field>
-    </record>\n\n''')
-                
-                # Action
-                f.write(f'''    <record id="action_{model_name}" model="ir.actions.act_window">
-        <field name="name">{model_name.split('.')[-1].replace('_', ' ').title()}</field>
-        <field name="res_model">{model_name}</field>
-        <field name="view_mode">tree,form</field>
-    </record>\n''')
-                
-                f.write('</odoo>')
-
-    def generate_menu_views(self, module_path):
-        with open(os.path.join(module_path, 'views', 'menu_views.xml'), 'w') as f:
-            f.write('<?xml version="1.0" encoding="utf-8"?>\n<odoo>\n')
-            
-            # Root menu
-            module_name = self.module_name.text()
-            menu_title = module_name.replace('_', ' ').title()
-            f.write(f'    <menuitem id="{module_name}_menu_root" name="{menu_title}" sequence="10"/>\n\n')
-            
-            # Submenus for each model
-            for i, model_widget in enumerate(self.models, 1):
-                model_name = model_widget.model_name.text()
-                if not model_name:
-                    continue
-                
-                menu_name = model_name.split('.')[-1].replace('_', ' ').title()
-                f.write(f'''    <menuitem 
-        id="{model_name}_menu"
-        name="{menu_name}"
-        parent="{module_name}_menu_root"
-        action="action_{model_name}"
-        sequence="{i}"/>\n''')
-            
-            # App menu item
-            f.write(f'''\n    <menuitem 
-        id="{module_name}_menu_app" 
-        name="{menu_title}" 
-        action="action_{self.models[0].model_name.text()}"
-        sequence="1" 
-        web_icon="{module_name},static/description/icon.png"/>\n''')
-            
-            f.write('</odoo>')
-
-    def generate_bash_script(self):
-        module_name = self.module_name.text()
-        script_content = f'''#!/bin/bash
-
-# Set the module name and path
-MODULE_NAME="{module_name}"
-ADDONS_PATH="/opt/odoo17/odoo17-custom-addons"
-
-# Create the module directory and subdirectories
-sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME"
-sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME/models"
-sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME/views"
-sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME/security"
-sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME/static/description"
-
-# Create __init__.py
-sudo cat <<EOF > "$ADDONS_PATH/$MODULE_NAME/__init__.py"
-# -*- coding: utf-8 -*-
-
-from . import models
-EOF
-
-# Create __manifest__.py
-sudo cat <<EOF > "$ADDONS_PATH/$MODULE_NAME/__manifest__.py"
-# -*- coding: utf-8 -*-
-{{
-    'name': '{self.module_name.text()}',
-    'version': '{self.version.text()}',
-    'category': '{self.category.text()}',
-    'summary': 'Generated by OdooMaster',
-    'description': \'''
-        This module was automatically generated by OdooMaster.
-        Features include:
-        - Custom models and views
-        - Basic CRUD operations
-        - User-friendly interface
-    \''',
-    'depends': ['base'],
-    'data': [
-        'security/ir.model.access.csv','''
-
-        # Add model views dynamically
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if model_name:
-                script_content += f"\n        'views/{model_name.split('.')[-1]}_views.xml',"
-        
-        script_content += "\n        'views/menu_views.xml',\n"
-        script_content += '''    ],
-    'installable': True,
-    'application': True,
-    'auto_install': False,
-}
-EOF'''
-
-        # Add models initialization
-        script_content += '''
-# Create models/__init__.py
-sudo cat <<EOF > "$ADDONS_PATH/$MODULE_NAME/models/__init__.py"
-# -*- coding: utf-8 -*-
-'''
-        
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if model_name:
-                script_content += f"from . import {model_name.split('.')[-1]}\n"
-        
-        script_content += "EOF\n"
-
-        # Add security file
-        script_content += '''
-# Create security/ir.model.access.csv
-sudo cat <<EOF > "$ADDONS_PATH/$MODULE_NAME/security/ir.model.access.csv"
-id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink
-'''
-        
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if model_name:
-                model_id = model_name.replace('.', '_')
-                script_content += f"access_{model_id},access_{model_id},model_{model_id},,1,1,1,1\n"
-        
-        script_content += "EOF\n"
-
-        # Add model files and views
-        script_content += self._generate_model_files_script()
-        script_content += self._generate_view_files_script()
-        script_content += self._generate_menu_views_script()
-
-        # Set proper permissions
-        script_content += '''
-# Set proper permissions
-sudo chown -R odoo:odoo "$ADDONS_PATH/$MODULE_NAME"
-sudo chmod -R 755 "$ADDONS_PATH/$MODULE_NAME"
-
-echo "Module generated successfully! Please restart Odoo service to load the new module."
-'''
-
-        # Save and make executable
-        script_path = os.path.join(os.getcwd(), f"create_{module_name}_module.sh")
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-        os.chmod(script_path, 0o755)
-        
-        return script_path
-
-    def _generate_model_files_script(self):
-        script_content = ""
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if not model_name:
-                continue
-            
-            script_content += f'''
-# Create model file for {model_name}
-sudo cat <<'EOF' > "$ADDONS_PATH/$MODULE_NAME/models/{model_name.split('.')[-1]}.py"
-# -*- coding: utf-8 -*-
-
-from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-
-class {model_name.split('.')[-1].title().replace('_', '')}(models.Model):
-    _name = '{model_name}'
-    _description = '{model_name.split('.')[-1].replace('_', ' ').title()}'
-
-'''
-            
-            # Add fields
-            for field_widget in model_widget.fields:
-                name = field_widget.name.text()
-                if name:
-                    field_type = field_widget.field_type.currentText()
-                    string = field_widget.string.text() or name.capitalize()
-                    required = field_widget.required.isChecked()
-                    
-                    if field_type == 'Selection':
-                        script_content += f"    {name} = fields.{field_type}([\n"
-                        for key, value in field_widget.selection_options:
-                            if key.text() and value.text():
-                                script_content += f"        ('{key.text()}', '{value.text()}'),\n"
-                        script_content += f"    ], string='{string}'"
-                    else:
-                        script_content += f"    {name} = fields.{field_type}(string='{string}'"
-                    
-                    if required:
-                        script_content += ", required=True"
-                    script_content += ")\n"
-            
-            # Add validations
-            validations = []
-            for field_widget in model_widget.fields:
-                validations.extend(field_widget.get_validation_code())
-            
-            if validations:
-                script_content += "\n    # Validations\n"
-                for validation in validations:
-                    script_content += validation
-            
-            script_content += "EOF\n"
-        return script_content
-
-    def _generate_view_files_script(self):
-        script_content = ""
-        for model_widget in self.models:
-            model_name = model_widget.model_name.text()
-            if not model_name:
-                continue
-            
-            view_id_prefix = model_name.replace('.', '_')
-            model_label = model_name.split('.')[-1].replace('_', ' ').title()
-            
-            script_content += f'''
-# Create view for {model_name}
-sudo cat <<'EOF' > "$ADDONS_PATH/$MODULE_NAME/views/{model_name.split('.')[-1]}_views.xml"
-<?xml version="1.0" encoding="utf-8"?>
-<odoo>
-    <record id="{view_id_prefix}_view_form" model="ir.ui.view">
-        <field name="name">{model_name}.form</field>
-        <field name="model">{model_name}</field>
-        <field name="arch" type="xml">
-            <form string="{model_label}">
-                <sheet>
-                    <group>'''
-            
-            # Primera mitad de los campos
-            fields_count = len(model_widget.fields)
-            mid_point = fields_count // 2
-            
-            for field_widget in model_widget.fields[:mid_point]:
-                field_name = field_widget.name.text()
-                if field_name:
-                    script_content += f'\n                            <field name="{field_name}"/>'
-            
-            script_content += '''
-                    </group>
-                    <group>'''
-            
-            # Segunda mitad de los campos
-            for field_widget in model_widget.fields[mid_point:]:
-                field_name = field_widget.name.text()
-                if field_name:
-                    script_content += f'\n                            <field name="{field_name}"/>'
-            
-            script_content += '''
-                    </group>
-                </sheet>
-            </form>
-        </field>
-    </record>
-
-    <record id="{}_view_tree" model="ir.ui.view">
-        <field name="name">{}.tree</field>
-        <field name="model">{}</field>
-        <field name="arch" type="xml">
-            <tree>'''.format(view_id_prefix, model_name, model_name)
-
-            # Campos para la vista tree (limitados a 6)
-            for field_widget in model_widget.fields[:6]:
-                field_name = field_widget.name.text()
-                if field_name:
-                    script_content += f'\n                <field name="{field_name}"/>'
-
-            script_content += f'''
-            </tree>
-        </field>
-    </record>
-
-    <record id="action_{model_name}" model="ir.actions.act_window">
-        <field name="name">{model_label}</field>
-        <field name="res_model">{model_name}</field>
-        <field name="view_mode">tree,form</field>
-    </record>
-</odoo>
-EOF
-'''
-        return script_content
-
-    def _generate_menu_views_script(self):
-        module_name = self.module_name.text()
-        menu_title = module_name.replace('_', ' ').title()
-        
-        script_content = f'''
-# Create menu views
-sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME/views"
-sudo cat <<'EOF' > "$ADDONS_PATH/$MODULE_NAME/views/menu_views.xml"
-<?xml version="1.0" encoding="utf-8"?>
-<odoo>
-    <menuitem id="{module_name}_menu_root" name="{menu_title}" sequence="10"/>
-'''
-        
-        # Add model menus
-        for i, model_widget in enumerate(self.models, 1):
-            model_name = model_widget.model_name.text()
-            if model_name:
-                menu_name = model_name.split('.')[-1].replace('_', ' ').title()
-                script_content += f'''    <menuitem 
-        id="{model_name}_menu"
-        name="{menu_name}"
-        parent="{module_name}_menu_root"
-        action="action_{model_name}"
-        sequence="{i}"/>
-'''
-        
-        # Add app menu
-        if self.models:
-            first_model = self.models[0].model_name.text()
-            script_content += f'''
-    <menuitem 
-        id="{module_name}_menu_app"
-        name="{menu_title}"
-        action="action_{first_model}"
-        sequence="1"
-        web_icon="{module_name},static/description/icon.png"/>
-'''
-        
-        script_content += '''</odoo>
-EOF
-'''
-        return script_content
-
-    def generate_init(self, module_path):
-        # Generate main __init__.py
-        with open(os.path.join(module_path, "__init__.py"), "w") as f:
-            f.write("# -*- coding: utf-8 -*-\n\n")
-            f.write("from . import models\n")
-        
-        # Generate models/__init__.py
-        with open(os.path.join(module_path, "models", "__init__.py"), "w") as f:
-            for model_widget in self.models:
-                model_name = model_widget.model_name.text()
-                if model_name:
-                    f.write(f"from . import {model_name.split('.')[-1]}\n")
+
+        if self.worker is not None:
+            return
+
+        self.validate()
+        # Then the checks that need the whole spec (comodel addons, demo data).
+        # The worker gets a copy, the editors stay usable while it runs.
+        spec = ModuleSpec.from_dict(self.to_spec().to_dict())
+        issues = self.validator.all_issues() or validate_spec(spec)
+        if issues:
+            details = "\n".join(str(issue) for issue in issues[:20])
+            more = f"\n... and {len(issues) - 20} more" if len(issues) > 20 else ""
+            QMessageBox.warning(self, "Error", f"Fix these problems before generating:\n{details}{more}")
+            return
+
+        # All generation happens in the headless core, the GUI only fills in the spec
+        self.worker = GenerationWorker(spec, os.getcwd(), self.output_format.currentData())
+        signals = self.worker.signals
+        signals.progress.connect(self.on_generation_progress)
+        signals.writing.connect(lambda: self.cancel_btn.setEnabled(False))
+        signals.finished.connect(self.on_generation_finished)
+        signals.failed.connect(self.on_generation_failed)
+        signals.cancelled.connect(self.on_generation_cancelled)
+        self.set_generating(True)
+        QThreadPool.globalInstance().start(self.worker)
+
+    def set_generating(self, running):
+        self.generate_btn.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+        for widget in (self.progress, self.progress_label, self.cancel_btn):
+            widget.setVisible(running)
+        if running:
+            self.progress.setRange(0, 0)
+            self.progress_label.setText("Generating...")
+
+    def cancel_generation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.progress_label.setText("Cancelling...")
+
+    def on_generation_progress(self, done, total, artifact):
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.progress_label.setText(artifact)
+
+    def finish_generation(self):
+        self.worker = None
+        self.set_generating(False)
+
+    def on_generation_finished(self, result):
+        self.finish_generation()
+        report, installer_msg, stats, verification = result
+        text = (f"Module generated successfully at {report.module_path}\n"
+                f"{report.summary()}\n"
+                f"{installer_msg}")
+        if verification.ok:
+            message = QMessageBox(QMessageBox.Information, "Success", text, QMessageBox.Ok, self)
+        else:
+            problems = "\n".join(verification.problems[:20])
+            message = QMessageBox(QMessageBox.Warning, "Verification failed",
+                                  f"{text}\n\nOdoo will not be able to load it:\n{problems}",
+                                  QMessageBox.Ok, self)
+        # Timings per phase and the slowest models go behind "Show Details..."
+        message.setDetailedText(stats.format())
+        message.exec()
+
+    def on_generation_failed(self, error):
+        self.finish_generation()
+        QMessageBox.critical(self, "Error", f"Module generation failed: {error}")
+
+    def on_generation_cancelled(self):
+        self.finish_generation()
+        self.statusBar().showMessage("Generation cancelled, nothing was written", 5000)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,15 @@
+# Headless core of OdooMaster. Importing this package must never pull in Qt,
+# the GUI in main_window.py is just one front end that fills in a ModuleSpec.
+from .spec import FIELD_TYPES, FieldSpec, ModelSpec, ModuleSpec, SpecError, load_spec, save_spec
+from .generator import (RenderCache, generate_module, generate_bash_script, iter_module_files,
+                        module_file_count, render_module)
+from .demo import demo_streams, iter_demo_files, write_demo_csv
+from .deploy import DeployError, deploy_module
+from .archive import ARCHIVE_FORMATS, build_archive, generate_archive
+from .importer import import_module, import_modules
+from .model_index import ModelIndex, cache_path, default_addons_paths
+from .profiling import GenerationStats, profiled, timed
+from .validation import SpecValidator, ValidationIssue, check_spec, validate_spec
+from .verify import VerifyResult, verify_module, verify_modules
+from .suite import Suite, SuiteError, build_suite, generate_suite, load_suite
+from .watch import watch_specs
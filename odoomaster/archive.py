@@ -0,0 +1,88 @@
+# Packaged output: the module as a compressed archive built in memory, plus a
+# small installer that verifies and extracts it in a single operation.
+import gzip
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+
+from .demo import iter_demo_files
+from .template import render
+from .writer import write_if_changed
+
+
+ARCHIVE_FORMATS = ('tar.gz', 'zip')
+
+# Fixed timestamp so identical modules produce identical archives
+ARCHIVE_MTIME = 315532800  # 1980-01-01, the earliest date zip can store
+
+ICON_PATH = 'static/description/icon.png'
+
+
+def build_archive(spec, files, fmt='tar.gz'):
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format '{fmt}'")
+
+    entries = list(files.items())
+    if ICON_PATH not in files:
+        entries.append((ICON_PATH, b''))
+
+    buffer = io.BytesIO()
+    if fmt == 'zip':
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for rel_path, content in entries:
+                info = zipfile.ZipInfo(f'{spec.name}/{rel_path}', (1980, 1, 1, 0, 0, 0))
+                info.external_attr = 0o644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, content)
+            # Demo data is streamed into the entry, its size is not known up front
+            for rel_path, write in iter_demo_files(spec):
+                info = zipfile.ZipInfo(f'{spec.name}/{rel_path}', (1980, 1, 1, 0, 0, 0))
+                info.external_attr = 0o644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with archive.open(info, 'w', force_zip64=True) as entry:
+                    write(entry)
+    else:
+        # GzipFile with mtime=0 keeps the compressed bytes reproducible
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as gz:
+            with tarfile.open(fileobj=gz, mode='w', format=tarfile.PAX_FORMAT) as archive:
+                for rel_path, content in entries:
+                    info = tarfile.TarInfo(f'{spec.name}/{rel_path}')
+                    info.size = len(content)
+                    info.mtime = ARCHIVE_MTIME
+                    info.mode = 0o644
+                    archive.addfile(info, io.BytesIO(content))
+                # A tar header needs the size, demo data goes through a temporary file
+                for rel_path, write in iter_demo_files(spec):
+                    with tempfile.TemporaryFile() as tmp:
+                        write(tmp)
+                        info = tarfile.TarInfo(f'{spec.name}/{rel_path}')
+                        info.size = tmp.tell()
+                        info.mtime = ARCHIVE_MTIME
+                        info.mode = 0o644
+                        tmp.seek(0)
+                        archive.addfile(info, tmp)
+    return buffer.getvalue()
+
+
+def render_archive_installer(spec, archive_name, checksum=None, fmt='tar.gz'):
+    extract = render('installer_extract_zip' if fmt == 'zip' else 'installer_extract_tar')
+    return render('installer.sh', module=spec.name, archive=archive_name, extract=extract,
+                  verify=render('installer_verify', checksum=checksum) if checksum else '')
+
+
+def generate_archive(spec, output_dir, files, fmt='tar.gz', verify=True):
+    # Writes <module>.<fmt> and install_<module>.sh next to each other
+    data = build_archive(spec, files, fmt)
+    archive_name = f'{spec.name}.{fmt}'
+    archive_path = os.path.join(output_dir, archive_name)
+    write_if_changed(archive_path, data)
+
+    checksum = hashlib.sha256(data).hexdigest() if verify else None
+    installer_path = os.path.join(output_dir, f'install_{spec.name}.sh')
+    installer = render_archive_installer(spec, archive_name, checksum, fmt)
+    write_if_changed(installer_path, installer.encode('utf-8'), 0o755)
+
+    return archive_path, installer_path
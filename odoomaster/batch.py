@@ -0,0 +1,111 @@
+# Batch generation of many modules across a process pool
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .generator import generate_bash_script, generate_module, render_module
+from .spec import load_spec
+from .template import set_template_dirs
+from .validation import check_spec
+
+
+class BatchResult:
+    __slots__ = ('spec_path', 'module_name', 'error', 'elapsed')
+
+    def __init__(self, spec_path, module_name='', error=None, elapsed=0.0):
+        self.spec_path = spec_path
+        self.module_name = module_name
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class BatchSummary:
+    __slots__ = ('results', 'wall_time', 'workers')
+
+    def __init__(self, results, wall_time, workers):
+        self.results = results
+        self.wall_time = wall_time
+        self.workers = workers
+
+    @property
+    def succeeded(self):
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def throughput(self):
+        return len(self.results) / self.wall_time if self.wall_time else 0.0
+
+
+def find_specs(source):
+    # A directory is scanned for *.json specs; any other file is a manifest
+    # listing one spec path per line, relative to the manifest itself.
+    if os.path.isdir(source):
+        return sorted(os.path.join(source, name) for name in os.listdir(source)
+                      if name.endswith('.json'))
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    spec_paths = []
+    with open(source, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                spec_paths.append(os.path.join(base_dir, line))
+    return spec_paths
+
+
+def worker_pool(workers, template_dirs=None):
+    # Template overrides have to be set up in every worker process
+    if template_dirs:
+        return ProcessPoolExecutor(max_workers=workers, initializer=set_template_dirs,
+                                   initargs=(template_dirs,))
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def generate_one(spec_path, output_dir, with_script=True, depends=()):
+    # Runs inside a worker process, so errors are reported instead of raised;
+    # depends are added to the ones of the spec (see suite.generate_suite)
+    start = time.perf_counter()
+    module_name = ''
+    try:
+        spec = load_spec(spec_path)
+        module_name = spec.name
+        spec.depends = list(dict.fromkeys(list(spec.depends) + list(depends)))
+        check_spec(spec)
+        files = render_module(spec)
+        generate_module(spec, output_dir, files)
+        if with_script:
+            generate_bash_script(spec, output_dir, files)
+    except Exception as e:
+        return BatchResult(spec_path, module_name, f"{type(e).__name__}: {e}",
+                           time.perf_counter() - start)
+    return BatchResult(spec_path, module_name, None, time.perf_counter() - start)
+
+
+def generate_batch(spec_paths, output_dir, workers=None, with_script=True, on_result=None,
+                   template_dirs=None):
+    workers = max(1, min(workers or os.cpu_count() or 1, len(spec_paths)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = []
+    with worker_pool(workers, template_dirs) as executor:
+        futures = [executor.submit(generate_one, spec_path, output_dir, with_script)
+                   for spec_path in spec_paths]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    # Report in input order, not completion order
+    order = {spec_path: i for i, spec_path in enumerate(spec_paths)}
+    results.sort(key=lambda result: order[result.spec_path])
+    return BatchSummary(results, time.perf_counter() - start, workers)
@@ -0,0 +1,130 @@
+# Generation benchmarks over synthetic module shapes. Each shape is timed for
+# both output paths (module tree and installer script) and can be compared
+# against a saved baseline to spot regressions.
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from .generator import generate_bash_script, generate_module
+from .spec import FieldSpec, ModelSpec, ModuleSpec
+
+
+DEFAULT_MODELS = (1, 10, 100, 1000)
+DEFAULT_FIELDS = (5, 50, 500)
+
+OUTPUTS = ('module', 'script')
+
+# Weighted mix of field types for synthetic models
+TYPE_MIX = ('Char', 'Char', 'Char', 'Text', 'Integer', 'Integer', 'Float',
+            'Boolean', 'Date', 'Datetime', 'Selection', 'Many2one')
+
+
+def synthetic_spec(n_models, n_fields, seed=0):
+    rng = random.Random(seed)
+    models = []
+    for m in range(n_models):
+        fields = []
+        for i in range(n_fields):
+            field_type = rng.choice(TYPE_MIX)
+            field = FieldSpec(f'field_{i}', field_type, f'Field {i}', rng.random() < 0.2)
+            if field_type == 'Selection':
+                field.selection = [(f'option_{k}', f'Option {k}') for k in range(rng.randint(2, 8))]
+            elif field_type == 'Many2one':
+                field.comodel = 'res.partner'
+            # About a third of the fields carry a validation rule
+            elif field_type in ('Integer', 'Float') and rng.random() < 0.35:
+                field.min_value, field.max_value = 0, rng.randint(10, 10000)
+            elif field_type in ('Char', 'Text') and rng.random() < 0.35:
+                field.min_length, field.max_length = 1, rng.randint(10, 500)
+            fields.append(field)
+        models.append(ModelSpec(f'bench.model_{m}', fields))
+    return ModuleSpec('bench_module', '1.0', 'Benchmark', models)
+
+
+def _run_output(spec, output, output_dir):
+    if output == 'module':
+        generate_module(spec, output_dir)
+        root = os.path.join(output_dir, spec.name)
+    else:
+        generate_bash_script(spec, output_dir)
+        root = output_dir
+    total = 0
+    for directory, _, files in os.walk(root):
+        total += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+    return total
+
+
+def measure(spec, output, repeat=3):
+    # Best wall time over `repeat` runs into a fresh directory each time (so
+    # the incremental writer really writes), then one run under tracemalloc
+    # for the peak memory.
+    times = []
+    bytes_written = 0
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp(prefix='odoomaster-bench-')
+        try:
+            start = time.perf_counter()
+            bytes_written = _run_output(spec, output, output_dir)
+            times.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    output_dir = tempfile.mkdtemp(prefix='odoomaster-bench-')
+    try:
+        tracemalloc.start()
+        _run_output(spec, output, output_dir)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return {'time': min(times), 'peak_memory': peak, 'bytes': bytes_written}
+
+
+def run_benchmarks(model_counts=DEFAULT_MODELS, field_counts=DEFAULT_FIELDS,
+                   outputs=OUTPUTS, repeat=3, on_result=None):
+    results = {}
+    for n_models in model_counts:
+        for n_fields in field_counts:
+            spec = synthetic_spec(n_models, n_fields)
+            for output in outputs:
+                key = f'{n_models}x{n_fields}/{output}'
+                results[key] = measure(spec, output, repeat)
+                if on_result:
+                    on_result(key, results[key])
+    return results
+
+
+def save_results(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'results': results}, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+# Differences below these are measurement noise on the smallest shapes
+MIN_DELTA = {'time': 0.005, 'peak_memory': 64 * 1024}
+
+
+def compare(results, baseline, threshold=0.2):
+    # Returns (key, metric, baseline value, new value, ratio) for every metric
+    # that got worse by more than threshold (0.2 = 20%)
+    regressions = []
+    for key, metrics in results.items():
+        old = baseline.get(key)
+        if not old:
+            continue
+        for metric in ('time', 'peak_memory'):
+            if old.get(metric):
+                ratio = metrics[metric] / old[metric]
+                if ratio > 1 + threshold and metrics[metric] - old[metric] > MIN_DELTA[metric]:
+                    regressions.append((key, metric, old[metric], metrics[metric], ratio))
+    return regressions
@@ -0,0 +1,489 @@
+# Command line front end: python -m odoomaster generate spec.json -o out/
+import argparse
+import os
+import sys
+import time
+
+from .archive import ARCHIVE_FORMATS, generate_archive
+from . import bench
+from .batch import find_specs, generate_batch
+from .deploy import DEFAULT_ADDONS_PATH, DEFAULT_ODOO_COMMAND, DeployError, deploy_module
+from .model_index import ModelIndex, default_addons_paths
+from .importer import find_modules, import_module, import_modules, is_module
+from .generator import generate_bash_script, generate_module, render_module
+from .profiling import GenerationStats, profiled, timed
+from .spec import SpecError, load_spec, save_spec
+from .suite import generate_suite, load_suite
+from .template import TemplateError, set_template_dirs
+from .validation import check_spec
+from .verify import verify_module, verify_modules
+from .watch import InotifyWatcher, watch_specs
+
+
+def cmd_generate(args):
+    try:
+        spec = load_spec(args.spec)
+        if args.demo_rows is not None:
+            spec.demo_rows = args.demo_rows
+        check_spec(spec)
+    except (OSError, SpecError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    set_template_dirs(args.templates)
+    stats = GenerationStats() if args.timings else None
+    try:
+        os.makedirs(args.output, exist_ok=True)
+        with profiled(args.profile), timed(stats):
+            files = render_module(spec, stats)
+            report = generate_module(spec, args.output, files, stats)
+            if args.archive:
+                archive_path, installer_path = generate_archive(spec, args.output, files,
+                                                                args.archive, not args.no_verify)
+            elif not args.no_script:
+                script_path = generate_bash_script(spec, args.output, files, stats)
+    except (OSError, TemplateError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Module generated successfully at {report.module_path} ({report.summary()})")
+    if args.verbose:
+        for status in ('created', 'updated', 'deleted'):
+            for path in getattr(report, status):
+                print(f"  {status:<9} {path}")
+    if args.archive:
+        print(f"Archive generated at {archive_path}")
+        print(f"Installer generated at {installer_path}")
+    elif not args.no_script:
+        print(f"Bash script generated at {script_path}")
+    if stats is not None:
+        print(stats.format())
+    if args.profile:
+        print(f"Profile written to {args.profile}")
+    if not args.no_check:
+        result = verify_module(report.module_path)
+        if not result.ok:
+            print_problems(result)
+            return 1
+    return 0
+
+
+def print_problems(result):
+    print(f"Verification of {result.module_path} found {len(result.problems)} problem"
+          f"{'s' if len(result.problems) != 1 else ''}:", file=sys.stderr)
+    for problem in result.problems:
+        print(f"  {problem}", file=sys.stderr)
+
+
+def cmd_deploy(args):
+    set_template_dirs(args.templates)
+    try:
+        spec = load_spec(args.spec)
+        if args.demo_rows is not None:
+            spec.demo_rows = args.demo_rows
+        check_spec(spec)
+        result = deploy_module(spec, args.addons_path, odoo_command=args.odoo_bin,
+                               config=args.config, database=args.database,
+                               upgrade=not args.no_upgrade)
+    except (OSError, SpecError, DeployError, TemplateError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    report = result.report
+    print(f"Deployed {spec.name} to {report.module_path} ({report.summary()})")
+    for status in ('created', 'updated', 'deleted'):
+        for path in getattr(report, status):
+            print(f"  {status:<9} {path}")
+    if result.upgraded:
+        print(f"Ran {' '.join(result.command)}")
+        print("Restart the Odoo service to load the new Python code.")
+    elif result.schema_changes:
+        print("Schema changed, upgrade skipped (--no-upgrade).")
+    else:
+        print("No schema changes, no upgrade needed.")
+    return 0
+
+
+def cmd_batch(args):
+    try:
+        spec_paths = find_specs(args.source)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not spec_paths:
+        print(f"Error: no module specs found in {args.source}", file=sys.stderr)
+        return 1
+
+    def report(result):
+        if result.ok:
+            print(f"  ok      {result.module_name} ({result.elapsed:.3f}s)")
+        else:
+            print(f"  FAILED  {result.spec_path}: {result.error}")
+
+    try:
+        summary = generate_batch(spec_paths, args.output, args.jobs,
+                                 not args.no_script, report, args.templates)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{len(summary.succeeded)} generated, {len(summary.failed)} failed "
+          f"in {summary.wall_time:.2f}s with {summary.workers} workers "
+          f"({summary.throughput:.1f} modules/s)")
+    return 1 if summary.failed else 0
+
+
+def cmd_suite(args):
+    try:
+        suite = load_suite(args.source)
+        cycles = suite.cycles_message()
+    except (OSError, SpecError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if cycles:
+        print(f"Error: {cycles}", file=sys.stderr)
+        return 1
+
+    for name in sorted(suite.specs):
+        depends = ', '.join(sorted(suite.depends[name])) or '-'
+        print(f"  {name:<30} depends on {depends}")
+    if args.dry_run:
+        for number, level in enumerate(suite.levels()):
+            print(f"level {number}: {', '.join(level)}")
+        return 0
+
+    def level(number, names):
+        print(f"level {number}: {len(names)} module{'s' if len(names) != 1 else ''}", flush=True)
+
+    def report(result):
+        if result.ok:
+            print(f"  ok      {result.module_name} ({result.elapsed:.3f}s)", flush=True)
+        else:
+            print(f"  FAILED  {result.module_name or result.spec_path}: {result.error}", flush=True)
+
+    try:
+        summary = generate_suite(suite, args.output, args.jobs, not args.no_script, report,
+                                 args.templates, level)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{len(summary.succeeded)} generated, {len(summary.failed)} failed "
+          f"in {summary.wall_time:.2f}s with {summary.workers} workers")
+    return 1 if summary.failed else 0
+
+
+def cmd_verify(args):
+    module_paths = []
+    for path in args.path:
+        if is_module(path):
+            module_paths.append(path)
+        elif os.path.isdir(path):
+            module_paths.extend(find_modules(path))
+        else:
+            print(f"Error: {path} is not a module or an addons directory", file=sys.stderr)
+            return 1
+
+    start = time.perf_counter()
+    results = verify_modules(module_paths, args.jobs)
+    for result in results:
+        if result.ok:
+            print(f"  ok      {os.path.basename(os.path.normpath(result.module_path))} ({result.files} files)")
+        else:
+            print_problems(result)
+    failed = [result for result in results if not result.ok]
+    print(f"{len(results)} modules, {sum(result.files for result in results)} files checked, "
+          f"{len(failed)} with problems in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+def cmd_watch(args):
+    for spec_path in args.spec:
+        if not os.path.isfile(spec_path):
+            print(f"Error: {spec_path} is not a file", file=sys.stderr)
+            return 1
+    set_template_dirs(args.templates)
+
+    def report(result):
+        name = result.module_name or os.path.basename(result.spec_path)
+        if result.error:
+            print(f"  FAILED  {name}: {result.error}", flush=True)
+            return
+        print(f"  {'ok' if result.ok else 'PROBLEMS':<7} {name}: {len(result.rendered)} models rendered, "
+              f"{result.report.summary()} ({result.elapsed * 1000:.0f}ms)", flush=True)
+        for problem in result.problems:
+            print(f"    {problem}", flush=True)
+
+    def ready(watcher):
+        how = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+        print(f"Watching {len(args.spec)} spec{'s' if len(args.spec) != 1 else ''} ({how}), "
+              f"Ctrl+C to stop", flush=True)
+
+    try:
+        watch_specs(args.spec, args.output, report, not args.no_script, not args.no_check,
+                    args.poll, on_ready=ready)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_import(args):
+    if not os.path.isdir(args.path):
+        print(f"Error: {args.path} is not a directory", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        if is_module(args.path):
+            spec, warnings = import_module(args.path, args.jobs)
+            output = args.output or f"{spec.name}.json"
+            save_spec(spec, output)
+            print(f"Imported {spec.name} ({len(spec.models)} models) into {output}")
+            results = [(spec, warnings)]
+        else:
+            # An addons directory: one spec file per module
+            output_dir = args.output or os.getcwd()
+            os.makedirs(output_dir, exist_ok=True)
+            results = import_modules(find_modules(args.path), args.jobs)
+            for spec, warnings in results:
+                save_spec(spec, os.path.join(output_dir, f"{spec.name}.json"))
+            print(f"Imported {len(results)} modules into {output_dir}")
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for spec, warnings in results:
+        for warning in warnings:
+            print(f"  warning: {warning}", file=sys.stderr)
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cmd_index(args):
+    addons_paths = args.addons_path or default_addons_paths()
+    if not addons_paths:
+        print("Error: no addons path found, pass one or set ODOOMASTER_ADDONS_PATH",
+              file=sys.stderr)
+        return 1
+
+    index = ModelIndex.load(args.index)
+    start = time.perf_counter()
+    stats = index.refresh(addons_paths, args.jobs)
+    if stats.parsed or stats.removed or not os.path.exists(index.path):
+        index.save()
+    print(f"{len(index.models())} models in {stats.scanned} files "
+          f"({stats.parsed} parsed, {stats.removed} removed) in "
+          f"{time.perf_counter() - start:.2f}s, saved to {index.path}")
+    if args.query is not None:
+        for name in index.complete(args.query):
+            print(name)
+    return 0
+
+
+def _row_count(value):
+    try:
+        rows = int(value)
+    except ValueError:
+        rows = -1
+    if rows < 0:
+        raise argparse.ArgumentTypeError(f"expected a row count, got '{value}'")
+    return rows
+
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{value}'")
+    return number
+
+
+def _int_list(value):
+    try:
+        return [int(item) for item in value.split(',') if item]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma separated integers, got '{value}'")
+
+
+def _output_list(value):
+    outputs = [item for item in value.split(',') if item]
+    if not outputs or any(output not in bench.OUTPUTS for output in outputs):
+        raise argparse.ArgumentTypeError(f"expected comma separated outputs among "
+                                         f"{', '.join(bench.OUTPUTS)}, got '{value}'")
+    return outputs
+
+
+def cmd_bench(args):
+    baseline = None
+    if args.compare:
+        try:
+            baseline = bench.load_results(args.compare)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: cannot read baseline {args.compare}: {e}", file=sys.stderr)
+            return 1
+
+    print(f"{'shape':<20} {'time':>10} {'peak mem':>10} {'written':>10}" + ("  vs baseline" if baseline else ""))
+
+    def report(key, result):
+        line = (f"{key:<20} {result['time'] * 1000:>8.1f}ms {result['peak_memory'] / 1e6:>8.2f}MB "
+                f"{result['bytes'] / 1e6:>8.2f}MB")
+        old = baseline.get(key) if baseline else None
+        if old:
+            line += f"  time x{result['time'] / old['time']:.2f}, mem x{result['peak_memory'] / old['peak_memory']:.2f}"
+        print(line, flush=True)
+
+    results = bench.run_benchmarks(args.models, args.fields, args.outputs, args.repeat, report)
+
+    if args.save:
+        bench.save_results(results, args.save)
+        print(f"Results saved to {args.save}")
+    if baseline:
+        regressions = bench.compare(results, baseline, args.threshold)
+        for key, metric, old, new, ratio in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.4g} -> {new:.4g} (x{ratio:.2f})")
+        if regressions:
+            return 1
+    return 0
+
+
+def _add_templates_argument(parser):
+    parser.add_argument('--templates', action='append', metavar='DIR',
+                        help='directory of .tmpl files overriding the built-in templates '
+                             '(repeatable, also ODOOMASTER_TEMPLATES)')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='odoomaster',
+                                     description='Odoo module generator')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help='generate a module from a JSON spec')
+    generate.add_argument('spec', help='path to the module spec (JSON)')
+    generate.add_argument('-o', '--output', default=os.getcwd(),
+                          help='directory where the module is created (default: cwd)')
+    generate.add_argument('--no-script', action='store_true',
+                          help='do not generate the create_<module>_module.sh script')
+    generate.add_argument('--archive', choices=ARCHIVE_FORMATS,
+                          help='package the module as an archive with a one-shot '
+                               'install_<module>.sh instead of the bash script')
+    generate.add_argument('--no-verify', action='store_true',
+                          help='do not embed a SHA-256 check in the archive installer')
+    _add_templates_argument(generate)
+    generate.add_argument('--timings', action='store_true',
+                          help='print wall time, files and bytes per phase and the slowest models')
+    generate.add_argument('--profile', metavar='FILE',
+                          help='run under cProfile and write the pstats dump to FILE')
+    generate.add_argument('-v', '--verbose', action='store_true',
+                          help='list every created, updated and deleted file')
+    generate.add_argument('--no-check', action='store_true',
+                          help='do not verify the generated module (see the verify command)')
+    generate.add_argument('--demo-rows', type=_row_count, metavar='N',
+                          help='write N demo records per model to demo/<model>.csv '
+                               '(default: demo_rows of the spec, 0 for none)')
+    generate.set_defaults(func=cmd_generate)
+
+    deploy = subparsers.add_parser('deploy', help='write a module into an addons path and '
+                                                  'upgrade it only when its schema changed')
+    deploy.add_argument('spec', help='path to the module spec (JSON)')
+    deploy.add_argument('-a', '--addons-path', default=DEFAULT_ADDONS_PATH,
+                        help=f'addons directory to deploy into (default: {DEFAULT_ADDONS_PATH})')
+    deploy.add_argument('--odoo-bin', default=DEFAULT_ODOO_COMMAND,
+                        help='command that runs odoo-bin (default: the /opt/odoo17 venv)')
+    deploy.add_argument('-c', '--config', help='Odoo config file (default: /etc/odoo17.conf if present)')
+    deploy.add_argument('-d', '--database', help='database to upgrade')
+    _add_templates_argument(deploy)
+    deploy.add_argument('--no-upgrade', action='store_true',
+                        help='only copy the changed files, never run odoo-bin')
+    deploy.add_argument('--demo-rows', type=_row_count, metavar='N',
+                        help='write N demo records per model to demo/<model>.csv '
+                             '(default: demo_rows of the spec, 0 for none)')
+    deploy.set_defaults(func=cmd_deploy)
+
+    batch = subparsers.add_parser('batch', help='generate many modules in parallel')
+    batch.add_argument('source', help='directory of JSON specs, or a manifest file '
+                                      'listing one spec path per line')
+    batch.add_argument('-o', '--output', default=os.getcwd(),
+                       help='directory where the modules are created (default: cwd)')
+    batch.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                       help='number of worker processes (default: CPU count)')
+    _add_templates_argument(batch)
+    batch.add_argument('--no-script', action='store_true',
+                       help='do not generate the create_<module>_module.sh scripts')
+    batch.set_defaults(func=cmd_batch)
+
+    suite = subparsers.add_parser('suite', help='generate interrelated modules with computed depends, '
+                                                'in parallel in dependency order')
+    suite.add_argument('source', help='directory of JSON specs, or a manifest file '
+                                      'listing one spec path per line')
+    suite.add_argument('-o', '--output', default=os.getcwd(),
+                       help='directory where the modules are created (default: cwd)')
+    suite.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                       help='number of worker processes (default: CPU count)')
+    _add_templates_argument(suite)
+    suite.add_argument('--no-script', action='store_true',
+                       help='do not generate the create_<module>_module.sh scripts')
+    suite.add_argument('-n', '--dry-run', action='store_true',
+                       help='only print the depends and the generation levels')
+    suite.set_defaults(func=cmd_suite)
+
+    verify = subparsers.add_parser('verify', help='compile and parse modules offline, check their '
+                                                  'XML id references and manifest')
+    verify.add_argument('path', nargs='+', help='module directories or addons directories of modules')
+    verify.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                        help='number of worker processes (default: CPU count)')
+    verify.set_defaults(func=cmd_verify)
+
+    watch = subparsers.add_parser('watch', help='generate modules again whenever their spec changes')
+    watch.add_argument('spec', nargs='+', help='paths to module specs (JSON)')
+    watch.add_argument('-o', '--output', default=os.getcwd(),
+                       help='directory where the modules are created (default: cwd)')
+    watch.add_argument('--no-script', action='store_true',
+                       help='do not generate the create_<module>_module.sh scripts')
+    _add_templates_argument(watch)
+    watch.add_argument('--no-check', action='store_true',
+                       help='do not verify the regenerated modules')
+    watch.add_argument('--poll', action='store_true',
+                       help='poll the spec files instead of using inotify')
+    watch.set_defaults(func=cmd_watch)
+
+    import_ = subparsers.add_parser('import', help='build specs from existing Odoo modules')
+    import_.add_argument('path', help='module directory, or an addons directory of modules')
+    import_.add_argument('-o', '--output',
+                         help='spec file for a module (default: <module>.json), or '
+                              'directory for an addons directory (default: cwd)')
+    import_.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                         help='number of worker processes (default: CPU count)')
+    import_.set_defaults(func=cmd_import)
+
+    index = subparsers.add_parser('index', help='build or refresh the Many2one model index')
+    index.add_argument('addons_path', nargs='*',
+                       help='addons directories (default: ODOOMASTER_ADDONS_PATH or /opt/odoo17)')
+    index.add_argument('--index', help='index file (default: ~/.cache/odoomaster/model_index.json)')
+    index.add_argument('-q', '--query', help='print the models starting with this prefix')
+    index.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                       help='number of worker processes (default: CPU count)')
+    index.set_defaults(func=cmd_index)
+
+    bench_ = subparsers.add_parser('bench', help='benchmark generation over synthetic specs')
+    bench_.add_argument('--models', type=_int_list, default=list(bench.DEFAULT_MODELS),
+                        help='comma separated model counts (default: 1,10,100,1000)')
+    bench_.add_argument('--fields', type=_int_list, default=list(bench.DEFAULT_FIELDS),
+                        help='comma separated fields per model (default: 5,50,500)')
+    bench_.add_argument('--outputs', type=_output_list, default=list(bench.OUTPUTS),
+                        help='output paths to time: module, script (default: both)')
+    bench_.add_argument('--repeat', type=_positive_int, default=3, help='runs per shape, best is kept')
+    bench_.add_argument('--save', help='write the results to this baseline file')
+    bench_.add_argument('--compare', help='compare against a saved baseline file')
+    bench_.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown ratio reported as a regression (default: 0.2 = 20%%)')
+    bench_.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
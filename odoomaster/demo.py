@@ -0,0 +1,386 @@
+# Synthetic demo data for load testing: one demo/<model>.csv per model with
+# spec.demo_rows records, listed in the manifest 'demo' entries. Values follow
+# the field types and rules of the spec and Many2one columns point at demo
+# records of the target model. Rows are generated and written one at a time,
+# so a million-row file never has to fit in memory.
+import csv
+import datetime
+import functools
+import hashlib
+import io
+import json
+import math
+import random
+import time
+
+from .spec import SpecError
+
+
+DEMO_DIR = 'demo'
+
+# Bump when the generated values change, so existing files are rewritten
+DEMO_FORMAT = 2
+
+# Share of empty values in the optional text, date, selection and link columns
+BLANK_RATIO = 0.1
+
+# Records of the base module that external Many2one fields can point at
+BASE_RECORDS = {
+    'res.partner': 'base.main_partner',
+    'res.users': 'base.user_admin',
+    'res.company': 'base.main_company',
+    'res.currency': 'base.EUR',
+    'res.country': 'base.es',
+    'res.lang': 'base.lang_en',
+}
+
+DATE_START = datetime.date(2020, 1, 1)
+DATE_SPAN_DAYS = 5 * 365
+
+WORDS = ('alfa', 'bravo', 'delta', 'eco', 'golf', 'hotel', 'india', 'kilo', 'lima', 'mike',
+         'nova', 'oscar', 'papa', 'radio', 'sierra', 'tango', 'victor', 'zulu', 'norte', 'sur',
+         'azul', 'verde', 'rojo', 'casa', 'mesa', 'libro', 'puerto', 'campo', 'valle', 'monte')
+
+# Random texts drawn per field; they are cut to a random length for every row
+TEXT_POOL_SIZE = 256
+TEXT_MAX_LENGTH = 2000
+
+
+def demo_models(spec):
+    # Named models in load order: the targets of Many2one fields first. A
+    # cycle is cut where it closes, that link stays empty (see demo_links)
+    models = {model.name: model for model in spec.models if model.name}
+    order = {}
+
+    def visit(model, path):
+        path.add(model.name)
+        for field in model.fields:
+            target = models.get(field.comodel) if field.field_type == 'Many2one' and field.name else None
+            if target is not None and target.name not in order and target.name not in path:
+                visit(target, path)
+        path.discard(model.name)
+        order[model.name] = model
+
+    for model in models.values():
+        if model.name not in order:
+            visit(model, set())
+    return list(order.values())
+
+
+def demo_path(model):
+    return f'{DEMO_DIR}/{model.name}.csv'
+
+
+def demo_paths(spec):
+    # Manifest 'demo' entries, empty when the spec asks for no demo data
+    if not spec.demo_rows:
+        return []
+    return [demo_path(model) for model in demo_models(spec)]
+
+
+def demo_links(spec):
+    # Model name -> {field name: target}, where target is the model_id of a
+    # module model loaded before (or the model itself), a base XML id, or None
+    loaded = set()
+    links = {}
+    local = {model.name: model for model in spec.models if model.name}
+    for model in demo_models(spec):
+        loaded.add(model.name)
+        fields = links[model.name] = {}
+        for field in model.fields:
+            if field.field_type != 'Many2one' or not field.name:
+                continue
+            if field.comodel in loaded:
+                fields[field.name] = ('model', local[field.comodel].model_id)
+            elif field.comodel in local:
+                fields[field.name] = None
+            else:
+                fields[field.name] = ('xml_id', BASE_RECORDS[field.comodel]) \
+                    if field.comodel in BASE_RECORDS else None
+    return links
+
+
+def demo_columns(model):
+    # CSV header: the XML id of each record, then the named fields
+    return ['id'] + [f'{field.name}:id' if field.field_type == 'Many2one' else field.name
+                     for field in model.fields if field.name]
+
+
+def demo_signature(spec, model, links):
+    data = [DEMO_FORMAT, spec.demo_rows, model.to_dict(), sorted(links.items())]
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _bounds(minimum, maximum, default_min, default_max):
+    # A missing bound is derived from the one that is set, keeping the width
+    # of the default range, so a one-sided rule never yields an empty range
+    span = default_max - default_min
+    if minimum is None and maximum is None:
+        return default_min, default_max
+    if maximum is None:
+        return minimum, minimum + span
+    if minimum is None:
+        return maximum - span, maximum
+    if minimum > maximum:
+        raise SpecError(f"no demo value between {minimum} and {maximum}")
+    return minimum, maximum
+
+
+def _text_limits(field, rows, default_min, default_max):
+    # (minimum, maximum) length of the demo texts of a field
+    minimum, maximum = _bounds(field.min_length, field.max_length, default_min, default_max)
+    if field.field_type == 'Char' and field.size:
+        maximum = min(maximum, field.size)
+    minimum = max(int(math.ceil(minimum)), 1 if field.required else 0)
+    maximum = min(int(maximum), TEXT_MAX_LENGTH)
+    if minimum > maximum:
+        raise SpecError(f"no demo text is at least {minimum} and at most {maximum} characters long")
+    if field.unique and len(str(rows)) > maximum:
+        raise SpecError(f"only {10 ** maximum - 1} distinct demo values fit in {maximum} "
+                        f"characters, {rows} demo records were asked for")
+    return minimum, maximum
+
+
+def _integer_limits(field, rows):
+    minimum, maximum = _bounds(field.min_value, field.max_value, 0, 1000)
+    minimum, maximum = int(math.ceil(minimum)), int(math.floor(maximum))
+    if minimum > maximum:
+        raise SpecError(f"no demo integer between {field.min_value} and {field.max_value}")
+    if field.unique and maximum - minimum + 1 < rows:
+        raise SpecError(f"only {maximum - minimum + 1} distinct demo integers between {minimum} and "
+                        f"{maximum}, {rows} demo records were asked for")
+    return minimum, maximum
+
+
+# Char and Text: default length range and words at the start of each text
+TEXT_SHAPES = {'Char': (4, 30, 2), 'Text': (20, 400, 12)}
+
+
+def _link_limits(field, model, link, rows, local):
+    # A required link needs a record for every row, a unique one a different
+    # record for every row; local holds the model names of the module
+    if link is None:
+        if field.required and field.comodel in local:
+            raise SpecError(f"{field.comodel} demo records are loaded after {model.name} (dependency "
+                            f"cycle), the required link would stay empty")
+        if field.required:
+            raise SpecError(f"no demo record of {field.comodel} to link to, the required link would "
+                            f"stay empty")
+        return
+    kind, target = link
+    if kind == 'xml_id' and field.unique and rows > 1:
+        raise SpecError(f"only one {field.comodel} record to link to, {rows} demo records were asked for")
+    if target == model.model_id and field.required:
+        raise SpecError("the first demo record has no earlier record to link to, the required link "
+                        "would stay empty")
+
+
+def demo_issues(spec):
+    # (model, row, field, message) for each field whose rules leave no valid
+    # demo values for spec.demo_rows records; expects numeric bounds
+    issues = []
+    if not spec.demo_rows:
+        return issues
+    all_links = demo_links(spec)
+    local = {model.name for model in spec.models if model.name}
+    for model in demo_models(spec):
+        for row, field in enumerate(model.fields):
+            if not field.name:
+                continue
+            try:
+                if field.field_type == 'Many2one':
+                    _link_limits(field, model, all_links[model.name][field.name], spec.demo_rows, local)
+                elif field.field_type in TEXT_SHAPES:
+                    _text_limits(field, spec.demo_rows, *TEXT_SHAPES[field.field_type][:2])
+                elif field.field_type == 'Integer':
+                    _integer_limits(field, spec.demo_rows)
+                elif field.field_type == 'Float':
+                    _bounds(field.min_value, field.max_value, 0, 1000)
+            except SpecError as e:
+                issues.append((model, row, field, str(e)))
+    return issues
+
+
+def _text_column(field, rng, rows, default_min, default_max, words_per_text):
+    minimum, maximum = _text_limits(field, rows, default_min, default_max)
+    pool = []
+    for _ in range(TEXT_POOL_SIZE):
+        text = ' '.join(rng.choice(WORDS) for _ in range(words_per_text)).capitalize()
+        while len(text) < maximum:
+            text += ' ' + rng.choice(WORDS)
+        pool.append(text)
+    blank = not field.required and not field.unique
+    randint, choice, chance = rng.randint, rng.choice, rng.random
+
+    if field.unique:
+        # The row number at the end keeps the values distinct (the words
+        # have no digits); it loses its space when there is no room for it
+        def value(n):
+            digits = str(n)
+            room = max(randint(minimum, maximum), len(digits)) - len(digits)
+            if room < 2:
+                return choice(pool)[:room] + digits
+            return choice(pool)[:room - 1] + ' ' + digits
+        return value
+
+    def value(n):
+        if blank and chance() < BLANK_RATIO:
+            return ''
+        text = choice(pool)[:randint(minimum, maximum)]
+        # Cut after a word: keep the length, Odoo would strip the space
+        return text[:-1] + 's' if text.endswith(' ') else text
+    return value
+
+
+def _integer_column(field, rng, rows):
+    minimum, maximum = _integer_limits(field, rows)
+    if field.unique:
+        return lambda n: str(minimum + n - 1)
+    randint = rng.randint
+    return lambda n: str(randint(minimum, maximum))
+
+
+def _float_column(field, rng, rows):
+    minimum, maximum = _bounds(field.min_value, field.max_value, 0, 1000)
+    if field.unique:
+        # Evenly spread over the range, rounding would repeat values
+        step = (maximum - minimum) / max(rows - 1, 1)
+        return lambda n: repr(minimum + step * (n - 1))
+    uniform = rng.uniform
+    return lambda n: repr(min(max(round(uniform(minimum, maximum), 2), minimum), maximum))
+
+
+def _boolean_column(field, rng, rows):
+    chance = rng.random
+    return lambda n: 'True' if chance() < 0.5 else 'False'
+
+
+def _date_column(field, rng, rows):
+    blank = not field.required and not field.unique
+    randrange, chance = rng.randrange, rng.random
+    start = datetime.datetime.combine(DATE_START, datetime.time())
+    if field.field_type == 'Date':
+        def value(n):
+            if blank and chance() < BLANK_RATIO:
+                return ''
+            day = n - 1 if field.unique else randrange(DATE_SPAN_DAYS)
+            return (DATE_START + datetime.timedelta(days=day)).isoformat()
+        return value
+
+    def value(n):
+        if blank and chance() < BLANK_RATIO:
+            return ''
+        second = n - 1 if field.unique else randrange(DATE_SPAN_DAYS * 86400)
+        return (start + datetime.timedelta(seconds=second)).strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def _selection_column(field, rng, rows):
+    keys = [key for key, value in field.selection if key and value]
+    blank = not field.required or not keys
+    choice, chance = rng.choice, rng.random
+
+    def value(n):
+        if blank and (not keys or chance() < BLANK_RATIO):
+            return ''
+        return choice(keys)
+    return value
+
+
+def _many2one_column(field, rng, rows, model, link):
+    if link is None:
+        return lambda n: ''
+    kind, target = link
+    blank = not field.required and not field.unique
+    randint, chance = rng.randint, rng.random
+    if kind == 'xml_id':
+        return lambda n: '' if blank and chance() < BLANK_RATIO else target
+    if target == model.model_id:
+        # Only records of earlier rows exist when a row is loaded
+        def value(n):
+            if n == 1 or (blank and chance() < BLANK_RATIO):
+                return ''
+            return f'demo_{target}_{n - 1 if field.unique else randint(1, n - 1)}'
+        return value
+
+    def value(n):
+        if blank and chance() < BLANK_RATIO:
+            return ''
+        return f'demo_{target}_{n if field.unique else randint(1, rows)}'
+    return value
+
+
+def _column(field, rng, rows, model, links):
+    if field.field_type in TEXT_SHAPES:
+        return _text_column(field, rng, rows, *TEXT_SHAPES[field.field_type])
+    if field.field_type == 'Integer':
+        return _integer_column(field, rng, rows)
+    if field.field_type == 'Float':
+        return _float_column(field, rng, rows)
+    if field.field_type == 'Boolean':
+        return _boolean_column(field, rng, rows)
+    if field.field_type in ('Date', 'Datetime'):
+        return _date_column(field, rng, rows)
+    if field.field_type == 'Selection':
+        return _selection_column(field, rng, rows)
+    return _many2one_column(field, rng, rows, model, links.get(field.name))
+
+
+def iter_demo_rows(spec, model, links=None):
+    # Yields the header and then one list of strings per record
+    rows = spec.demo_rows
+    if links is None:
+        links = demo_links(spec)[model.name]
+    # Seeded per model: the same spec always gives the same file
+    rng = random.Random(f'{spec.name}/{model.name}')
+    columns = [_column(field, rng, rows, model, links) for field in model.fields if field.name]
+    yield demo_columns(model)
+    prefix = f'demo_{model.model_id}_'
+    for n in range(1, rows + 1):
+        yield [prefix + str(n)] + [column(n) for column in columns]
+
+
+def write_demo_csv(f, spec, model, links=None):
+    # f is a binary file, left open
+    text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+    csv.writer(text, lineterminator='\n').writerows(iter_demo_rows(spec, model, links))
+    text.flush()
+    text.detach()
+
+
+def iter_demo_files(spec):
+    # Yields (path, write) pairs for the installers, write(f) streams the
+    # file into the binary file f
+    if not spec.demo_rows:
+        return
+    all_links = demo_links(spec)
+    for model in demo_models(spec):
+        yield demo_path(model), functools.partial(write_demo_csv, spec=spec, model=model,
+                                                  links=all_links[model.name])
+
+
+def demo_streams(spec, stats=None):
+    # (path, signature, write) for writer.write_module(): the files are
+    # streamed into the staged module and only when their signature changed
+    if not spec.demo_rows:
+        return []
+    # Raised here, before anything is staged
+    issues = demo_issues(spec)
+    if issues:
+        raise SpecError("invalid demo data:\n" + '\n'.join(
+            f"  {model.name}: field '{field.name}': {message}" for model, _, field, message in issues))
+    all_links = demo_links(spec)
+    streams = []
+    for model in demo_models(spec):
+        links = all_links[model.name]
+        write = functools.partial(write_demo_csv, spec=spec, model=model, links=links)
+        if stats is not None:
+            write = functools.partial(_timed_write, write, stats)
+        streams.append((demo_path(model), demo_signature(spec, model, links), write))
+    return streams
+
+
+def _timed_write(write, stats, f):
+    start = time.perf_counter()
+    write(f)
+    stats.record('demo_data', time.perf_counter() - start, 1, f.tell())
@@ -0,0 +1,106 @@
+# Deploy a generated module straight into an Odoo addons path. Only files whose
+# content changed are written (see writer.write_module) and odoo-bin is only run
+# when something Odoo loads into the database changed.
+import os
+import shlex
+import subprocess
+
+from .generator import generate_module
+from .verify import verify_module
+
+
+# Layout created by InstallOdooAndModule.sh
+DEFAULT_ADDONS_PATH = '/opt/odoo17/odoo17-custom-addons'
+DEFAULT_ODOO_COMMAND = '/opt/odoo17/odoo17-venv/bin/python3 /opt/odoo17/odoo17/odoo-bin'
+DEFAULT_ODOO_CONFIG = '/etc/odoo17.conf'
+
+# Changes to these reach the database (models, access rules, views, menus, demo records)
+SCHEMA_FILES = ('__manifest__.py', '__init__.py')
+SCHEMA_PREFIXES = ('models/', 'security/', 'views/', 'data/', 'demo/')
+
+# Left in the module while an upgrade failed, so the next deploy retries it
+PENDING_FILE = '.odoomaster_upgrade_pending'
+
+
+class DeployError(RuntimeError):
+    pass
+
+
+class DeployResult:
+    __slots__ = ('report', 'schema_changes', 'command', 'output')
+
+    def __init__(self, report, schema_changes):
+        self.report = report
+        self.schema_changes = schema_changes
+        # odoo-bin command line and its output, None when it was not run
+        self.command = None
+        self.output = None
+
+    @property
+    def upgraded(self):
+        return self.command is not None
+
+
+def schema_changes(report):
+    return [path for path in report.created + report.updated + report.deleted
+            if path in SCHEMA_FILES or path.startswith(SCHEMA_PREFIXES)]
+
+
+def upgrade_command(module_name, odoo_command=DEFAULT_ODOO_COMMAND, config=None,
+                    database=None, install=False):
+    command = shlex.split(odoo_command)
+    if config:
+        command += ['-c', config]
+    if database:
+        command += ['-d', database]
+    # -u does nothing for a module that is not installed yet
+    command += ['-i' if install else '-u', module_name, '--stop-after-init']
+    return command
+
+
+def deploy_module(spec, addons_path=DEFAULT_ADDONS_PATH, files=None, odoo_command=DEFAULT_ODOO_COMMAND,
+                  config=None, database=None, upgrade=True, stats=None):
+    if not os.path.isdir(addons_path):
+        raise DeployError(f"{addons_path} is not a directory")
+    if config is None and os.path.exists(DEFAULT_ODOO_CONFIG):
+        config = DEFAULT_ODOO_CONFIG
+
+    module_path = os.path.join(addons_path, spec.name)
+    install = not os.path.isdir(module_path)
+
+    def check(tree):
+        # Runs on the staged module: one Odoo cannot load never replaces the
+        # deployed one
+        verification = verify_module(tree, workers=1, module_name=spec.name)
+        if not verification.ok:
+            raise DeployError(f"{module_path} failed verification, not deployed:\n"
+                              + '\n'.join(f"  {problem}" for problem in verification.problems))
+
+    report = generate_module(spec, addons_path, files, stats, check=check)
+    result = DeployResult(report, schema_changes(report))
+    pending_path = os.path.join(module_path, PENDING_FILE)
+    if os.path.exists(pending_path):
+        result.schema_changes.append(PENDING_FILE)
+    if not upgrade or not result.schema_changes:
+        return result
+
+    # Written before running odoo-bin, removed once it succeeded
+    if not os.path.exists(pending_path):
+        with open(pending_path, 'w') as f:
+            f.write('-i\n' if install else '-u\n')
+    with open(pending_path) as f:
+        install = f.read().strip() == '-i'
+
+    result.command = upgrade_command(spec.name, odoo_command, config, database, install)
+    try:
+        completed = subprocess.run(result.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   universal_newlines=True)
+    except OSError as e:
+        raise DeployError(f"cannot run {result.command[0]}: {e}") from None
+    result.output = completed.stdout
+    if completed.returncode != 0:
+        tail = '\n'.join(completed.stdout.splitlines()[-20:])
+        command = ' '.join(shlex.quote(arg) for arg in result.command)
+        raise DeployError(f"{command} exited with status {completed.returncode}\n{tail}")
+    os.remove(pending_path)
+    return result
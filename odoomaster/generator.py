@@ -0,0 +1,396 @@
+# Generation engine: turns a ModuleSpec into an Odoo module tree and an
+# installer script. Nothing in here may import Qt.
+import json
+import os
+import re
+import time
+from xml.sax.saxutils import escape, quoteattr
+
+from .demo import demo_paths, demo_streams, iter_demo_files
+from .model_index import comodel_modules
+from .script import write_bash_script
+from .template import get_template, render
+from .validation import is_number
+from .writer import staged_file, write_module
+
+
+def validation_rule(field):
+    # ('value' | 'length', minimum, maximum) of a field with a range rule, a
+    # missing bound is None: the rule only checks the other side
+    if field.field_type in ['Integer', 'Float']:
+        if field.min_value is not None or field.max_value is not None:
+            return ('value', field.min_value, field.max_value)
+    elif field.field_type in ['Char', 'Text']:
+        if field.min_length is not None or field.max_length is not None:
+            return ('length', field.min_length, field.max_length)
+    return None
+
+
+def rule_message(field, rule):
+    kind, minimum, maximum = rule
+    if minimum is None:
+        limit = f'ser como máximo {maximum}'
+    elif maximum is None:
+        limit = f'ser al menos {minimum}'
+    else:
+        limit = f'estar entre {minimum} y {maximum}'
+    if kind == 'value':
+        return f'El valor de {field.label} debe {limit}'
+    return f'La longitud de {field.label} debe {limit} caracteres'
+
+
+def sql_check(field):
+    # CHECK expression enforcing the rule of a field in PostgreSQL, or None when
+    # the rule cannot be written as one (bounds that are not plain numbers)
+    rule = validation_rule(field)
+    if rule is None or not all(bound is None or is_number(bound) for bound in rule[1:]):
+        return None
+    kind, minimum, maximum = rule
+    column = field.name if kind == 'value' else f'char_length({field.name})'
+    if minimum is None:
+        check = f'{column} <= {maximum}'
+    elif maximum is None:
+        check = f'{column} >= {minimum}'
+    else:
+        check = f'{column} BETWEEN {minimum} AND {maximum}'
+    # As in the Python checks, empty values are not validated (NULL passes a CHECK)
+    if not ((minimum is None or minimum <= 0) and (maximum is None or 0 <= maximum)):
+        check = f'{column} = 0 OR {check}'
+    return f'CHECK({check})'
+
+
+def sql_constraints(model, use_checks=True):
+    # (name, definition, message) tuples for _sql_constraints
+    constraints = []
+    for field in model.fields:
+        if not field.name:
+            continue
+        check = sql_check(field) if use_checks else None
+        if check:
+            rule = validation_rule(field)
+            suffix = 'range' if rule[0] == 'value' else 'length'
+            constraints.append((f'{field.name}_{suffix}', check, rule_message(field, rule)))
+        if field.unique:
+            constraints.append((f'{field.name}_unique', f'UNIQUE({field.name})',
+                                f'El valor de {field.label} debe ser único'))
+    return constraints
+
+
+def get_validation_code(field, use_sql_constraints=False):
+    # Check of one field inside the model's constraint method, for the rules
+    # that are not enforced by the database
+    rule = validation_rule(field)
+    if rule is None or (use_sql_constraints and sql_check(field)):
+        return ''
+    kind, minimum, maximum = rule
+    value = f'record.{field.name}' if kind == 'value' else f'len(record.{field.name})'
+    condition = ' or '.join(([f'{value} < {minimum}'] if minimum is not None else [])
+                            + ([f'{value} > {maximum}'] if maximum is not None else []))
+    # A plain string literal: the label must not be read as f-string fields
+    return render('model_validation_check', name=field.name, condition=condition,
+                  message=repr(rule_message(field, rule)))
+
+
+def get_validation_method(model, use_sql_constraints=False):
+    # A single @api.constrains method checks every rule in one pass over the
+    # records and reports all violations together
+    checks = [(field.name, get_validation_code(field, use_sql_constraints))
+              for field in model.fields if field.name]
+    checks = [(name, code) for name, code in checks if code]
+    if not checks:
+        return ''
+    return render('model_validations', fields=', '.join(f"'{name}'" for name, _ in checks),
+                  checks=''.join(code for _, code in checks))
+
+
+def field_index(field):
+    # Value of index= for a field: text columns searched from the search view
+    # get a trigram index (serves ilike), other flagged columns a btree one
+    if field.searchable and field.field_type in ('Char', 'Text'):
+        return 'trigram'
+    if field.index or field.in_search_view:
+        return True
+    return None
+
+
+def xml_attribute(value):
+    # Text for an attribute between double quotes in a generated XML file
+    return escape(str(value), {'"': '&quot;'})
+
+
+def search_filters(field):
+    # (name, label, condition attribute) of the <filter> elements of a
+    # filterable field, ready to be written into the XML
+    label = xml_attribute(field.label)
+    if field.field_type in ('Date', 'Datetime'):
+        # Odoo's period picker (this month, last quarter...)
+        return [(f'filter_{field.name}', label, f'date="{field.name}"')]
+    if field.field_type == 'Boolean':
+        return [(f'filter_{field.name}', label, f'domain={quoteattr(repr([(field.name, "=", True)]))}')]
+    if field.field_type == 'Selection':
+        filters = []
+        names = set()
+        for key, value in field.selection:
+            if not (key and value):
+                continue
+            # Selection keys can be any string, filter names must stay plain
+            name = f"filter_{field.name}_{re.sub(r'[^0-9A-Za-z_]', '_', key)}"
+            while name in names:
+                name += '_'
+            names.add(name)
+            filters.append((name, xml_attribute(value),
+                            f'domain={quoteattr(repr([(field.name, "=", key)]))}'))
+        return filters
+    return [(f'filter_{field.name}', xml_attribute(f'{field.label} Set'),
+             f'domain={quoteattr(repr([(field.name, "!=", False)]))}')]
+
+
+def named_models(spec):
+    return [model for model in spec.models if model.name]
+
+
+def module_depends(spec):
+    # 'base' first, then the explicit depends and the addons that define the
+    # comodels (unknown ones are reported by validation.comodel_issues)
+    depends = set(spec.depends)
+    depends.update(module for module in comodel_modules(spec).values() if module)
+    depends.discard('base')
+    depends.discard(spec.name)
+    return ['base'] + sorted(depends)
+
+
+def generate_module(spec, output_dir, files=None, stats=None, progress=None, check=None):
+    # Pass the result of render_module() to share it with generate_bash_script(),
+    # and a GenerationStats to collect per-phase timings. check is passed on to
+    # write_module(), it sees the new module before it replaces the old one.
+    if files is None:
+        files = render_module(spec, stats)
+    module_path = os.path.join(output_dir, spec.name)
+    start = time.perf_counter()
+    # The icon placeholder never overwrites a real icon; the demo data is
+    # streamed into the staged tree, so it is swapped in with the rest
+    report = write_module(module_path, files, progress, ('static/description/icon.png',),
+                          streams=demo_streams(spec, stats), check=check)
+    if stats is not None:
+        written = [path for path in report.created + report.updated if path in files]
+        stats.record('write_module', time.perf_counter() - start, len(written),
+                     sum(len(files[path]) for path in written))
+    return report
+
+
+class RenderCache:
+    # Model and view files of each model from the previous render, keyed by
+    # the model definition: rendering an edited spec again only renders the
+    # models that changed. Only valid while the templates stay the same.
+    __slots__ = ('entries', 'rendered')
+
+    def __init__(self):
+        # (definition, sql_constraints) -> (model file, views file)
+        self.entries = {}
+        # Names of the models rendered by the last update()
+        self.rendered = []
+
+    def update(self, spec, stats=None):
+        # Returns the (model file, views file) of every named model of spec
+        entries = {}
+        self.rendered = []
+        files = []
+        for model in named_models(spec):
+            key = (json.dumps(model.to_dict(), sort_keys=True), spec.sql_constraints)
+            pair = entries.get(key) or self.entries.get(key)
+            if pair is None:
+                pair = (_render(stats, 'generate_models', render_model, model, spec.sql_constraints,
+                                model=model.name),
+                        _render(stats, 'generate_views', render_views, model, model=model.name))
+                self.rendered.append(model.name)
+            entries[key] = pair
+            files.append(pair)
+        # Models that are gone are dropped
+        self.entries = entries
+        return files
+
+
+def render_module(spec, stats=None, cache=None):
+    # Map of path (relative to the module directory) to file content
+    return dict(iter_module_files(spec, stats, cache))
+
+
+def iter_module_files(spec, stats=None, cache=None):
+    # Yields (path, bytes) one file at a time, so callers that stream their
+    # output never need the whole module in memory. With a RenderCache the
+    # unchanged models are not rendered again.
+    models = named_models(spec)
+    cached = cache.update(spec, stats) if cache is not None else None
+    yield '__init__.py', _render(stats, 'generate_manifest', render_init, spec)
+    yield '__manifest__.py', _render(stats, 'generate_manifest', render_manifest, spec)
+    yield 'models/__init__.py', _render(stats, 'generate_models', render_models_init, spec)
+    for i, model in enumerate(models):
+        yield (f'models/{model.short_name}.py',
+               cached[i][0] if cached is not None else
+               _render(stats, 'generate_models', render_model, model, spec.sql_constraints,
+                       model=model.name))
+    yield 'security/ir.model.access.csv', _render(stats, 'generate_security', render_security, spec)
+    for i, model in enumerate(models):
+        yield (f'views/{model.short_name}_views.xml',
+               cached[i][1] if cached is not None else
+               _render(stats, 'generate_views', render_views, model, model=model.name))
+    yield 'views/menu_views.xml', _render(stats, 'generate_menu_views', render_menu_views, spec)
+
+
+def module_file_count(spec):
+    # Number of files iter_module_files() yields
+    return 5 + 2 * len(named_models(spec))
+
+
+def _render(stats, phase, render, *args, model=None):
+    if stats is None:
+        return render(*args).encode('utf-8')
+    start = time.perf_counter()
+    content = render(*args).encode('utf-8')
+    stats.record(phase, time.perf_counter() - start, 1, len(content), model)
+    return content
+
+
+def render_init(spec):
+    return render('init.py')
+
+
+def _py_value(value):
+    # Lists of more than one item are written one item per line
+    if isinstance(value, list) and len(value) > 1:
+        return '[\n' + ''.join(f"        {item!r},\n" for item in value) + '    ]'
+    return repr(value)
+
+
+def render_manifest(spec):
+    # Menus reference the actions, so menu_views.xml goes last
+    data = (['security/ir.model.access.csv']
+            + [f'views/{model.short_name}_views.xml' for model in named_models(spec)]
+            + ['views/menu_views.xml'])
+    demo = demo_paths(spec)
+    return render('manifest.py', name=repr(spec.name), version=repr(spec.version),
+                  category=repr(spec.category), depends=_py_value(module_depends(spec)),
+                  data=_py_value(data), demo=f"    'demo': {_py_value(demo)},\n" if demo else '')
+
+
+def render_models_init(spec):
+    return get_template('models_init_import').render_rows(
+        ('module',), [(model.short_name,) for model in named_models(spec)])
+
+
+def render_field_arguments(field):
+    # Keyword arguments of the fields.<Type>(...) call, one per line
+    arguments = ''
+    # Text from the spec is written with repr(), quotes in a label stay valid Python
+    if field.field_type == 'Many2one' and field.comodel:
+        arguments += f"        comodel_name={field.comodel!r},\n"
+    if field.field_type == 'Selection':
+        options = [f"            ({key!r}, {value!r}),\n" for key, value in field.selection if key and value]
+        if options:
+            arguments += "        selection=[\n" + ''.join(options) + "        ],\n"
+    arguments += f"        string={field.label!r},\n"
+    if field.required:
+        arguments += "        required=True,\n"
+    index = field_index(field)
+    if index:
+        arguments += f"        index={index!r},\n"
+    if field.field_type == 'Char' and field.size:
+        arguments += f"        size={field.size},\n"
+    return arguments
+
+
+def render_model(model, use_sql_constraints=True):
+    fields = get_template('model_field').render_rows(
+        ('name', 'type', 'arguments'),
+        [(field.name, field.field_type, render_field_arguments(field)) for field in model.fields if field.name])
+
+    # Rules PostgreSQL can enforce on its own, checked without loading records
+    constraints = sql_constraints(model, use_sql_constraints)
+    if constraints:
+        constraints = render('model_sql_constraints', constraints=get_template('model_sql_constraint').render_rows(
+            ('name', 'definition', 'message'),
+            [(repr(name), repr(definition), repr(message)) for name, definition, message in constraints]))
+
+    return render('model.py', class_name=model.class_name, name=model.name, description=model.label,
+                  attributes=render('model_order', order=repr(model.order)) if model.order else '',
+                  fields=fields, sql_constraints=constraints or '',
+                  validations=get_validation_method(model, use_sql_constraints))
+
+
+def render_security(spec):
+    return render('security.csv', rules=get_template('security_rule').render_rows(
+        ('model_id',), [(model.model_id,) for model in named_models(spec)]))
+
+
+def render_views(model):
+    context = {'model': model.name, 'model_id': model.model_id, 'label': model.label}
+    # Split on the position in the editor, blank rows included
+    mid_point = len(model.fields) // 2
+
+    form_field = get_template('view_form_field')
+    views = [render('view_form', **context,
+                    left_fields=form_field.render_rows(
+                        ('name',), [(field.name,) for field in model.fields[:mid_point] if field.name]),
+                    right_fields=form_field.render_rows(
+                        ('name',), [(field.name,) for field in model.fields[mid_point:] if field.name]))]
+
+    # Primeros 6 campos para la vista tree
+    tree_field = get_template('view_tree_field')
+    views.append(render('view_tree', **context,
+                        attributes=f' limit="{xml_attribute(model.limit)}"' if model.limit else '',
+                        fields=tree_field.render_rows(
+                            ('name',), [(field.name,) for field in model.fields[:6] if field.name])))
+
+    # Search View, only for models with flagged fields
+    search_fields = [field for field in model.fields if field.name and field.in_search_view]
+    if search_fields:
+        filters = get_template('view_search_filter').render_rows(
+            ('name', 'label', 'condition'),
+            [row for field in search_fields if field.filterable for row in search_filters(field)])
+        groups = get_template('view_search_group_by_filter').render_rows(
+            ('name', 'label'), [(field.name, xml_attribute(field.label))
+                                for field in search_fields if field.groupable])
+        views.append(render('view_search', **context,
+                            fields=get_template('view_search_field').render_rows(
+                                ('name',), [(field.name,) for field in search_fields if field.searchable]),
+                            filters=render('view_search_filters', filters=filters) if filters else '',
+                            group_by=render('view_search_group_by', filters=groups) if groups else ''))
+
+    views.append(render('view_action', **context,
+                        search_view=render('view_action_search_view', **context) if search_fields else ''))
+    return render('views.xml', views=''.join(views))
+
+
+def render_menu_views(spec):
+    models = named_models(spec)
+    module_name = spec.name
+    menu_title = module_name.replace('_', ' ').title()
+
+    # Submenus for each model
+    menus = get_template('menu_item').render_rows(
+        ('model_id', 'label', 'module', 'sequence'),
+        [(model.model_id, model.label, module_name, i) for i, model in enumerate(models, 1)])
+
+    # App menu item
+    app_menu = ''
+    if models:
+        app_menu = render('menu_app', module=module_name, title=menu_title, model_id=models[0].model_id)
+
+    return render('menu_views.xml', module=module_name, title=menu_title, menus=menus, app_menu=app_menu)
+
+
+def generate_bash_script(spec, output_dir, files=None, stats=None):
+    # Without a pre-rendered map the files are rendered and streamed one by one
+    # (their render time then also counts towards the bash_script phase)
+    items = files.items() if files is not None else iter_module_files(spec, stats)
+
+    # Save and make executable, leaving an identical script untouched
+    script_path = os.path.join(output_dir, f"create_{spec.name}_module.sh")
+    start = time.perf_counter()
+    with staged_file(script_path, 0o755) as f:
+        write_bash_script(f, spec, items, iter_demo_files(spec))
+        size = f.tell()
+    if stats is not None:
+        stats.record('bash_script', time.perf_counter() - start, 1, size)
+
+    return script_path
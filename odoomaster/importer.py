@@ -0,0 +1,394 @@
+# Import existing Odoo modules into a ModuleSpec by parsing their source with
+# ast and their views with ElementTree. Nothing is imported or executed, and
+# files are parsed across a process pool.
+import ast
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from .spec import FIELD_TYPES, FieldSpec, ModelSpec, ModuleSpec
+
+
+# The _sql_constraints definitions OdooMaster generates
+CHECK_RE = re.compile(r'(char_length\()?(\w+)\)? BETWEEN (-?[\d.]+) AND (-?[\d.]+)\)$')
+# One-sided rules: CHECK(x >= 5) or CHECK(char_length(x) <= 20)
+CHECK_BOUND_RE = re.compile(r'(char_length\()?(\w+)\)? ([<>]=) (-?[\d.]+)\)$')
+UNIQUE_RE = re.compile(r'UNIQUE\s*\(\s*(\w+)\s*\)$', re.IGNORECASE)
+
+
+class ParsedFile:
+    __slots__ = ('path', 'models', 'view_fields', 'search_flags', 'tree_limits',
+                 'warnings', 'rule_sources')
+
+    def __init__(self, path, models=None, view_fields=None, warnings=None):
+        self.path = path
+        # ModelSpec objects declared in a models/*.py file
+        self.models = models or []
+        # Model name -> field names in form view order, from a views/*.xml file
+        self.view_fields = view_fields or {}
+        # Model name -> {field name: {'searchable', 'filterable', 'groupable'}}
+        self.search_flags = {}
+        # Model name -> limit of its tree view
+        self.tree_limits = {}
+        self.warnings = warnings or []
+        # 'sql' and/or 'python': where the imported range/length rules came from
+        self.rule_sources = set()
+
+
+def is_module(path):
+    return os.path.isfile(os.path.join(path, '__manifest__.py'))
+
+
+def find_modules(addons_dir):
+    return sorted(os.path.join(addons_dir, name) for name in os.listdir(addons_dir)
+                  if is_module(os.path.join(addons_dir, name)))
+
+
+def module_files(module_path):
+    files = []
+    for subdir, extension in (('models', '.py'), ('views', '.xml')):
+        directory = os.path.join(module_path, subdir)
+        if os.path.isdir(directory):
+            files.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                         if name.endswith(extension) and name != '__init__.py')
+    return files
+
+
+def parse_file(path):
+    # Runs in a worker process
+    if path.endswith('.xml'):
+        return parse_views_file(path)
+    return parse_models_file(path)
+
+
+def parse_models_file(path):
+    parsed = ParsedFile(path)
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError) as e:
+        parsed.warnings.append(f"{path}: {e}")
+        return parsed
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            model = _parse_model_class(node, parsed, path)
+            if model is not None:
+                parsed.models.append(model)
+    return parsed
+
+
+def _literal(node, default=None):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return default
+
+
+def _parse_model_class(node, parsed, path):
+    warnings = parsed.warnings
+    name = None
+    inherit = None
+    fields = []
+    constraint_methods = []
+    sql_constraints = None
+    order = ''
+
+    for statement in node.body:
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                and isinstance(statement.targets[0], ast.Name):
+            target = statement.targets[0].id
+            if target == '_name':
+                name = _literal(statement.value)
+            elif target == '_inherit':
+                inherit = _literal(statement.value)
+            elif target == '_order':
+                order = _literal(statement.value, '') or ''
+            elif target == '_sql_constraints':
+                sql_constraints = _literal(statement.value)
+            else:
+                field = _parse_field(target, statement.value, warnings, path)
+                if field is not None:
+                    fields.append(field)
+        elif isinstance(statement, ast.FunctionDef):
+            constrained = _constrained_fields(statement)
+            if constrained:
+                constraint_methods.append((statement, constrained))
+
+    # Classes that only extend another model (_inherit without _name) are not
+    # definitions the generator can reproduce
+    if not isinstance(name, str):
+        if inherit:
+            warnings.append(f"{path}: skipped class {node.name}, it only extends {inherit!r}")
+        return None
+
+    by_name = {field.name: field for field in fields}
+    for method, constrained in constraint_methods:
+        if _parse_constraint(method, constrained, by_name):
+            parsed.rule_sources.add('python')
+        else:
+            warnings.append(f"{path}: {name}.{method.name} is not a simple range or length "
+                            f"check and was not imported")
+    if isinstance(sql_constraints, (list, tuple)):
+        for constraint in sql_constraints:
+            source = _parse_sql_constraint(constraint, by_name)
+            if source:
+                parsed.rule_sources.add(source)
+            else:
+                warnings.append(f"{path}: {name} SQL constraint {constraint!r} is not a simple "
+                                f"range, length or unique check and was not imported")
+    return ModelSpec(name, fields, order)
+
+
+def _parse_field(name, value, warnings, path):
+    # fields.X(...) calls only
+    if not (isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute)
+            and isinstance(value.func.value, ast.Name) and value.func.value.id == 'fields'):
+        return None
+
+    field_type = value.func.attr
+    if field_type not in FIELD_TYPES:
+        warnings.append(f"{path}: field {name} of unsupported type {field_type} was not imported")
+        return None
+
+    field = FieldSpec(name, field_type)
+    args = list(value.args)
+
+    # Positional arguments: Selection and Many2one take their selection/comodel first
+    if field_type in ('Selection', 'Many2one') and args:
+        if field_type == 'Selection':
+            field.selection = _selection(args[0])
+        else:
+            field.comodel = _literal(args[0], '') or ''
+        args = args[1:]
+    if args:
+        field.string = _literal(args[0], '') or ''
+
+    for keyword in value.keywords:
+        if keyword.arg == 'string':
+            field.string = _literal(keyword.value, '') or ''
+        elif keyword.arg == 'required':
+            field.required = _literal(keyword.value) is True
+        elif keyword.arg == 'selection' and field_type == 'Selection':
+            field.selection = _selection(keyword.value)
+        elif keyword.arg == 'comodel_name' and field_type == 'Many2one':
+            field.comodel = _literal(keyword.value, '') or ''
+        elif keyword.arg == 'index':
+            field.index = bool(_literal(keyword.value))
+        elif keyword.arg == 'size' and field_type == 'Char':
+            size = _literal(keyword.value)
+            field.size = size if isinstance(size, int) else None
+    return field
+
+
+def _selection(node):
+    options = _literal(node)
+    if not isinstance(options, (list, tuple)):
+        return []
+    return [(str(option[0]), str(option[1])) for option in options
+            if isinstance(option, (list, tuple)) and len(option) == 2]
+
+
+def _constrained_fields(function):
+    for decorator in function.decorator_list:
+        if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute) \
+                and decorator.func.attr == 'constrains':
+            return [arg.value for arg in decorator.args
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str)]
+    return []
+
+
+def _parse_constraint(method, constrained, fields):
+    # Recognises comparisons such as `record.x < 0`, `record.x > 100` and
+    # `len(record.x) > 20`, which is what OdooMaster itself generates
+    found = False
+    for node in ast.walk(method):
+        if not (isinstance(node, ast.Compare) and len(node.ops) == 1):
+            continue
+        left, op, right = node.left, node.ops[0], node.comparators[0]
+        bound = _literal(right)
+        if not isinstance(bound, (int, float)) or isinstance(bound, bool):
+            continue
+
+        is_length = isinstance(left, ast.Call) and isinstance(left.func, ast.Name) \
+            and left.func.id == 'len' and len(left.args) == 1
+        target = left.args[0] if is_length else left
+        if not (isinstance(target, ast.Attribute) and target.attr in constrained
+                and target.attr in fields):
+            continue
+
+        field = fields[target.attr]
+        prefix = 'min_length' if is_length else 'min_value'
+        if isinstance(op, (ast.Lt, ast.LtE)):
+            setattr(field, prefix, bound if isinstance(op, ast.Lt) else bound + 1)
+        elif isinstance(op, (ast.Gt, ast.GtE)):
+            setattr(field, prefix.replace('min', 'max'), bound if isinstance(op, ast.Gt) else bound - 1)
+        else:
+            continue
+        found = True
+    return found
+
+
+def _parse_sql_constraint(constraint, fields):
+    # Returns 'sql' for a recognised CHECK, 'unique' for UNIQUE(field), else None
+    if not (isinstance(constraint, (list, tuple)) and len(constraint) >= 2
+            and isinstance(constraint[1], str)):
+        return None
+    definition = constraint[1].strip()
+
+    match = UNIQUE_RE.match(definition)
+    if match and match.group(1) in fields:
+        fields[match.group(1)].unique = True
+        return 'unique'
+
+    if not definition.upper().startswith('CHECK'):
+        return None
+    match = CHECK_RE.search(definition)
+    if match:
+        minimum, maximum = _literal(match.group(3)), _literal(match.group(4))
+    else:
+        match = CHECK_BOUND_RE.search(definition)
+        if match:
+            bound = _literal(match.group(4))
+            minimum, maximum = (bound, None) if match.group(3) == '>=' else (None, bound)
+    if not (match and match.group(2) in fields):
+        return None
+    field = fields[match.group(2)]
+    if match.group(1):
+        field.min_length, field.max_length = minimum, maximum
+    else:
+        field.min_value, field.max_value = minimum, maximum
+    return 'sql'
+
+
+def parse_views_file(path):
+    parsed = ParsedFile(path)
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError) as e:
+        parsed.warnings.append(f"{path}: {e}")
+        return parsed
+
+    for record in root.iter('record'):
+        if record.get('model') != 'ir.ui.view':
+            continue
+        model = arch = None
+        for field in record.findall('field'):
+            if field.get('name') == 'model':
+                model = (field.text or '').strip()
+            elif field.get('name') == 'arch':
+                arch = field
+        if not model or arch is None:
+            continue
+        if arch.find('form') is not None:
+            names = [node.get('name') for node in arch.find('form').iter('field') if node.get('name')]
+            parsed.view_fields.setdefault(model, names)
+        elif arch.find('tree') is not None:
+            limit = _literal(arch.find('tree').get('limit', ''))
+            if isinstance(limit, int):
+                parsed.tree_limits.setdefault(model, limit)
+        elif arch.find('search') is not None:
+            _parse_search_view(arch.find('search'), parsed.search_flags.setdefault(model, {}))
+    return parsed
+
+
+def _parse_search_view(search, flags):
+    for node in search.iter('field'):
+        if node.get('name'):
+            flags.setdefault(node.get('name'), set()).add('searchable')
+    for node in search.iter('filter'):
+        context = _literal(node.get('context', ''))
+        if isinstance(context, dict) and isinstance(context.get('group_by'), str):
+            flags.setdefault(context['group_by'].split(':')[0], set()).add('groupable')
+            continue
+        domain = _literal(node.get('domain', ''))
+        name = node.get('date')
+        if name is None and isinstance(domain, list) and domain \
+                and isinstance(domain[0], (list, tuple)) and domain[0]:
+            name = domain[0][0]
+        if isinstance(name, str):
+            flags.setdefault(name, set()).add('filterable')
+
+
+def read_manifest(module_path):
+    with open(os.path.join(module_path, '__manifest__.py'), 'rb') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Dict):
+            return _literal(node.value, {})
+    return {}
+
+
+def build_spec(module_path, parsed_files):
+    warnings = []
+    try:
+        manifest = read_manifest(module_path)
+    except (OSError, SyntaxError, ValueError) as e:
+        manifest = {}
+        warnings.append(f"{module_path}: unreadable manifest ({e})")
+
+    models = {}
+    view_fields = {}
+    search_flags = {}
+    tree_limits = {}
+    rule_sources = set()
+    for parsed in parsed_files:
+        warnings.extend(parsed.warnings)
+        rule_sources.update(parsed.rule_sources)
+        for name, flags in parsed.search_flags.items():
+            search_flags.setdefault(name, flags)
+        for name, limit in parsed.tree_limits.items():
+            tree_limits.setdefault(name, limit)
+        for model in parsed.models:
+            # Several classes may declare fields of the same model
+            if model.name in models:
+                models[model.name].fields.extend(model.fields)
+            else:
+                models[model.name] = model
+        for name, names in parsed.view_fields.items():
+            view_fields.setdefault(name, names)
+
+    # Keep the field order of the form view, so regenerated views match
+    for name, model in models.items():
+        order = {field_name: i for i, field_name in enumerate(view_fields.get(name, ()))}
+        model.fields.sort(key=lambda field: order.get(field.name, len(order)))
+        model.limit = tree_limits.get(name)
+        flags = search_flags.get(name, {})
+        for field in model.fields:
+            for flag in flags.get(field.name, ()):
+                setattr(field, flag, True)
+            # Fields in the search view are indexed anyway (see generator.field_index)
+            if field.in_search_view:
+                field.index = False
+
+    spec = ModuleSpec(os.path.basename(os.path.normpath(module_path)),
+                      str(manifest.get('version', '1.0')),
+                      manifest.get('category', '') or '',
+                      list(models.values()),
+                      # Keep Python constraints for modules that only used those
+                      'python' not in rule_sources or 'sql' in rule_sources)
+    depends = manifest.get('depends', ())
+    if isinstance(depends, (list, tuple)):
+        spec.depends = [name for name in depends if isinstance(name, str) and name != 'base']
+    return spec, warnings
+
+
+def import_modules(module_paths, workers=None):
+    # All files of all modules share one pool, so a few huge modules do not
+    # serialise the work. Returns (ModuleSpec, warnings) per module.
+    files_by_module = [(module_path, module_files(module_path)) for module_path in module_paths]
+    all_files = [path for _, files in files_by_module for path in files]
+
+    if len(all_files) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = dict(zip(all_files, executor.map(parse_file, all_files, chunksize=16)))
+    else:
+        parsed = {path: parse_file(path) for path in all_files}
+
+    return [build_spec(module_path, [parsed[path] for path in files])
+            for module_path, files in files_by_module]
+
+
+def import_module(module_path, workers=None):
+    return import_modules([module_path], workers)[0]
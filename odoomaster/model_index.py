@@ -0,0 +1,267 @@
+# Persistent index of the models (_name/_inherit) found under the addons paths,
+# used to offer Many2one comodels and to find the addon that defines one.
+# Entries are kept per file and only files whose mtime or size changed are
+# parsed again.
+import ast
+import bisect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+INDEX_VERSION = 2
+
+# Layout created by InstallOdooAndModule.sh
+DEFAULT_ADDONS_PATHS = ('/opt/odoo17/odoo17/addons', '/opt/odoo17/odoo17/odoo/addons',
+                        '/opt/odoo17/odoo17-custom-addons')
+
+SKIPPED_DIRS = {'__pycache__', '.git', 'node_modules', 'static', 'tests'}
+
+# Addon defining the standard models most often used as comodels, for when
+# the index does not know them (e.g. it was never built)
+MODEL_MODULES = {
+    'product.product': 'product', 'product.template': 'product', 'product.category': 'product',
+    'uom.uom': 'uom',
+    'sale.order': 'sale', 'sale.order.line': 'sale',
+    'purchase.order': 'purchase', 'purchase.order.line': 'purchase',
+    'account.move': 'account', 'account.account': 'account', 'account.journal': 'account',
+    'account.tax': 'account', 'account.analytic.account': 'analytic',
+    'stock.picking': 'stock', 'stock.location': 'stock', 'stock.warehouse': 'stock',
+    'stock.lot': 'stock',
+    'hr.employee': 'hr', 'hr.department': 'hr', 'hr.job': 'hr',
+    'project.project': 'project', 'project.task': 'project',
+    'crm.lead': 'crm', 'crm.team': 'sales_team',
+    'mrp.production': 'mrp', 'mrp.bom': 'mrp',
+    'fleet.vehicle': 'fleet', 'event.event': 'event', 'website': 'website',
+}
+
+# Models of these namespaces are defined by base
+BASE_PREFIXES = ('res.', 'ir.')
+
+
+def cache_path(name):
+    # File in OdooMaster's cache directory (XDG_CACHE_HOME or ~/.cache)
+    cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_dir, 'odoomaster', name)
+
+
+def default_index_path():
+    return cache_path('model_index.json')
+
+
+# (path, mtime) -> the index loaded from it, see default_index()
+_loaded = {}
+
+
+def default_index():
+    # The index at default_index_path(), loaded again only when the file
+    # changes; empty when it was never built
+    path = default_index_path()
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return ModelIndex(path)
+    if key not in _loaded:
+        _loaded.clear()
+        _loaded[key] = ModelIndex.load(path)
+    return _loaded[key]
+
+
+def model_module(model_name, index=None):
+    # Addon that defines a model: from the addons index (default_index() when
+    # none is given), then MODEL_MODULES and the base namespaces; None when
+    # unknown
+    if index is None:
+        index = default_index()
+    module = index.module_of(model_name) or MODEL_MODULES.get(model_name)
+    if module is None and model_name.startswith(BASE_PREFIXES):
+        module = 'base'
+    return module
+
+
+def comodel_modules(spec, index=None):
+    # Comodel of a Many2one field -> addon that defines it (None when
+    # unknown), for the comodels that are not models of the spec itself
+    own = {model.name for model in spec.models}
+    comodels = {field.comodel for model in spec.models if model.name for field in model.fields
+                if field.name and field.field_type == 'Many2one' and field.comodel
+                and field.comodel not in own}
+    return {name: model_module(name, index) for name in sorted(comodels)}
+
+
+def default_addons_paths():
+    # ODOOMASTER_ADDONS_PATH uses the platform path separator, like PATH
+    configured = os.environ.get('ODOOMASTER_ADDONS_PATH')
+    paths = configured.split(os.pathsep) if configured else DEFAULT_ADDONS_PATHS
+    return [path for path in paths if os.path.isdir(path)]
+
+
+def _model_names(value):
+    if isinstance(value, str):
+        return {value}
+    if isinstance(value, (list, tuple)):
+        return {item for item in value if isinstance(item, str)}
+    return set()
+
+
+def scan_models(path):
+    # Returns the model names declared or extended in one Python file, and
+    # the ones it defines (a _name that is not also inherited)
+    try:
+        with open(path, 'rb') as f:
+            source = f.read()
+    except OSError:
+        return [], []
+    # Most files declare no model; skip parsing them entirely
+    if b'_name' not in source and b'_inherit' not in source:
+        return [], []
+    try:
+        tree = ast.parse(source, path)
+    except (SyntaxError, ValueError):
+        return [], []
+
+    names = set()
+    defined = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        attributes = {}
+        for statement in node.body:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    and isinstance(statement.targets[0], ast.Name) \
+                    and statement.targets[0].id in ('_name', '_inherit'):
+                try:
+                    attributes[statement.targets[0].id] = _model_names(ast.literal_eval(statement.value))
+                except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                    continue
+        names.update(*attributes.values())
+        defined.update(attributes.get('_name', set()) - attributes.get('_inherit', set()))
+    return sorted(names), sorted(defined)
+
+
+def iter_python_files(root):
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = [name for name in subdirs if name not in SKIPPED_DIRS]
+        for name in files:
+            if name.endswith('.py'):
+                yield os.path.join(directory, name)
+
+
+class RefreshStats:
+    __slots__ = ('scanned', 'parsed', 'removed')
+
+    def __init__(self, scanned=0, parsed=0, removed=0):
+        self.scanned = scanned
+        self.parsed = parsed
+        self.removed = removed
+
+
+def _addon_of(path, root):
+    # Name of the addon directory a file of an addons path belongs to
+    parts = os.path.relpath(path, root).split(os.sep)
+    return parts[0] if len(parts) > 1 else None
+
+
+class ModelIndex:
+    __slots__ = ('path', 'files', '_models', '_modules')
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        # file path -> [mtime, size, [model names], [defined model names], addon]
+        self.files = {}
+        self._models = None
+        self._modules = None
+
+    @classmethod
+    def load(cls, path=None):
+        index = cls(path)
+        try:
+            with open(index.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') == INDEX_VERSION:
+            index.files = data.get('files', {})
+        return index
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, addons_paths, workers=None):
+        # Only files that are new or whose mtime/size changed are parsed again
+        stats = RefreshStats()
+        roots = [os.path.abspath(path) for path in addons_paths]
+        seen = set()
+        stale = []
+        for root in roots:
+            for path in iter_python_files(root):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                entry = self.files.get(path)
+                if entry is None or entry[0] != stat.st_mtime or entry[1] != stat.st_size:
+                    stale.append((path, stat.st_mtime, stat.st_size, _addon_of(path, root)))
+        stats.scanned = len(seen)
+
+        if len(stale) > 64 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(scan_models, [path for path, _, _, _ in stale], chunksize=256)
+                for (path, mtime, size, addon), (names, defined) in zip(stale, results):
+                    self.files[path] = [mtime, size, names, defined, addon]
+        else:
+            for path, mtime, size, addon in stale:
+                self.files[path] = [mtime, size, *scan_models(path), addon]
+        stats.parsed = len(stale)
+
+        # Forget files that were deleted or belong to paths no longer indexed
+        for path in list(self.files):
+            if path not in seen and (not os.path.exists(path)
+                                     or not any(path.startswith(root + os.sep) for root in roots)):
+                del self.files[path]
+                stats.removed += 1
+
+        if stale or stats.removed:
+            self._models = self._modules = None
+        return stats
+
+    def models(self):
+        # Sorted list of every known model name, cached until the next refresh
+        if self._models is None:
+            names = set()
+            for entry in self.files.values():
+                names.update(entry[2])
+            self._models = sorted(names)
+        return self._models
+
+    def module_of(self, model_name):
+        # Addon that defines a model (the first by name when several do), None
+        # when the index does not know it
+        if self._modules is None:
+            modules = {}
+            for _, _, _, defined, addon in self.files.values():
+                if addon:
+                    for name in defined:
+                        modules[name] = min(addon, modules.get(name, addon))
+            self._modules = modules
+        return self._modules.get(model_name)
+
+    def complete(self, prefix, limit=50):
+        models = self.models()
+        start = bisect.bisect_left(models, prefix)
+        matches = []
+        for name in models[start:]:
+            if not name.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.append(name)
+        return matches
+
+    def __contains__(self, model_name):
+        models = self.models()
+        i = bisect.bisect_left(models, model_name)
+        return i < len(models) and models[i] == model_name
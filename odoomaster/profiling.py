@@ -0,0 +1,87 @@
+# Instrumentation for module generation: wall time, files and bytes per phase
+# and render time per model, plus an opt-in cProfile dump of a whole run.
+import cProfile
+import time
+from contextlib import contextmanager
+
+
+class PhaseStats:
+    __slots__ = ('time', 'files', 'bytes')
+
+    def __init__(self):
+        self.time = 0.0
+        self.files = 0
+        self.bytes = 0
+
+
+class GenerationStats:
+    __slots__ = ('phases', 'models', 'total')
+
+    def __init__(self):
+        # Phase name -> PhaseStats, in the order phases first ran
+        self.phases = {}
+        # Model name -> render time of its model and view files
+        self.models = {}
+        self.total = 0.0
+
+    def record(self, phase, elapsed, files=0, nbytes=0, model=None):
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.time += elapsed
+        stats.files += files
+        stats.bytes += nbytes
+        if model is not None:
+            self.models[model] = self.models.get(model, 0.0) + elapsed
+
+    @contextmanager
+    def phase(self, name):
+        # Times a block; the caller fills in files/bytes on the yielded PhaseStats
+        stats = PhaseStats()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            self.record(name, time.perf_counter() - start, stats.files, stats.bytes)
+
+    def slowest_models(self, count=5):
+        return sorted(self.models.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def format(self, models=5):
+        lines = [f"{'phase':<22} {'time':>10} {'files':>7} {'bytes':>12}"]
+        for name, stats in self.phases.items():
+            lines.append(f"{name:<22} {stats.time * 1000:>8.1f}ms {stats.files:>7} {stats.bytes:>12}")
+        if self.total:
+            lines.append(f"{'total':<22} {self.total * 1000:>8.1f}ms")
+        if models and self.models:
+            lines.append("slowest models:")
+            for name, elapsed in self.slowest_models(models):
+                lines.append(f"  {name:<30} {elapsed * 1000:>8.1f}ms")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def timed(stats):
+    # Accumulates the wall time of the whole block into stats.total
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        if stats is not None:
+            stats.total += time.perf_counter() - start
+
+
+@contextmanager
+def profiled(path):
+    # With a path, the block runs under cProfile and the pstats file is written
+    # there (inspect it with `python -m pstats <path>`); without one it is a no-op
+    if not path:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
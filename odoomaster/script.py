@@ -0,0 +1,63 @@
+# Streaming writer for the create_<module>_module.sh installer script.
+# Sections go straight to the output file and are flushed one file at a time,
+# so memory stays flat and the cost stays linear in the module size.
+import os
+
+from .template import get_template, render
+
+
+class BashScriptWriter:
+    __slots__ = ('f', 'directories', 'mkdir_template', 'file_template')
+
+    def __init__(self, f):
+        # f is a file opened in binary mode
+        self.f = f
+        self.directories = set()
+        self.mkdir_template = get_template('script_mkdir')
+        self.file_template = get_template('script_file')
+
+    def write(self, text):
+        self.f.write(text.encode('utf-8'))
+
+    def header(self, module_name):
+        self.write(render('script_header', module=module_name))
+
+    def start_file(self, rel_path):
+        directory = os.path.dirname(rel_path)
+        if directory and directory not in self.directories:
+            self.directories.add(directory)
+            self.write(self.mkdir_template.render(directory=directory))
+        self.write(self.file_template.render(path=rel_path))
+
+    def add_file(self, rel_path, content):
+        self.start_file(rel_path)
+        self.f.write(content)
+        if not content.endswith(b'\n'):
+            self.f.write(b'\n')
+        self.f.write(b'EOF\n')
+        self.f.flush()
+
+    def add_stream(self, rel_path, write):
+        # Like add_file() for content too large to hold, write(f) streams it
+        # into the binary file f and must end it with a newline
+        self.start_file(rel_path)
+        write(self.f)
+        self.f.write(b'EOF\n')
+        self.f.flush()
+
+    def footer(self):
+        self.write(render('script_footer'))
+        self.f.flush()
+
+
+def write_bash_script(f, spec, items, streams=()):
+    # items yields (path, bytes) pairs, as render_module().items() or
+    # iter_module_files() do; the script recreates exactly those files.
+    # streams yields (path, write) pairs, see demo.iter_demo_files().
+    writer = BashScriptWriter(f)
+    writer.header(spec.name)
+    for rel_path, content in items:
+        writer.add_file(rel_path, content)
+    for rel_path, write in streams:
+        writer.add_stream(rel_path, write)
+    writer.footer()
@@ -0,0 +1,221 @@
+# Plain-Python description of a module, independent of any GUI toolkit
+import json
+import os
+
+
+FIELD_TYPES = (
+    'Char', 'Text', 'Integer', 'Float', 'Boolean',
+    'Date', 'Datetime', 'Selection', 'Many2one',
+)
+
+
+class SpecError(ValueError):
+    pass
+
+
+class FieldSpec:
+    __slots__ = ('name', 'field_type', 'string', 'required', 'selection',
+                 'min_value', 'max_value', 'min_length', 'max_length', 'comodel',
+                 'index', 'unique', 'size', 'searchable', 'filterable', 'groupable')
+
+    def __init__(self, name, field_type='Char', string='', required=False,
+                 selection=None, min_value=None, max_value=None,
+                 min_length=None, max_length=None, comodel='',
+                 index=False, unique=False, size=None,
+                 searchable=False, filterable=False, groupable=False):
+        self.name = name
+        self.field_type = field_type
+        self.string = string
+        self.required = required
+        # List of (key, label) tuples, only used by Selection fields
+        self.selection = list(selection or ())
+        self.min_value = min_value
+        self.max_value = max_value
+        self.min_length = min_length
+        self.max_length = max_length
+        # Target model of a Many2one field, e.g. 'res.partner'
+        self.comodel = comodel
+        # Database options: btree index, UNIQUE constraint and varchar size (Char only)
+        self.index = index
+        self.unique = unique
+        self.size = size
+        # Search view: <field> to search on, predefined filter, group-by entry
+        self.searchable = searchable
+        self.filterable = filterable
+        self.groupable = groupable
+
+    @property
+    def label(self):
+        return self.string or self.name.capitalize()
+
+    @property
+    def in_search_view(self):
+        return self.searchable or self.filterable or self.groupable
+
+    @classmethod
+    def from_dict(cls, data):
+        field_type = data.get('type', 'Char')
+        if field_type not in FIELD_TYPES:
+            raise SpecError(f"Unknown field type '{field_type}' for field '{data.get('name', '')}'")
+        return cls(
+            data.get('name', ''),
+            field_type,
+            data.get('string', ''),
+            bool(data.get('required', False)),
+            [(key, value) for key, value in data.get('selection', ())],
+            data.get('min_value'),
+            data.get('max_value'),
+            data.get('min_length'),
+            data.get('max_length'),
+            data.get('comodel', ''),
+            bool(data.get('index', False)),
+            bool(data.get('unique', False)),
+            data.get('size'),
+            bool(data.get('searchable', False)),
+            bool(data.get('filterable', False)),
+            bool(data.get('groupable', False)),
+        )
+
+    def to_dict(self):
+        data = {'name': self.name, 'type': self.field_type}
+        if self.string:
+            data['string'] = self.string
+        if self.required:
+            data['required'] = True
+        if self.selection:
+            data['selection'] = [list(option) for option in self.selection]
+        if self.comodel:
+            data['comodel'] = self.comodel
+        for attr in ('index', 'unique', 'searchable', 'filterable', 'groupable'):
+            if getattr(self, attr):
+                data[attr] = True
+        for attr in ('min_value', 'max_value', 'min_length', 'max_length', 'size'):
+            value = getattr(self, attr)
+            if value is not None:
+                data[attr] = value
+        return data
+
+
+class ModelSpec:
+    __slots__ = ('name', 'fields', 'order', 'limit')
+
+    def __init__(self, name, fields=None, order='', limit=None):
+        self.name = name
+        self.fields = list(fields or ())
+        # Default _order of the model, e.g. 'published desc, id desc'
+        self.order = order
+        # Records per page of the tree view (Odoo's default is 80)
+        self.limit = limit
+
+    @property
+    def short_name(self):
+        # 'library.book' -> 'book', used for file names
+        return self.name.split('.')[-1]
+
+    @property
+    def model_id(self):
+        # 'library.book' -> 'library_book', used for XML ids
+        return self.name.replace('.', '_')
+
+    @property
+    def class_name(self):
+        # 'library.book' -> 'LibraryBook'
+        return ''.join(part.title() for part in self.model_id.split('_'))
+
+    @property
+    def label(self):
+        # 'library.book_copy' -> 'Book Copy'
+        return self.short_name.replace('_', ' ').title()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('name', ''),
+                   [FieldSpec.from_dict(field) for field in data.get('fields', ())],
+                   data.get('order', ''),
+                   data.get('limit'))
+
+    def to_dict(self):
+        data = {'name': self.name,
+                'fields': [field.to_dict() for field in self.fields]}
+        if self.order:
+            data['order'] = self.order
+        if self.limit:
+            data['limit'] = self.limit
+        return data
+
+
+class ModuleSpec:
+    __slots__ = ('name', 'version', 'category', 'models', 'sql_constraints', 'demo_rows', 'depends')
+
+    def __init__(self, name, version='1.0', category='', models=None, sql_constraints=True,
+                 demo_rows=0, depends=None):
+        self.name = name
+        self.version = version
+        self.category = category
+        self.models = list(models or ())
+        # Emit range/length rules as _sql_constraints instead of @api.constrains
+        self.sql_constraints = sql_constraints
+        # Records per model in the generated demo/<model>.csv files, 0 for none
+        self.demo_rows = demo_rows
+        # Modules to depend on besides 'base' and the ones its comodels need
+        self.depends = list(depends or ())
+
+    @classmethod
+    def from_dict(cls, data, partial=False):
+        # partial accepts work in progress, e.g. a GUI project not named yet
+        if not isinstance(data, dict):
+            raise SpecError("A module spec must be a JSON object")
+        if not data.get('name') and not partial:
+            raise SpecError("Module name is required!")
+        try:
+            return cls(data.get('name') or '',
+                       str(data.get('version', '1.0')),
+                       data.get('category', ''),
+                       [ModelSpec.from_dict(model) for model in data.get('models', ())],
+                       bool(data.get('sql_constraints', True)),
+                       int(data.get('demo_rows', 0) or 0),
+                       [str(name) for name in data.get('depends', ())])
+        except SpecError:
+            raise
+        except (AttributeError, TypeError, ValueError) as e:
+            # e.g. a model or field that is not an object
+            raise SpecError(f"Malformed module spec: {e}") from None
+
+    def to_dict(self):
+        data = {'name': self.name,
+                'version': self.version,
+                'category': self.category,
+                'models': [model.to_dict() for model in self.models],
+                'sql_constraints': self.sql_constraints}
+        if self.demo_rows:
+            data['demo_rows'] = self.demo_rows
+        if self.depends:
+            data['depends'] = list(self.depends)
+        return data
+
+
+def load_spec(path, partial=False):
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise SpecError(f"{path}: {e}") from None
+    return ModuleSpec.from_dict(data, partial)
+
+
+def save_spec(spec, path, indent=2):
+    # Written next to the target and renamed over it, so an interrupted save
+    # (or autosave) never leaves a truncated file behind
+    tmp_path = f'{path}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # dumps() encodes in one go, json.dump() writes many small chunks;
+            # indent=None writes compact JSON with the C encoder
+            f.write(json.dumps(spec.to_dict(), indent=indent, ensure_ascii=False,
+                               separators=None if indent else (',', ':')))
+            f.write('\n')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
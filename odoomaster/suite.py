@@ -0,0 +1,176 @@
+# Suites of modules whose models reference each other: the depends of every
+# module are computed from the Many2one comodels defined by the other modules,
+# cycles are reported, and the modules are generated in parallel one level of
+# the dependency graph at a time.
+import os
+import time
+
+from .batch import BatchResult, BatchSummary, find_specs, generate_one, worker_pool
+from .spec import SpecError, load_spec
+
+
+class SuiteError(SpecError):
+    pass
+
+
+class Suite:
+    __slots__ = ('specs', 'paths', 'depends', 'reasons')
+
+    def __init__(self):
+        # Module name -> ModuleSpec and the path of its spec file
+        self.specs = {}
+        self.paths = {}
+        # Module name -> set of the suite modules it depends on
+        self.depends = {}
+        # (module, dependency) -> first reference that makes it, for messages
+        self.reasons = {}
+
+    def levels(self):
+        # Lists of module names, each level depending only on the ones before
+        remaining = {name: set(depends) for name, depends in self.depends.items()}
+        levels = []
+        while remaining:
+            level = sorted(name for name, depends in remaining.items() if not depends)
+            if not level:
+                raise SuiteError(self.cycles_message())
+            levels.append(level)
+            for name in level:
+                del remaining[name]
+            for depends in remaining.values():
+                depends.difference_update(level)
+        return levels
+
+    def cycles(self):
+        # One cycle per strongly connected component of the graph (Tarjan),
+        # as a list of module names that starts and ends with the same module
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        def connect(name):
+            index[name] = lowlink[name] = len(index)
+            stack.append(name)
+            on_stack.add(name)
+            for dependency in sorted(self.depends[name]):
+                if dependency not in index:
+                    connect(dependency)
+                    lowlink[name] = min(lowlink[name], lowlink[dependency])
+                elif dependency in on_stack:
+                    lowlink[name] = min(lowlink[name], index[dependency])
+            if lowlink[name] == index[name]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == name:
+                        break
+                if len(component) > 1:
+                    components.append(component)
+
+        for name in sorted(self.depends):
+            if name not in index:
+                connect(name)
+        return [self._cycle_in(component) for component in components]
+
+    def _cycle_in(self, component):
+        # Walks the component from its first module until it comes back
+        start = min(component)
+        path = [start]
+        seen = {start}
+        while True:
+            following = sorted(self.depends[path[-1]] & component)
+            if start in following:
+                return path + [start]
+            name = next((name for name in following if name not in seen), following[0])
+            if name in seen:
+                # Closed a loop that does not go through start
+                return path[path.index(name):] + [name]
+            seen.add(name)
+            path.append(name)
+
+    def cycles_message(self):
+        lines = []
+        for cycle in self.cycles():
+            lines.append("dependency cycle: " + ' -> '.join(cycle))
+            lines.extend(f"  {module} -> {dependency}: {self.reasons[(module, dependency)]}"
+                         for module, dependency in zip(cycle, cycle[1:]))
+        return '\n'.join(lines)
+
+
+def build_suite(spec_paths):
+    # Loads the specs and computes the depends between them
+    suite = Suite()
+    owners = {}
+    for spec_path in spec_paths:
+        spec = load_spec(spec_path)
+        if spec.name in suite.specs:
+            raise SuiteError(f"module '{spec.name}' is defined by {suite.paths[spec.name]} and {spec_path}")
+        suite.specs[spec.name] = spec
+        suite.paths[spec.name] = spec_path
+        for model in spec.models:
+            if not model.name:
+                continue
+            owner = owners.setdefault(model.name, spec.name)
+            if owner != spec.name:
+                raise SuiteError(f"model '{model.name}' is defined by modules {owner} and {spec.name}")
+
+    for name, spec in suite.specs.items():
+        depends = suite.depends[name] = set()
+        # Explicit depends on other modules of the suite are edges as well
+        for dependency in spec.depends:
+            if dependency in suite.specs and dependency != name:
+                depends.add(dependency)
+                suite.reasons.setdefault((name, dependency), "listed in depends")
+        for model in spec.models:
+            for field in model.fields:
+                owner = owners.get(field.comodel) if field.field_type == 'Many2one' and field.name else None
+                if owner is not None and owner != name:
+                    depends.add(owner)
+                    suite.reasons.setdefault((name, owner),
+                                             f"{model.name}.{field.name} -> {field.comodel}")
+    return suite
+
+
+def load_suite(source):
+    # source is a directory of specs or a file listing them, as for batch
+    spec_paths = find_specs(source)
+    if not spec_paths:
+        raise SuiteError(f"no module specs found in {source}")
+    return build_suite(spec_paths)
+
+
+def generate_suite(suite, output_dir, workers=None, with_script=True, on_result=None,
+                   template_dirs=None, on_level=None):
+    # Levels run one after another, the modules of a level in parallel; a
+    # module whose dependency failed is not generated
+    levels = suite.levels()
+    workers = max(1, min(workers or os.cpu_count() or 1, max(len(level) for level in levels)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = []
+    failed = set()
+    with worker_pool(workers, template_dirs) as executor:
+        for number, level in enumerate(levels):
+            if on_level:
+                on_level(number, level)
+            blocked = {name: sorted(suite.depends[name] & failed) for name in level}
+            ready = [name for name in level if not blocked[name]]
+            futures = {name: executor.submit(generate_one, suite.paths[name], output_dir, with_script,
+                                             sorted(suite.depends[name]))
+                       for name in ready}
+            for name in level:
+                if blocked[name]:
+                    result = BatchResult(suite.paths[name], name,
+                                         f"not generated, depends on failed {', '.join(blocked[name])}")
+                else:
+                    result = futures[name].result()
+                if not result.ok:
+                    failed.add(name)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return BatchSummary(results, time.perf_counter() - start, workers)
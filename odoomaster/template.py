@@ -0,0 +1,117 @@
+# Named templates for every generated artifact. Each template is a file
+# <name>.tmpl with {{variable}} placeholders; it is looked up in the user
+# template directories first and then in the built-in odoomaster/templates,
+# compiled once into a Python function and cached for the process.
+import keyword
+import os
+import re
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+TEMPLATE_SUFFIX = '.tmpl'
+
+# Extra template directories, os.pathsep separated like PATH
+TEMPLATE_PATH_ENV = 'ODOOMASTER_TEMPLATES'
+
+PLACEHOLDER_RE = re.compile(r'\{\{\s*([A-Za-z]\w*)\s*\}\}')
+
+_user_dirs = []
+_cache = {}
+
+
+class TemplateError(ValueError):
+    pass
+
+
+_MISSING = object()
+
+
+class Template:
+    __slots__ = ('name', 'path', 'variables', 'render', '_pattern', '_loops')
+
+    def __init__(self, name, source, path=None):
+        self.name = name
+        self.path = path
+        where = path or name
+        # As in Jinja, a single trailing newline of the file is not part of the output
+        if source.endswith('\n'):
+            source = source[:-1]
+        parts = PLACEHOLDER_RE.split(source)
+        # Even parts are literal text, odd parts variable names
+        variables = list(dict.fromkeys(parts[1::2]))
+        for variable in variables:
+            if keyword.iskeyword(variable):
+                raise TemplateError(f"{where}: {{{{{variable}}}}} is a reserved word")
+        self.variables = frozenset(variables)
+
+        # The template is compiled to a function that returns one f-string,
+        # with every variable as a keyword-only parameter, so rendering is a
+        # single plain call: render(context=None, /, **variables)
+        namespace = {'__missing': _MISSING, '__error': TemplateError, '__where': where}
+        pattern = ''.join(f'{{{part}}}' if i % 2 else part.replace('{', '{{').replace('}', '}}')
+                          for i, part in enumerate(parts))
+        params = '*, ' + ''.join(f'{variable}=__missing, ' for variable in variables) if variables else ''
+        given = ', '.join(f'({variable!r}, {variable})' for variable in variables)
+        lines = [f"def render(__context=None, /, {params}**__extra):",
+                 "    if __context:",
+                 f"        values = {{name: value for name, value in ({given},) if value is not __missing}}"
+                 if variables else "        values = {}",
+                 "        return render(**{**__context, **values, **__extra})"]
+        if variables:
+            lines += ["    if " + ' or '.join(f'{variable} is __missing' for variable in variables) + ":",
+                      f"        missing = [name for name, value in ({given},) if value is __missing]",
+                      "        raise __error(f'{__where}: no value for {{{{{missing[0]}}}}}')"]
+        lines.append(f"    return f{pattern!r}")
+        exec(compile('\n'.join(lines) + '\n', f'<template {where}>', 'exec'), namespace)
+        self.render = namespace['render']
+        self._pattern = pattern
+        self._loops = {}
+
+    def render_rows(self, names, rows):
+        # Renders the template once per row of values (in the order of names)
+        # and joins the results; the loop is compiled once per names tuple.
+        loop = self._loops.get(names)
+        if loop is None:
+            where = self.path or self.name
+            missing = sorted(self.variables.difference(names))
+            if missing:
+                raise TemplateError(f"{where}: no value for {{{{{missing[0]}}}}}")
+            # Names the template does not use are still unpacked, under a throwaway name
+            targets = ', '.join(name if name in self.variables else f'__unused{i}'
+                                for i, name in enumerate(names))
+            source = f"def loop(rows, /):\n    return ''.join([f{self._pattern!r} for ({targets},) in rows])\n"
+            namespace = {}
+            exec(compile(source, f'<template {where}>', 'exec'), namespace)
+            loop = self._loops[names] = namespace['loop']
+        return loop(rows)
+
+
+def template_dirs():
+    configured = os.environ.get(TEMPLATE_PATH_ENV)
+    env_dirs = configured.split(os.pathsep) if configured else []
+    return [path for path in _user_dirs + env_dirs if path] + [TEMPLATE_DIR]
+
+
+def set_template_dirs(dirs):
+    # Directories searched before the built-in templates, first one wins
+    _user_dirs[:] = list(dirs or ())
+    _cache.clear()
+
+
+def get_template(name):
+    template = _cache.get(name)
+    if template is None:
+        for directory in template_dirs():
+            path = os.path.join(directory, name + TEMPLATE_SUFFIX)
+            if os.path.isfile(path):
+                with open(path, encoding='utf-8', newline='') as f:
+                    template = Template(name, f.read(), path)
+                break
+        else:
+            raise TemplateError(f"Template '{name}' not found in {', '.join(template_dirs())}")
+        _cache[name] = template
+    return template
+
+
+def render(template_name, context=None, /, **variables):
+    return get_template(template_name).render(context, **variables)
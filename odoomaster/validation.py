@@ -0,0 +1,275 @@
+# Spec checks for mistakes that otherwise only show up when Odoo fails to load
+# the generated module. SpecValidator keeps hash indexes of model names, file
+# names and XML ids, so after an edit only that model is checked again and the
+# collisions with the rest of the spec are dictionary lookups.
+import keyword
+import re
+
+from .demo import demo_issues
+from .model_index import comodel_modules
+from .spec import SpecError
+
+
+# Odoo model names: lowercase words separated by dots, e.g. 'library.book_copy'
+MODEL_NAME_RE = re.compile(r'^[a-z][a-z0-9_]*(\.[a-z0-9_]+)*$')
+
+# Default order of a model: field names with an optional direction, e.g. 'date desc, id'
+ORDER_RE = re.compile(r'^\s*\w+(\s+(asc|desc))?(\s*,\s*\w+(\s+(asc|desc))?)*\s*$', re.IGNORECASE)
+
+# Columns every model already has, plus BaseModel attributes a field would shadow
+RESERVED_FIELDS = frozenset({
+    'id', 'display_name', 'create_uid', 'create_date', 'write_uid', 'write_date', '__last_update',
+    'env', 'ids', 'pool', 'create', 'write', 'unlink', 'browse', 'search', 'read',
+})
+
+# Indexed names, each one must have a single owner
+NAME, FILE, XML_ID = 'model name', 'file', 'XML id'
+
+# Owner key of the ids the module itself generates (root and app menus)
+MODULE = None
+
+
+class ValidationIssue:
+    __slots__ = ('model', 'field', 'row', 'message')
+
+    def __init__(self, message, model='', field='', row=None):
+        self.message = message
+        # Model name ('' for module level issues), field name and its row in model.fields
+        self.model = model
+        self.field = field
+        self.row = row
+
+    def __str__(self):
+        where = [self.model] if self.model else []
+        if self.field:
+            where.append(f"field '{self.field}'")
+        return ': '.join(where + [self.message])
+
+
+def is_number(value):
+    # Bounds must be plain numbers to be compared and written into SQL
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_positive_int(value):
+    # Sizes and limits are written as they are into the generated code
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def is_identifier(name):
+    # ASCII only: Odoo turns field names into SQL columns
+    return name.isascii() and name.isidentifier() and not keyword.iskeyword(name)
+
+
+def model_xml_ids(model):
+    model_id = model.model_id
+    return (f'{model_id}_view_form', f'{model_id}_view_tree', f'{model_id}_view_search',
+            f'action_{model_id}', f'{model_id}_menu', f'access_{model_id}')
+
+
+def module_issues(name, named_models):
+    issues = []
+    if not name:
+        issues.append(ValidationIssue("Module name is required"))
+    elif not is_identifier(name):
+        issues.append(ValidationIssue(f"Module name '{name}' is not a valid Python identifier"))
+    # The app menu opens the action of the first model
+    if not named_models:
+        issues.append(ValidationIssue("The module needs at least one model with a name"))
+    return issues
+
+
+def field_issues(model, row, field):
+    issues = []
+
+    def issue(message):
+        issues.append(ValidationIssue(message, model.name, field.name, row))
+
+    name = field.name
+    if not is_identifier(name):
+        issue("not a valid Python identifier")
+    elif name in RESERVED_FIELDS:
+        issue("reserved by Odoo")
+    if field.field_type == 'Many2one' and not field.comodel:
+        issue("Many2one fields need a comodel")
+    elif field.field_type == 'Selection' and not any(key and value for key, value in field.selection):
+        issue("Selection fields need at least one option")
+    for kind, minimum, maximum in (('value', field.min_value, field.max_value),
+                                   ('length', field.min_length, field.max_length)):
+        numbers = True
+        for side, bound in (('minimum', minimum), ('maximum', maximum)):
+            if bound is not None and not is_number(bound):
+                issue(f"{side} {kind} {bound!r} is not a number")
+                numbers = False
+        if numbers and minimum is not None and maximum is not None and minimum > maximum:
+            issue(f"minimum {kind} {minimum} is greater than the maximum {maximum}")
+    if field.size and not is_positive_int(field.size):
+        issue(f"size {field.size!r} is not a positive integer")
+    return issues
+
+
+def model_issues(model):
+    # Everything that depends on this model alone: its name and its fields
+    issues = []
+    if model.name and not MODEL_NAME_RE.match(model.name):
+        issues.append(ValidationIssue("Model name must be lowercase words separated by dots",
+                                      model.name))
+    elif model.name and not is_identifier(model.short_name):
+        issues.append(ValidationIssue(f"'{model.short_name}' cannot be a Python module name",
+                                      model.name))
+    if model.order and not ORDER_RE.match(model.order):
+        issues.append(ValidationIssue(f"order '{model.order}' must be field names separated by commas, "
+                                      f"each one optionally followed by asc or desc", model.name))
+    if model.limit and not is_positive_int(model.limit):
+        issues.append(ValidationIssue(f"limit {model.limit!r} is not a positive integer", model.name))
+
+    seen = {}
+    for row, field in enumerate(model.fields):
+        # Blank rows are skipped by the generator
+        if not field.name:
+            continue
+        issues.extend(field_issues(model, row, field))
+        first = seen.setdefault(field.name, row)
+        if first != row:
+            issues.append(ValidationIssue(f"duplicate field name, also in row {first + 1}",
+                                          model.name, field.name, row))
+    return issues
+
+
+class SpecValidator:
+    def __init__(self):
+        self.module_name = ''
+        self.module_issues = []
+        # Model key -> issues of that model alone
+        self.model_issues = {}
+        # Model key -> model name, for collision messages
+        self.names = {}
+        # (kind, value) -> set of owner keys; a value with two owners collides
+        self.owners = {}
+        # Model key -> the (kind, value) entries it registered
+        self.entries = {}
+        # Keys of models with a name, the module needs at least one
+        self.named = set()
+        self.set_module('')
+
+    def set_module(self, name):
+        # Returns the models whose issues may have changed
+        self.module_name = name
+        affected = self._unregister(MODULE)
+        if name:
+            self._register(MODULE, [(XML_ID, f'{name}_menu_root'), (XML_ID, f'{name}_menu_app')])
+            affected |= self._owners_of(MODULE)
+        self.module_issues = module_issues(name, self.named)
+        return affected
+
+    def update_model(self, key, model):
+        # Revalidates one model and returns the keys whose issues may have
+        # changed: the model itself and whatever it collided or collides with
+        had_named = bool(self.named)
+        affected = self._unregister(key)
+        affected.add(key)
+        self.names[key] = model.name
+        self.model_issues[key] = model_issues(model)
+        if model.name:
+            self.named.add(key)
+            self._register(key, [(NAME, model.name), (FILE, f'models/{model.short_name}.py'),
+                                 (FILE, f'views/{model.short_name}_views.xml')]
+                           + [(XML_ID, xml_id) for xml_id in model_xml_ids(model)])
+            affected |= self._owners_of(key)
+        else:
+            self.named.discard(key)
+        if bool(self.named) != had_named:
+            self.module_issues = module_issues(self.module_name, self.named)
+        return affected
+
+    def remove_model(self, key):
+        had_named = bool(self.named)
+        affected = self._unregister(key)
+        self.names.pop(key, None)
+        self.model_issues.pop(key, None)
+        self.named.discard(key)
+        if bool(self.named) != had_named:
+            self.module_issues = module_issues(self.module_name, self.named)
+        return affected
+
+    def issues(self, key):
+        # Issues of one model, collisions included
+        issues = list(self.model_issues.get(key, ()))
+        # Colliding values grouped by kind and by the models they collide with,
+        # two models with the same model_id share all their XML ids
+        collisions = {}
+        for kind, value in self.entries.get(key, ()):
+            others = self.owners[(kind, value)]
+            if len(others) > 1:
+                users = tuple(sorted("the module menus" if other is MODULE else self.names[other]
+                                     for other in others if other != key))
+                collisions.setdefault((kind, users), []).append(value)
+        for (kind, users), values in collisions.items():
+            # Same model name means same files and XML ids, one message is enough
+            if kind != NAME and (NAME, users) in collisions:
+                continue
+            more = f" and {len(values) - 1} more" if len(values) > 1 else ''
+            issues.append(ValidationIssue(f"{kind} '{values[0]}'{more} also used by {', '.join(users)}",
+                                          self.names[key]))
+        return issues
+
+    def all_issues(self):
+        issues = list(self.module_issues)
+        for key in self.model_issues:
+            issues.extend(self.issues(key))
+        # Two models with the same name report the same collision
+        return list({str(issue): issue for issue in issues}.values())
+
+    def _register(self, key, entries):
+        self.entries[key] = entries
+        for entry in entries:
+            self.owners.setdefault(entry, set()).add(key)
+
+    def _unregister(self, key):
+        # Returns the other owners of the removed entries
+        affected = self._owners_of(key)
+        for entry in self.entries.pop(key, ()):
+            owners = self.owners[entry]
+            owners.discard(key)
+            if not owners:
+                del self.owners[entry]
+        affected.discard(key)
+        return affected
+
+    def _owners_of(self, key):
+        return {other for entry in self.entries.get(key, ()) for other in self.owners[entry]
+                if other is not MODULE}
+
+
+def comodel_issues(spec):
+    # A comodel of an unknown addon adds nothing to depends; unless depends
+    # lists some addon, the module would not install
+    if any(module != 'base' for module in spec.depends):
+        return []
+    unknown = {name for name, module in comodel_modules(spec).items() if module is None}
+    return [ValidationIssue(f"comodel '{field.comodel}' is not defined by this module or a known addon, "
+                            f"add its addon to depends or index its addons path", model.name, field.name, row)
+            for model in spec.models if model.name
+            for row, field in enumerate(model.fields)
+            if field.name and field.field_type == 'Many2one' and field.comodel in unknown]
+
+
+def validate_spec(spec):
+    validator = SpecValidator()
+    validator.set_module(spec.name)
+    for key, model in enumerate(spec.models):
+        validator.update_model(key, model)
+    issues = validator.all_issues() + comodel_issues(spec)
+    # Rules that are fine on their own can still leave too few distinct demo
+    # values; only checked once the bounds themselves are valid
+    if not issues:
+        issues = [ValidationIssue(message, model.name, field.name, row)
+                  for model, row, field, message in demo_issues(spec)]
+    return issues
+
+
+def check_spec(spec):
+    # Raises SpecError listing every issue, for front ends that must not write a broken module
+    issues = validate_spec(spec)
+    if issues:
+        raise SpecError("invalid spec:\n" + '\n'.join(f"  {issue}" for issue in issues))
@@ -0,0 +1,341 @@
+# Offline checks of a generated (or any) Odoo module: every .py file is
+# compiled, every XML and CSV file parsed, the XML ids referenced by the data
+# files are resolved in manifest load order and the manifest entries must
+# exist. No Odoo or PostgreSQL is needed, files are checked across a process
+# pool.
+import ast
+import csv
+from array import array
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from .importer import _literal, read_manifest
+
+
+SKIPPED_DIRS = {'__pycache__', '.git', 'node_modules'}
+CHECKED_EXTENSIONS = ('.py', '.xml', '.csv')
+
+# Elements of a data file that create a record with an XML id
+RECORD_TAGS = {'record', 'menuitem', 'template', 'act_window', 'report'}
+
+# Attributes holding a single XML id reference, by element ('ref' on any element)
+REF_ATTRIBUTES = {'menuitem': ('parent', 'action'), 'template': ('inherit_id',)}
+
+# ref('xml_id') in eval="..." and %(xml_id)d in button names
+EVAL_REF_RE = re.compile(r"""\bref\(\s*['"]([\w.]+)['"]\s*\)""")
+ACTION_REF_RE = re.compile(r'%\(([\w.]+)\)d')
+
+# Numbered XML ids like demo_library_book_42; CSV files keep the ones they
+# define as runs and the ones they reference as arrays of numbers, so
+# million-row demo files do not hold every id in memory
+NUMBERED_ID_RE = re.compile(r'^(.*?)([1-9]\d*)$')
+
+# Below this many files the pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+
+class FileCheck:
+    __slots__ = ('path', 'problems', 'events', 'models')
+
+    def __init__(self, path):
+        self.path = path
+        self.problems = []
+        # ('def' | 'ref', xml id) in document order, for data files, plus
+        # ('defs', prefix, first, last) and ('refs', prefix, numbers) for
+        # numbered ids in CSV files
+        self.events = []
+        # _name and _inherit models of a .py file, Odoo gives each one a model_<name> id
+        self.models = []
+
+
+class VerifyResult:
+    __slots__ = ('module_path', 'files', 'problems')
+
+    def __init__(self, module_path, files=0, problems=None):
+        self.module_path = module_path
+        # Number of files checked
+        self.files = files
+        self.problems = problems or []
+
+    @property
+    def ok(self):
+        return not self.problems
+
+
+def module_files(module_path):
+    files = []
+    for directory, subdirs, names in os.walk(module_path):
+        subdirs[:] = sorted(name for name in subdirs if name not in SKIPPED_DIRS)
+        files.extend(os.path.join(directory, name) for name in sorted(names)
+                     if name.endswith(CHECKED_EXTENSIONS))
+    return files
+
+
+def check_file(path):
+    check = FileCheck(path)
+    try:
+        if path.endswith('.py'):
+            _check_python(path, check)
+        elif path.endswith('.xml'):
+            _check_xml(path, check)
+        else:
+            _check_csv(path, check)
+    except OSError as e:
+        check.problems.append(f"cannot read: {e.strerror}")
+    except UnicodeDecodeError as e:
+        check.problems.append(f"not valid UTF-8: {e}")
+    return check
+
+
+def _check_python(path, check):
+    with open(path, 'rb') as f:
+        source = f.read()
+    try:
+        # compile() also catches what ast.parse() accepts, e.g. 'return' outside a function
+        tree = ast.parse(source, path)
+        compile(tree, path, 'exec')
+    except SyntaxError as e:
+        check.problems.append(f"line {e.lineno}: {e.msg}")
+        return
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name)
+                    and statement.targets[0].id in ('_name', '_inherit')):
+                value = _literal(statement.value)
+                if isinstance(value, str):
+                    check.models.append(value)
+                elif isinstance(value, (list, tuple)):
+                    check.models.extend(name for name in value if isinstance(name, str))
+                elif value is not None or isinstance(statement.value, (ast.Dict, ast.Set)):
+                    # Names of constants are fine, other literals fail in Odoo
+                    check.problems.append(f"line {statement.lineno}: {statement.targets[0].id} "
+                                          "must be a model name or a list of model names")
+
+
+def _check_xml(path, check):
+    try:
+        root = ET.parse(path).getroot()
+    except ET.ParseError as e:
+        check.problems.append(f"invalid XML: {e}")
+        return
+    for element in root.iter():
+        ref_attributes = REF_ATTRIBUTES.get(element.tag, ())
+        for name, value in element.attrib.items():
+            if name == 'ref' or name in ref_attributes:
+                check.events.append(('ref', value))
+            elif name == 'eval':
+                check.events.extend(('ref', ref) for ref in EVAL_REF_RE.findall(value))
+            elif name == 'name' and element.tag == 'button':
+                check.events.extend(('ref', ref) for ref in ACTION_REF_RE.findall(value))
+        if element.tag in RECORD_TAGS and element.get('id'):
+            check.events.append(('def', element.get('id')))
+
+
+def _check_csv(path, check):
+    # Read row by row, demo data files can have millions of lines
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        try:
+            header = next(reader, None)
+            if header is None:
+                check.problems.append("empty CSV file")
+                return
+            # Odoo loads <model>.csv with the 'id' column as XML ids and
+            # '<field>:id' columns as references
+            ids = header.index('id') if 'id' in header else None
+            refs = [i for i, column in enumerate(header) if column.endswith(':id')]
+            # Only the first reference to an id can fail, the rest are not kept
+            seen = set()
+            # Prefix -> [first, last] of the numbered ids defined so far; a run
+            # is added to the events when it ends, after the rows that use it
+            runs = {}
+            # Prefix -> numbers referenced with it, for prefixes this file
+            # does not define; added to the events where first referenced
+            numbers = {}
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != len(header):
+                    check.problems.append(f"line {reader.line_num}: {len(row)} columns, "
+                                          f"the header has {len(header)}")
+                    continue
+                for i in refs:
+                    value = row[i]
+                    if not value or value in seen:
+                        continue
+                    match = NUMBERED_ID_RE.match(value)
+                    if match:
+                        prefix, number = match.group(1), int(match.group(2))
+                        run = runs.get(prefix)
+                        if run is None:
+                            if prefix not in numbers:
+                                numbers[prefix] = array('q')
+                                check.events.append(('refs', prefix, numbers[prefix]))
+                            numbers[prefix].append(number)
+                            continue
+                        if run[0] <= number <= run[1]:
+                            continue
+                    seen.add(value)
+                    check.events.append(('ref', value))
+                value = row[ids] if ids is not None else None
+                if not value:
+                    continue
+                match = NUMBERED_ID_RE.match(value)
+                if match:
+                    prefix, number = match.group(1), int(match.group(2))
+                    run = runs.get(prefix)
+                    if run is not None and number == run[1] + 1:
+                        run[1] = number
+                        continue
+                    if run is not None:
+                        check.events.append(('defs', prefix, run[0], run[1]))
+                    runs[prefix] = [number, number]
+                else:
+                    seen.add(value)
+                    check.events.append(('def', value))
+            check.events.extend(('defs', prefix, first, last) for prefix, (first, last) in runs.items())
+            for prefix, referenced in numbers.items():
+                referenced[:] = array('q', sorted(set(referenced)))
+        except csv.Error as e:
+            check.problems.append(f"invalid CSV: {e}")
+
+
+class DefinedIds:
+    # Set of the XML ids defined so far, with the runs of numbered ids
+    __slots__ = ('ids', 'runs')
+
+    def __init__(self, ids=()):
+        self.ids = set(ids)
+        # Prefix -> list of (first, last)
+        self.runs = {}
+
+    def add(self, event, xml_id):
+        # event is a 'def' or 'defs' event, xml_id its (local) id or prefix
+        if event[0] == 'def':
+            self.ids.add(xml_id)
+        else:
+            self.runs.setdefault(xml_id, []).append(event[2:])
+
+    def __contains__(self, xml_id):
+        if xml_id in self.ids:
+            return True
+        match = NUMBERED_ID_RE.match(xml_id)
+        return match is not None and self.has_number(match.group(1), int(match.group(2)))
+
+    def has_number(self, prefix, number):
+        return (any(first <= number <= last for first, last in self.runs.get(prefix, ()))
+                or f'{prefix}{number}' in self.ids)
+
+
+def _local_id(xml_id, module_name):
+    # 'module.xml_id' -> 'xml_id' for this module, None for other modules
+    module, _, name = xml_id.rpartition('.')
+    if not module:
+        return xml_id
+    return name if module == module_name else None
+
+
+def check_module(module_path, checks, module_name=None):
+    # Module level checks on the per-file results: manifest entries and the
+    # XML ids referenced by the data files, in the order Odoo loads them.
+    # module_name defaults to the directory name (a staged tree has another)
+    if module_name is None:
+        module_name = os.path.basename(os.path.normpath(module_path))
+    problems = [f"{os.path.relpath(check.path, module_path)}: {problem}"
+                for check in checks.values() for problem in check.problems]
+
+    try:
+        manifest = read_manifest(module_path)
+    except (OSError, SyntaxError, ValueError) as e:
+        problems.append(f"__manifest__.py: unreadable ({e})")
+        return problems
+    data_files = list(dict.fromkeys(list(manifest.get('data', ())) + list(manifest.get('demo', ()))))
+    for rel_path in data_files:
+        if not os.path.isfile(os.path.join(module_path, rel_path)):
+            problems.append(f"__manifest__.py: '{rel_path}' does not exist")
+
+    # Odoo creates model_<name> for every model before loading the data files
+    models = {'model_' + name.replace('.', '_') for check in checks.values() for name in check.models}
+    defined = DefinedIds(models)
+    all_defined = DefinedIds(models)
+    loaded = [check for check in (checks.get(os.path.join(module_path, rel_path)) for rel_path in data_files)
+              if check is not None]
+    for check in loaded:
+        for event in check.events:
+            local = _local_id(event[1], module_name)
+            if event[0] in ('def', 'defs') and local is not None:
+                all_defined.add(event, local)
+    for check in loaded:
+        rel_path = os.path.relpath(check.path, module_path)
+        for event in check.events:
+            kind, xml_id = event[0], event[1]
+            local = _local_id(xml_id, module_name)
+            if local is None:
+                continue
+            if kind in ('def', 'defs'):
+                defined.add(event, local)
+                continue
+            if kind == 'ref':
+                missing = [] if local in defined else [(xml_id, local)]
+            else:
+                missing = [(f'{xml_id}{number}', f'{local}{number}') for number in event[2]
+                           if not defined.has_number(local, number)]
+            if missing:
+                xml_id, local = missing[0]
+                where = "is only defined later in the manifest data" if local in all_defined else "is not defined"
+                more = f" ({len(missing) - 1} more like it)" if len(missing) > 1 else ''
+                problems.append(f"{rel_path}: reference '{xml_id}' {where}{more}")
+    return list(dict.fromkeys(problems))
+
+
+def file_signature(path):
+    # Changes whenever the file is rewritten or replaced, None when it is missing
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def verify_modules(module_paths, workers=None, cache=None, module_names=None):
+    # All files of all modules share one pool, like importer.import_modules.
+    # cache, a dict kept by the caller between runs, maps each path to its
+    # stat signature and FileCheck: files that did not change are not read.
+    # module_names, if given, holds the name of each module (None for the
+    # directory name).
+    files_by_module = [(module_path, module_files(module_path)) for module_path in module_paths]
+    all_files = [path for _, files in files_by_module for path in files]
+
+    checks = {}
+    signatures = {}
+    if cache is not None:
+        for path in all_files:
+            signatures[path] = file_signature(path)
+            cached = cache.get(path)
+            if cached is not None and cached[0] == signatures[path]:
+                checks[path] = cached[1]
+    pending = [path for path in all_files if path not in checks]
+
+    if len(pending) >= PARALLEL_MIN_FILES and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            checks.update(zip(pending, executor.map(check_file, pending, chunksize=32)))
+    else:
+        checks.update((path, check_file(path)) for path in pending)
+
+    if cache is not None:
+        cache.clear()
+        cache.update((path, (signatures[path], checks[path])) for path in all_files)
+
+    module_names = module_names or [None] * len(module_paths)
+    return [VerifyResult(module_path, len(files),
+                         check_module(module_path, {path: checks[path] for path in files}, module_name))
+            for (module_path, files), module_name in zip(files_by_module, module_names)]
+
+
+def verify_module(module_path, workers=None, cache=None, module_name=None):
+    return verify_modules([module_path], workers, cache, [module_name])[0]
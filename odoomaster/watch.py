@@ -0,0 +1,202 @@
+# Watch mode: spec files are watched with inotify on Linux (polling elsewhere)
+# and every module whose spec changed is generated again. A burst of events,
+# like an editor writing a temporary file and renaming it, is handled once,
+# and only the models whose definition changed are rendered again.
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+
+from .generator import RenderCache, generate_bash_script, generate_module, render_module
+from .spec import load_spec
+from .validation import check_spec
+from .verify import file_signature, verify_module
+
+
+# Quiet time that ends a burst of events
+DEBOUNCE_SECONDS = 0.1
+
+POLL_INTERVAL = 0.25
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# Editors either rewrite the file or rename a new one over it
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    # Watches the directories of the files, renames replace the watched inode
+    def __init__(self, paths):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                self.close()
+                raise OSError(errno, f"cannot watch {directory}")
+            self.directories[wd] = directory
+
+    def changes(self, timeout=None):
+        # Paths changed within timeout seconds (None waits for ever)
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, anything may have changed
+                return set(self.paths)
+            path = os.path.join(self.directories.get(wd, ''), os.fsdecode(name))
+            if path in self.paths:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.interval = interval
+        self.signatures = {path: file_signature(path) for path in self.paths}
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                signature = file_signature(path)
+                if signature != self.signatures[path]:
+                    self.signatures[path] = signature
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(self.interval if deadline is None
+                       else max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def make_watcher(paths, polling=False):
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            # No inotify (other libc) or out of watches
+            pass
+    return PollingWatcher(paths)
+
+
+def wait_for_changes(watcher, debounce=DEBOUNCE_SECONDS):
+    # Blocks until a burst of changes is over and returns the changed paths
+    changed = watcher.changes()
+    while True:
+        more = watcher.changes(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+class WatchResult:
+    __slots__ = ('spec_path', 'module_name', 'report', 'rendered', 'problems', 'error', 'elapsed')
+
+    def __init__(self, spec_path):
+        self.spec_path = spec_path
+        self.module_name = ''
+        self.report = None
+        # Models rendered again, the rest came from the cache
+        self.rendered = []
+        # Verification problems of the generated module
+        self.problems = []
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and not self.problems
+
+
+class SpecWatch:
+    # One watched spec and the render cache of its module
+    def __init__(self, spec_path, output_dir, with_script=True, check=True):
+        self.spec_path = os.path.abspath(spec_path)
+        self.output_dir = output_dir
+        self.with_script = with_script
+        self.check = check
+        self.cache = RenderCache()
+        # File checks of the module, only the files written again are checked again
+        self.checks = {}
+        # The first run also writes the script and verifies an unchanged module
+        self.initial = True
+
+    def generate(self):
+        result = WatchResult(self.spec_path)
+        start = time.perf_counter()
+        try:
+            spec = load_spec(self.spec_path)
+            result.module_name = spec.name
+            check_spec(spec)
+            files = render_module(spec, cache=self.cache)
+            result.rendered = self.cache.rendered
+            result.report = generate_module(spec, self.output_dir, files)
+            changed = result.report.changed or self.initial
+            self.initial = False
+            if self.with_script and changed:
+                generate_bash_script(spec, self.output_dir, files)
+            if self.check and changed:
+                result.problems = verify_module(result.report.module_path, 1, self.checks).problems
+        except Exception as e:
+            # A half-saved spec is normal while editing: report it and keep
+            # watching, the next save tries again
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def watch_specs(spec_paths, output_dir, on_result, with_script=True, check=True,
+                polling=False, debounce=DEBOUNCE_SECONDS, on_ready=None):
+    # Generates every module once, then again whenever its spec changes;
+    # runs until interrupted. on_ready is called with the watcher once the
+    # first generation is done.
+    os.makedirs(output_dir, exist_ok=True)
+    watches = {}
+    for spec_path in spec_paths:
+        watch = SpecWatch(spec_path, output_dir, with_script, check)
+        watches[watch.spec_path] = watch
+    watcher = make_watcher(watches, polling)
+    try:
+        for watch in watches.values():
+            on_result(watch.generate())
+        if on_ready is not None:
+            on_ready(watcher)
+        while True:
+            for path in sorted(wait_for_changes(watcher, debounce)):
+                on_result(watches[path].generate())
+    finally:
+        watcher.close()
@@ -0,0 +1,307 @@
+# Incremental output: only files whose bytes changed are written, so mtimes
+# (and Odoo's auto-reload or rsync deploys) only see real changes. Module trees
+# are staged and swapped in whole, never left half-written.
+import ctypes
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+STATE_FILE = '.odoomaster_state.json'
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+DELETED = 'deleted'
+
+
+class WriteReport:
+    __slots__ = ('module_path', 'created', 'updated', 'unchanged', 'deleted')
+
+    def __init__(self, module_path):
+        self.module_path = module_path
+        self.created = []
+        self.updated = []
+        self.unchanged = []
+        self.deleted = []
+
+    def add(self, status, path):
+        getattr(self, status).append(path)
+
+    @property
+    def changed(self):
+        return bool(self.created or self.updated or self.deleted)
+
+    def summary(self):
+        return (f"{len(self.created)} created, {len(self.updated)} updated, "
+                f"{len(self.unchanged)} unchanged, {len(self.deleted)} deleted")
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def load_state(module_path):
+    try:
+        with open(os.path.join(module_path, STATE_FILE), encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(module_path, hashes):
+    content = json.dumps({'files': hashes}, indent=1, sort_keys=True).encode('utf-8')
+    write_if_changed(os.path.join(module_path, STATE_FILE), content)
+
+
+def write_if_changed(path, content, mode=None):
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        status = CREATED
+    else:
+        if size == len(content):
+            with open(path, 'rb') as f:
+                if f.read() == content:
+                    return UNCHANGED
+        status = UPDATED
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    if mode is not None:
+        os.chmod(path, mode)
+    return status
+
+
+@contextmanager
+def staged_file(path, mode=None):
+    # Stream into a temporary file next to path; it only replaces path if its
+    # bytes differ, so large outputs get the same treatment as write_if_changed.
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+            os.remove(tmp_path)
+            return
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_module(module_path, files, progress=None, placeholders=(), workers=None, streams=(),
+                 check=None):
+    # files maps paths relative to module_path (always with '/') to bytes;
+    # progress, if given, is called with each relative path once it is handled.
+    # placeholders are empty files created only when missing (not tracked).
+    # streams are (path, signature, write) for files too large to hold in
+    # memory: write(f) streams the content into the binary file f, and it is
+    # only called when the signature of its inputs changed since last time.
+    # check, if given, is called with the directory of the complete new tree
+    # before it replaces module_path; an exception raised there aborts the
+    # write and leaves module_path untouched.
+    #
+    # The new tree is assembled in a staging directory next to module_path,
+    # unchanged and foreign files are hard-linked from the current tree, and it
+    # is then swapped in with a rename: module_path always holds either the
+    # complete old module or the complete new one.
+    report = WriteReport(module_path)
+    target = os.path.realpath(module_path)
+    previous = load_state(target)
+    hashes = {rel_path: content_hash(content) for rel_path, content in files.items()}
+    streams = {rel_path: (signature, write) for rel_path, signature, write in streams}
+    # The state keeps the signature of a streamed file in place of its hash
+    hashes.update((rel_path, signature) for rel_path, (signature, _) in streams.items())
+    removed = [rel_path for rel_path in sorted(set(previous) - set(hashes))
+               if os.path.lexists(_join(target, rel_path))]
+    missing = [rel_path for rel_path in placeholders if not os.path.lexists(_join(target, rel_path))]
+
+    # Same hashes as last run and same sizes on disk: nothing to stage
+    if not removed and not missing and all(
+            previous.get(rel_path) == digest and _size(_join(target, rel_path)) == len(files[rel_path])
+            for rel_path, digest in hashes.items() if rel_path in files) and all(
+            previous.get(rel_path) == signature and os.path.isfile(_join(target, rel_path))
+            for rel_path, (signature, _) in streams.items()):
+        for rel_path in list(files) + list(streams):
+            report.add(UNCHANGED, rel_path)
+            if progress is not None and rel_path in files:
+                progress(rel_path)
+        if check is not None:
+            check(target)
+        return report
+
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f'.{os.path.basename(target)}.staging-', dir=parent)
+    try:
+        if os.path.isdir(target):
+            os.chmod(staging, stat.S_IMODE(os.stat(target).st_mode))
+            _carry_over(target, staging, set(hashes) | set(previous) | {STATE_FILE})
+        else:
+            os.chmod(staging, 0o755)
+
+        def stage(rel_path):
+            return _stage_file(target, staging, rel_path, files[rel_path],
+                               previous.get(rel_path) == hashes[rel_path])
+
+        # Many small files: the writes overlap well on network filesystems
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for rel_path, status in zip(files, executor.map(stage, files)):
+                report.add(status, rel_path)
+                if progress is not None:
+                    progress(rel_path)
+        for rel_path, (signature, write) in streams.items():
+            report.add(_stage_stream(target, staging, rel_path, write,
+                                     previous.get(rel_path) == signature), rel_path)
+        for rel_path in removed:
+            report.add(DELETED, rel_path)
+
+        for rel_path in missing:
+            path = _join(staging, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'wb').close()
+        save_state(staging, hashes)
+        if check is not None:
+            check(staging)
+        _swap(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return report
+
+
+def _join(root, rel_path):
+    return os.path.join(root, *rel_path.split('/'))
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _stage_file(target, staging, rel_path, content, same_hash):
+    # Runs in a writer thread
+    old_path = _join(target, rel_path)
+    new_path = _join(staging, rel_path)
+    os.makedirs(os.path.dirname(new_path), exist_ok=True)
+
+    size = _size(old_path)
+    if size is None:
+        status = CREATED
+    elif size == len(content) and (same_hash or _read(old_path) == content):
+        status = UNCHANGED
+    else:
+        status = UPDATED
+
+    if status == UNCHANGED:
+        # Keeps the inode and mtime, so the file does not look modified
+        _link(old_path, new_path)
+    else:
+        with open(new_path, 'wb') as f:
+            f.write(content)
+    return status
+
+
+def _stage_stream(target, staging, rel_path, write, same_signature):
+    old_path = _join(target, rel_path)
+    new_path = _join(staging, rel_path)
+    os.makedirs(os.path.dirname(new_path), exist_ok=True)
+    exists = os.path.isfile(old_path)
+    if exists and same_signature:
+        _link(old_path, new_path)
+        return UNCHANGED
+    with open(new_path, 'wb') as f:
+        write(f)
+    if not exists:
+        return CREATED
+    if _size(old_path) == _size(new_path) and filecmp.cmp(old_path, new_path, shallow=False):
+        # Same bytes after all: keep the old inode and mtime
+        os.remove(new_path)
+        _link(old_path, new_path)
+        return UNCHANGED
+    return UPDATED
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _link(src, dst):
+    if os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Filesystems without hard links
+        shutil.copy2(src, dst)
+
+
+def _carry_over(target, staging, skipped):
+    # Files in the module that OdooMaster does not generate (icons, data files
+    # added by hand...) move to the new tree unchanged
+    for directory, subdirs, names in os.walk(target):
+        rel_dir = os.path.relpath(directory, target)
+        prefix = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/') + '/'
+        for name in list(subdirs):
+            if os.path.islink(os.path.join(directory, name)):
+                subdirs.remove(name)
+                names.append(name)
+        for name in names:
+            rel_path = prefix + name
+            if rel_path in skipped:
+                continue
+            new_path = _join(staging, rel_path)
+            os.makedirs(os.path.dirname(new_path), exist_ok=True)
+            _link(os.path.join(directory, name), new_path)
+
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+_renameat2 = None
+
+
+def _exchange(first, second):
+    # Atomically swaps two directories with renameat2(RENAME_EXCHANGE) on Linux;
+    # False when the platform or the filesystem does not support it
+    global _renameat2
+    if _renameat2 is None:
+        try:
+            _renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+            _renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p,
+                                   ctypes.c_uint]
+        except (OSError, AttributeError, TypeError):
+            _renameat2 = False
+    if not _renameat2:
+        return False
+    return _renameat2(AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second),
+                      RENAME_EXCHANGE) == 0
+
+
+def _swap(staging, target):
+    if not os.path.exists(target):
+        os.rename(staging, target)
+    elif _exchange(staging, target):
+        # staging now holds the old tree
+        shutil.rmtree(staging, ignore_errors=True)
+    else:
+        # Two renames: the module is missing for an instant but never partial
+        old_path = staging + '.old'
+        os.rename(target, old_path)
+        os.rename(staging, target)
+        shutil.rmtree(old_path, ignore_errors=True)
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from odoomaster import ModelSpec, ModuleSpec, load_spec  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    # Model index, autosave and profiles go to a fresh cache directory
+    cache = tmp_path / 'cache'
+    monkeypatch.setenv('XDG_CACHE_HOME', str(cache))
+    return cache
+
+
+@pytest.fixture
+def library_spec():
+    return load_spec(os.path.join(ROOT, 'examples', 'library.json'))
+
+
+@pytest.fixture
+def make_spec():
+    # One module with one model holding the given fields
+    def make(*fields, name='test_module', model='test.item', **options):
+        return ModuleSpec(name, models=[ModelSpec(model, list(fields))], **options)
+    return make
@@ -0,0 +1,50 @@
+import hashlib
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from odoomaster import render_module
+from odoomaster.archive import ICON_PATH, build_archive, generate_archive
+
+
+def test_tar_archive_is_reproducible(library_spec):
+    files = render_module(library_spec)
+    data = build_archive(library_spec, files)
+    assert build_archive(library_spec, files) == data
+
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        names = archive.getnames()
+        assert archive.extractfile('library/__manifest__.py').read() == files['__manifest__.py']
+    assert sorted(names) == sorted(f'library/{path}' for path in list(files) + [ICON_PATH])
+
+
+def test_zip_archive_contents(library_spec):
+    files = render_module(library_spec)
+    with zipfile.ZipFile(io.BytesIO(build_archive(library_spec, files, 'zip'))) as archive:
+        for rel_path, content in files.items():
+            assert archive.read(f'library/{rel_path}') == content
+        assert archive.read(f'library/{ICON_PATH}') == b''
+
+
+def test_unknown_format(library_spec):
+    with pytest.raises(ValueError):
+        build_archive(library_spec, {}, 'rar')
+
+
+def test_installer_checks_the_archive(library_spec, tmp_path):
+    files = render_module(library_spec)
+    archive_path, installer_path = generate_archive(library_spec, str(tmp_path), files)
+    with open(archive_path, 'rb') as f:
+        checksum = hashlib.sha256(f.read()).hexdigest()
+    with open(installer_path) as f:
+        installer = f.read()
+    assert f'echo "{checksum}  $ARCHIVE" | sha256sum -c' in installer
+    assert 'tar -xzf "$ARCHIVE"' in installer
+
+    _, installer_path = generate_archive(library_spec, str(tmp_path), files, 'zip', verify=False)
+    with open(installer_path) as f:
+        installer = f.read()
+    assert 'sha256sum' not in installer
+    assert 'unzip -oq "$ARCHIVE"' in installer
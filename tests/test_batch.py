@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from odoomaster import FieldSpec, ModelSpec, ModuleSpec, save_spec
+from odoomaster.batch import find_specs, generate_batch
+from odoomaster.cli import build_parser, main
+
+
+def write_specs(directory, *names):
+    paths = []
+    for name in names:
+        path = str(directory / f'{name}.json')
+        save_spec(ModuleSpec(name, models=[ModelSpec(f'{name}.item', [FieldSpec('name')])]), path)
+        paths.append(path)
+    return paths
+
+
+def test_find_specs_in_a_directory_and_a_manifest(tmp_path):
+    specs = tmp_path / 'specs'
+    specs.mkdir()
+    paths = write_specs(specs, 'b_mod', 'a_mod')
+    (specs / 'notes.txt').write_text('')
+    assert find_specs(str(specs)) == sorted(paths)
+
+    manifest = tmp_path / 'modules.txt'
+    manifest.write_text('# modules\nspecs/b_mod.json\n\nspecs/a_mod.json\n')
+    assert find_specs(str(manifest)) == [os.path.join(str(tmp_path), 'specs', 'b_mod.json'),
+                                         os.path.join(str(tmp_path), 'specs', 'a_mod.json')]
+
+
+def test_generate_batch_reports_failures_in_input_order(tmp_path):
+    paths = write_specs(tmp_path, 'first', 'second')
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{"name": ')
+    paths.insert(1, str(broken))
+
+    summary = generate_batch(paths, str(tmp_path / 'out'), workers=2)
+    assert [result.spec_path for result in summary.results] == paths
+    assert [result.ok for result in summary.results] == [True, False, True]
+    assert summary.results[1].error.startswith('SpecError: ')
+    for name in ('first', 'second'):
+        assert os.path.isfile(tmp_path / 'out' / name / '__manifest__.py')
+        assert os.path.isfile(tmp_path / 'out' / f'create_{name}_module.sh')
+
+
+def test_batch_jobs_must_be_positive():
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(['batch', 'specs', '-j', '0'])
+
+
+def test_batch_reports_output_errors(tmp_path, capsys):
+    write_specs(tmp_path, 'first')
+    (tmp_path / 'file').write_text('')
+    assert main(['batch', str(tmp_path), '-o', str(tmp_path / 'file' / 'out')]) == 1
+    assert capsys.readouterr().err.startswith('Error: ')
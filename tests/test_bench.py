@@ -0,0 +1,34 @@
+from odoomaster import bench
+
+
+def test_synthetic_spec_is_deterministic():
+    spec = bench.synthetic_spec(3, 20)
+    assert spec.to_dict() == bench.synthetic_spec(3, 20).to_dict()
+    assert [len(model.fields) for model in spec.models] == [20, 20, 20]
+    assert spec.to_dict() != bench.synthetic_spec(3, 20, seed=1).to_dict()
+
+
+def test_run_benchmarks(tmp_path):
+    reported = []
+    results = bench.run_benchmarks([1, 2], [3], repeat=1,
+                                   on_result=lambda key, result: reported.append(key))
+    assert reported == ['1x3/module', '1x3/script', '2x3/module', '2x3/script']
+    assert list(results) == reported
+    for result in results.values():
+        assert result['time'] > 0 and result['peak_memory'] > 0 and result['bytes'] > 0
+
+    path = str(tmp_path / 'baseline.json')
+    bench.save_results(results, path)
+    assert bench.load_results(path) == results
+
+
+def test_compare():
+    baseline = {'a': {'time': 1.0, 'peak_memory': 1e6}, 'b': {'time': 1.0, 'peak_memory': 1e6}}
+    results = {'a': {'time': 1.5, 'peak_memory': 1e6}, 'b': {'time': 1.1, 'peak_memory': 3e6},
+               'c': {'time': 9.0, 'peak_memory': 9e6}}
+    assert bench.compare(results, baseline) == [('a', 'time', 1.0, 1.5, 1.5),
+                                                ('b', 'peak_memory', 1e6, 3e6, 3.0)]
+    assert bench.compare(results, baseline, threshold=5) == []
+    # Tiny absolute differences are noise
+    assert bench.compare({'a': {'time': 0.002, 'peak_memory': 1e6}},
+                         {'a': {'time': 0.001, 'peak_memory': 1e6}}) == []
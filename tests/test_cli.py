@@ -0,0 +1,162 @@
+import os
+
+import pytest
+
+from odoomaster import load_spec
+from odoomaster.cli import build_parser, main
+from odoomaster.template import set_template_dirs
+
+
+def test_generate(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['generate', spec_path, '-o', str(tmp_path)]) == 0
+    assert os.path.isfile(tmp_path / 'library' / '__manifest__.py')
+    assert os.path.isfile(tmp_path / 'create_library_module.sh')
+
+
+def test_generate_reports_write_errors(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    (tmp_path / 'file').write_text('')
+    assert main(['generate', spec_path, '-o', str(tmp_path / 'file' / 'out')]) == 1
+    assert capsys.readouterr().err.startswith('Error: ')
+
+
+def test_generate_refuses_invalid_specs(tmp_path, capsys):
+    spec = tmp_path / 'spec.json'
+    spec.write_text('{"name": "mod", "models": [{"name": "a.b", "fields": [{"name": "id"}]}]}')
+    assert main(['generate', str(spec), '-o', str(tmp_path / 'out')]) == 1
+    assert "reserved by Odoo" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / 'out')
+
+
+def test_generate_archive(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['generate', spec_path, '-o', str(tmp_path), '--archive', 'zip']) == 0
+    assert os.path.isfile(tmp_path / 'library.zip')
+    assert os.path.isfile(tmp_path / 'install_library.sh')
+    assert not os.path.exists(tmp_path / 'create_library_module.sh')
+
+
+def test_generate_demo_rows(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['generate', spec_path, '-o', str(tmp_path), '--no-script', '--demo-rows', '5']) == 0
+    assert os.listdir(tmp_path / 'library' / 'demo')
+    with pytest.raises(SystemExit):
+        main(['generate', spec_path, '--demo-rows', '-1'])
+
+
+def test_import(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['generate', spec_path, '-o', str(tmp_path), '--no-script']) == 0
+    output = tmp_path / 'imported.json'
+    assert main(['import', str(tmp_path / 'library'), '-o', str(output), '-j', '1']) == 0
+    assert load_spec(str(output)).to_dict() == load_spec(spec_path).to_dict()
+
+
+def test_import_rejects_zero_jobs(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(['import', str(tmp_path), '-j', '0'])
+    assert 'expected a positive integer' in capsys.readouterr().err
+
+
+def test_index(tmp_path, capsys):
+    models = tmp_path / 'addons' / 'x' / 'models.py'
+    models.parent.mkdir(parents=True)
+    models.write_text("class A:\n    _name = 'x.a'\n")
+    index_path = tmp_path / 'index.json'
+    assert main(['index', str(tmp_path / 'addons'), '--index', str(index_path), '-q', 'x.']) == 0
+    assert capsys.readouterr().out.splitlines()[1:] == ['x.a']
+    assert os.path.isfile(index_path)
+    with pytest.raises(SystemExit):
+        main(['index', str(tmp_path / 'addons'), '-j', '0'])
+
+
+def test_bench(tmp_path, capsys):
+    baseline = str(tmp_path / 'baseline.json')
+    assert main(['bench', '--models', '1', '--fields', '2', '--outputs', 'script',
+                 '--repeat', '1', '--save', baseline]) == 0
+    assert '1x2/script' in capsys.readouterr().out
+    assert main(['bench', '--models', '1', '--fields', '2', '--outputs', 'script',
+                 '--repeat', '1', '--compare', baseline, '--threshold', '1000']) == 0
+
+
+def test_bench_rejects_bad_options(capsys):
+    for option, value in (('--outputs', 'module,zip'), ('--outputs', ','), ('--repeat', '0')):
+        with pytest.raises(SystemExit):
+            main(['bench', option, value])
+        assert value in capsys.readouterr().err
+
+
+def test_generate_timings_and_profile(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    profile = tmp_path / 'run.prof'
+    assert main(['generate', spec_path, '-o', str(tmp_path), '--timings',
+                 '--profile', str(profile)]) == 0
+    out = capsys.readouterr().out
+    assert 'write_module' in out and 'slowest models:' in out
+    assert os.path.isfile(profile)
+
+
+def test_deploy(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['deploy', spec_path, '-a', str(tmp_path), '--odoo-bin', 'true']) == 0
+    assert 'Ran true' in capsys.readouterr().out
+    assert main(['deploy', spec_path, '-a', str(tmp_path), '--odoo-bin', 'true']) == 0
+    assert 'No schema changes' in capsys.readouterr().out
+    assert main(['deploy', spec_path, '-a', str(tmp_path / 'missing')]) == 1
+
+
+def test_suite(tmp_path, capsys):
+    examples = os.path.join(os.path.dirname(__file__), os.pardir, 'examples')
+    assert main(['suite', examples, '-n']) == 0
+    assert 'level 0: library' in capsys.readouterr().out
+    assert main(['suite', examples, '-o', str(tmp_path), '-j', '1', '--no-script']) == 0
+    assert os.path.isfile(tmp_path / 'library' / '__manifest__.py')
+    assert main(['suite', str(tmp_path / 'missing')]) == 1
+    (tmp_path / 'file').write_text('')
+    assert main(['suite', examples, '-o', str(tmp_path / 'file' / 'out')]) == 1
+    with pytest.raises(SystemExit):
+        main(['suite', examples, '-j', '0'])
+
+
+def test_verify(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['generate', spec_path, '-o', str(tmp_path), '--no-script']) == 0
+    assert main(['verify', str(tmp_path), '-j', '1']) == 0
+    assert '  ok      library' in capsys.readouterr().out
+    (tmp_path / 'library' / 'models' / 'book.py').write_text('class Book(:\n')
+    assert main(['verify', str(tmp_path / 'library')]) == 1
+    assert 'models/book.py: line 1:' in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(['verify', str(tmp_path), '-j', '0'])
+
+
+def test_watch_reports_errors(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    assert main(['watch', str(tmp_path / 'missing.json')]) == 1
+    (tmp_path / 'file').write_text('')
+    assert main(['watch', spec_path, '-o', str(tmp_path / 'file' / 'out'), '--poll']) == 1
+    assert capsys.readouterr().err.count('Error: ') == 2
+
+
+def test_templates_option(tmp_path, capsys):
+    spec_path = os.path.join(os.path.dirname(__file__), os.pardir, 'examples', 'library.json')
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'security_rule.tmpl').write_text('custom,{{model_id}}\n')
+    try:
+        assert main(['generate', spec_path, '-o', str(tmp_path), '--no-script', '--no-check',
+                     '--templates', str(templates)]) == 0
+        security = (tmp_path / 'library' / 'security' / 'ir.model.access.csv').read_text()
+        assert 'custom,library_book' in security
+
+        (templates / 'security_rule.tmpl').write_text('{{unknown}}\n')
+        assert main(['generate', spec_path, '-o', str(tmp_path), '--no-script',
+                     '--templates', str(templates)]) == 1
+        assert 'no value for {{unknown}}' in capsys.readouterr().err
+    finally:
+        set_template_dirs(None)
+
+    for command in ('generate', 'deploy', 'batch', 'suite', 'watch'):
+        args = build_parser().parse_args([command, 'x', '--templates', 'a', '--templates', 'b'])
+        assert args.templates == ['a', 'b']
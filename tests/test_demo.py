@@ -0,0 +1,69 @@
+import csv
+import os
+
+import pytest
+
+from odoomaster import FieldSpec, SpecError, demo_streams, generate_module, verify_module
+from odoomaster.demo import demo_issues, iter_demo_rows
+
+
+def column(spec, name):
+    model = spec.models[0]
+    header, *records = iter_demo_rows(spec, model)
+    index = header.index(name)
+    return [record[index] for record in records]
+
+
+def test_one_sided_bounds_stay_inside(make_spec):
+    spec = make_spec(FieldSpec('qty', 'Integer', min_value=5000),
+                     FieldSpec('ratio', 'Float', max_value=-10),
+                     FieldSpec('code', 'Char', min_length=40, required=True), demo_rows=50)
+    assert all(5000 <= int(value) <= 6000 for value in column(spec, 'qty'))
+    assert all(-1010 <= float(value) <= -10 for value in column(spec, 'ratio'))
+    assert all(40 <= len(value) <= 66 for value in column(spec, 'code'))
+
+
+def test_unique_text_fits_max_length(make_spec):
+    spec = make_spec(FieldSpec('code', 'Char', max_length=2, unique=True), demo_rows=99)
+    values = column(spec, 'code')
+    assert len(set(values)) == 99
+    assert max(len(value) for value in values) == 2
+
+
+def test_rows_that_do_not_fit_raise_spec_error(make_spec):
+    spec = make_spec(FieldSpec('code', 'Char', max_length=2, unique=True), demo_rows=100)
+    with pytest.raises(SpecError, match='only 99 distinct demo values'):
+        demo_streams(spec)
+
+
+def test_demo_files_are_deterministic_and_verify(library_spec, tmp_path):
+    library_spec.demo_rows = 30
+    first = generate_module(library_spec, str(tmp_path / 'a')).module_path
+    second = generate_module(library_spec, str(tmp_path / 'b')).module_path
+    demo_dir = os.path.join(first, 'demo')
+    names = sorted(os.listdir(demo_dir))
+    assert names
+    for name in names:
+        with open(os.path.join(demo_dir, name), newline='') as f:
+            rows = list(csv.reader(f))
+        assert len(rows) == 31
+        with open(os.path.join(demo_dir, name), 'rb') as a, \
+                open(os.path.join(second, 'demo', name), 'rb') as b:
+            assert a.read() == b.read()
+    result = verify_module(first)
+    assert result.ok, result.problems
+
+
+def test_required_links_that_would_stay_empty_are_issues(make_spec):
+    spec = make_spec(FieldSpec('partner_id', 'Many2one', comodel='res.partner', required=True),
+                     FieldSpec('tag_id', 'Many2one', comodel='x.tag', required=True),
+                     FieldSpec('parent_id', 'Many2one', comodel='test.item', required=True), demo_rows=5)
+    assert [(field.name, message) for _, _, field, message in demo_issues(spec)] == [
+        ('tag_id', "no demo record of x.tag to link to, the required link would stay empty"),
+        ('parent_id', "the first demo record has no earlier record to link to, the required link "
+                      "would stay empty"),
+    ]
+    spec.models[0].fields[2].required = False
+    spec.models[0].fields[1].required = False
+    assert demo_issues(spec) == []
+    assert column(spec, 'parent_id:id')[0] == ''
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from odoomaster import deploy_module
+from odoomaster.deploy import PENDING_FILE, DeployError, upgrade_command
+
+
+def test_deploy_runs_the_upgrade_once(library_spec, tmp_path):
+    result = deploy_module(library_spec, str(tmp_path), odoo_command='true', config='odoo.conf')
+    assert result.upgraded
+    assert result.command[-3:] == ['-i', library_spec.name, '--stop-after-init']
+    assert not os.path.exists(os.path.join(str(tmp_path), library_spec.name, PENDING_FILE))
+    # Nothing changed: no upgrade
+    assert not deploy_module(library_spec, str(tmp_path), odoo_command='true').upgraded
+
+
+def test_upgrade_can_be_skipped(library_spec, tmp_path):
+    result = deploy_module(library_spec, str(tmp_path), odoo_command='false', upgrade=False)
+    assert not result.upgraded and '__manifest__.py' in result.schema_changes
+
+
+def test_failed_verification_keeps_the_deployed_module(library_spec, tmp_path):
+    deploy_module(library_spec, str(tmp_path), odoo_command='true')
+    manifest = os.path.join(str(tmp_path), library_spec.name, '__manifest__.py')
+    with open(manifest, 'rb') as f:
+        before = f.read()
+
+    files = {'__manifest__.py': b'{"name": '}
+    with pytest.raises(DeployError, match='failed verification, not deployed'):
+        deploy_module(library_spec, str(tmp_path), files=files, odoo_command='false')
+    with open(manifest, 'rb') as f:
+        assert f.read() == before
+    assert not os.path.exists(os.path.join(str(tmp_path), library_spec.name, PENDING_FILE))
+
+
+def test_failed_upgrade_is_retried(library_spec, tmp_path):
+    with pytest.raises(DeployError, match='exited with status 1'):
+        deploy_module(library_spec, str(tmp_path), odoo_command='false')
+    assert os.path.exists(os.path.join(str(tmp_path), library_spec.name, PENDING_FILE))
+    result = deploy_module(library_spec, str(tmp_path), odoo_command='true')
+    assert result.command[-3] == '-i'
+
+
+def test_missing_addons_path(library_spec, tmp_path):
+    with pytest.raises(DeployError, match='is not a directory'):
+        deploy_module(library_spec, str(tmp_path / 'missing'), odoo_command='true')
+
+
+def test_upgrade_command():
+    assert upgrade_command('library', 'python3 odoo-bin', 'odoo.conf', 'db') == [
+        'python3', 'odoo-bin', '-c', 'odoo.conf', '-d', 'db', '-u', 'library', '--stop-after-init']
@@ -0,0 +1,90 @@
+import ast
+import os
+import xml.etree.ElementTree as ET
+
+from odoomaster import FieldSpec, generate_bash_script, generate_module, render_module
+from odoomaster.generator import module_file_count, render_model, render_views, sql_check
+
+
+def module_files(module_path):
+    for directory, _, names in os.walk(module_path):
+        for name in names:
+            yield os.path.join(directory, name)
+
+
+def test_generated_files_parse(library_spec, tmp_path):
+    module_path = generate_module(library_spec, str(tmp_path)).module_path
+    for path in module_files(module_path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        if path.endswith('.py'):
+            ast.parse(content)
+        elif path.endswith('.xml'):
+            ET.fromstring(content)
+
+
+def test_script_recreates_written_files(library_spec, tmp_path):
+    module_path = generate_module(library_spec, str(tmp_path)).module_path
+    with open(generate_bash_script(library_spec, str(tmp_path)), encoding='utf-8') as f:
+        script = f.read()
+    for path in module_files(module_path):
+        rel_path = os.path.relpath(path, module_path)
+        if rel_path.startswith('.odoomaster') or rel_path.endswith('.png'):
+            continue
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        assert f'$MODULE_NAME/{rel_path}"\n{content}EOF\n' in script
+
+
+def test_one_sided_rules_stay_one_sided(make_spec):
+    minimum = FieldSpec('qty', 'Integer', min_value=5000)
+    maximum = FieldSpec('code', 'Char', max_length=3)
+    assert sql_check(minimum) == 'CHECK(qty = 0 OR qty >= 5000)'
+    assert sql_check(maximum) == 'CHECK(char_length(code) <= 3)'
+
+    source = render_model(make_spec(minimum, maximum).models[0], use_sql_constraints=False)
+    assert '(record.qty < 5000)' in source
+    assert '(len(record.code) > 3)' in source
+    assert '100' not in source
+
+
+def test_labels_are_not_formatted(make_spec):
+    spec = make_spec(FieldSpec('owner', string="Owner's name {max}", min_length=1, max_length=5),
+                     FieldSpec('qty', 'Integer', min_value=1), sql_constraints=False)
+    tree = ast.parse(render_model(spec.models[0], use_sql_constraints=False))
+    strings = {node.value for node in ast.walk(tree) if isinstance(node, ast.Constant)}
+    assert "La longitud de Owner's name {max} debe estar entre 1 y 5 caracteres" in strings
+    # The label is a plain string, not part of an f-string
+    assert not any(isinstance(node, ast.FormattedValue) and isinstance(node.value, ast.Name)
+                   and node.value.id == 'max' for node in ast.walk(tree))
+    methods = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+    assert methods == ['_check_validations']
+
+
+def test_field_arguments_and_order_are_valid_python(make_spec):
+    spec = make_spec(FieldSpec('kind', 'Selection', string="Kind's", selection=[("a'b", 'A "b"')]))
+    spec.models[0].order = "name desc, id"
+    tree = ast.parse(render_model(spec.models[0]))
+    strings = {node.value for node in ast.walk(tree) if isinstance(node, ast.Constant)}
+    assert {"Kind's", "a'b", 'A "b"', 'name desc, id'} <= strings
+
+
+def test_search_view_escapes_labels_and_keys(make_spec):
+    spec = make_spec(FieldSpec('kind', 'Selection', string='Kind & Co',
+                               selection=[("a'b", 'A & <b>'), ('a"b', 'Q')],
+                               filterable=True, groupable=True))
+    root = ET.fromstring(render_views(spec.models[0]))
+    filters = {node.get('name'): node for node in root.iter('filter')}
+    assert set(filters) == {'filter_kind_a_b', 'filter_kind_a_b_', 'group_by_kind'}
+    assert filters['filter_kind_a_b'].get('string') == 'A & <b>'
+    assert ast.literal_eval(filters['filter_kind_a_b'].get('domain')) == [('kind', '=', "a'b")]
+    assert ast.literal_eval(filters['filter_kind_a_b_'].get('domain')) == [('kind', '=', 'a"b')]
+    assert filters['group_by_kind'].get('string') == 'Kind & Co'
+
+
+def test_progress_and_file_count(library_spec, tmp_path):
+    handled = []
+    generate_module(library_spec, str(tmp_path), progress=handled.append)
+    files = render_module(library_spec)
+    assert handled == list(files)
+    assert module_file_count(library_spec) == len(files)
@@ -0,0 +1,44 @@
+import os
+
+from odoomaster import FieldSpec, generate_module, import_module, import_modules, render_module
+from odoomaster.importer import find_modules
+
+
+def round_trip(spec, output_dir):
+    generate_module(spec, str(output_dir))
+    imported, warnings = import_module(os.path.join(str(output_dir), spec.name))
+    assert warnings == []
+    return imported
+
+
+def test_library_round_trip(library_spec, tmp_path):
+    imported = round_trip(library_spec, tmp_path)
+    assert imported.to_dict() == library_spec.to_dict()
+    assert render_module(imported) == render_module(library_spec)
+
+
+def test_addons_directory(library_spec, make_spec, tmp_path):
+    generate_module(library_spec, str(tmp_path))
+    generate_module(make_spec(), str(tmp_path))
+    results = import_modules(find_modules(str(tmp_path)), workers=2)
+    assert sorted(spec.name for spec, _ in results) == ['library', 'test_module']
+
+
+def test_one_sided_rules_round_trip(make_spec, tmp_path):
+    for sql_constraints in (True, False):
+        spec = make_spec(FieldSpec('qty', 'Integer', min_value=0),
+                         FieldSpec('code', 'Char', max_length=20, unique=True),
+                         sql_constraints=sql_constraints)
+        imported = round_trip(spec, tmp_path / str(sql_constraints))
+        qty, code = imported.models[0].fields
+        assert (qty.min_value, qty.max_value) == (0, None)
+        assert (code.min_length, code.max_length, code.unique) == (None, 20, True)
+        assert render_module(imported) == render_module(spec)
+
+
+def test_depends_round_trip(make_spec, tmp_path):
+    spec = make_spec(FieldSpec('order_id', 'Many2one', comodel='sale.order'), depends=['mail'])
+    imported = round_trip(spec, tmp_path)
+    # The addon of the comodel comes back as an explicit depend
+    assert imported.depends == ['mail', 'sale']
+    assert render_module(imported) == render_module(spec)
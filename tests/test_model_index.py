@@ -0,0 +1,96 @@
+import os
+
+from odoomaster import FieldSpec, ModelIndex
+from odoomaster.model_index import comodel_modules, default_index_path, model_module, scan_models
+from odoomaster.validation import validate_spec
+
+
+def write_model(path, source):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(source)
+
+
+def test_scan_models(tmp_path):
+    path = str(tmp_path / 'models.py')
+    write_model(path, "class A:\n    _name = 'x.a'\n    _inherit = ['mail.thread', 'x.b']\n"
+                      "class B:\n    _inherit = 'res.partner'\n")
+    assert scan_models(path) == (['mail.thread', 'res.partner', 'x.a', 'x.b'], ['x.a'])
+    write_model(path, "def broken(:\n    _name = 'x'\n")
+    assert scan_models(path) == ([], [])
+
+
+def test_refresh_is_incremental(tmp_path, cache_home):
+    addons = tmp_path / 'addons'
+    write_model(str(addons / 'a' / 'models' / 'a.py'), "class A:\n    _name = 'x.a'\n")
+    write_model(str(addons / 'b' / 'models' / 'b.py'), "class B:\n    _name = 'x.b'\n")
+    write_model(str(addons / 'b' / 'tests' / 't.py'), "class T:\n    _name = 'x.test'\n")
+
+    index = ModelIndex()
+    assert index.path == default_index_path()
+    assert default_index_path().startswith(str(cache_home))
+    stats = index.refresh([str(addons)])
+    assert (stats.scanned, stats.parsed, stats.removed) == (2, 2, 0)
+    assert index.models() == ['x.a', 'x.b']
+    index.save()
+
+    index = ModelIndex.load()
+    stats = index.refresh([str(addons)])
+    assert (stats.scanned, stats.parsed, stats.removed) == (2, 0, 0)
+
+    write_model(str(addons / 'a' / 'models' / 'a.py'), "class A:\n    _name = 'x.aa'\n")
+    os.remove(str(addons / 'b' / 'models' / 'b.py'))
+    stats = index.refresh([str(addons)])
+    assert (stats.scanned, stats.parsed, stats.removed) == (1, 1, 1)
+    assert index.models() == ['x.aa']
+
+
+def test_complete(tmp_path):
+    index = ModelIndex(str(tmp_path / 'index.json'))
+    index.files = {'a.py': [0, 0, ['res.partner', 'res.users', 'sale.order']]}
+    assert index.complete('res.') == ['res.partner', 'res.users']
+    assert index.complete('res.', limit=1) == ['res.partner']
+    assert index.complete('stock') == []
+    assert 'sale.order' in index
+    assert 'sale' not in index
+
+
+def test_other_version_is_ignored(tmp_path):
+    path = tmp_path / 'index.json'
+    path.write_text('{"version": 0, "files": {"a.py": [0, 0, ["x.a"]]}}')
+    assert ModelIndex.load(str(path)).models() == []
+
+
+def test_module_of_defining_addon(tmp_path):
+    addons = tmp_path / 'addons'
+    write_model(str(addons / 'library' / 'models' / 'book.py'), "class A:\n    _name = 'x.book'\n")
+    write_model(str(addons / 'loans' / 'models' / 'book.py'),
+                "class A:\n    _name = 'x.book'\n    _inherit = 'x.book'\n")
+    index = ModelIndex(str(tmp_path / 'index.json'))
+    index.refresh([str(addons)])
+    assert index.module_of('x.book') == 'library'
+    assert index.module_of('x.loan') is None
+
+    assert model_module('x.book', index) == 'library'
+    assert model_module('sale.order', index) == 'sale'
+    assert model_module('res.partner', index) == 'base'
+    assert model_module('x.unknown', index) is None
+
+
+def test_comodel_addons_reach_depends_or_validation(tmp_path, make_spec):
+    addons = tmp_path / 'addons'
+    write_model(str(addons / 'library' / 'models' / 'book.py'), "class A:\n    _name = 'x.book'\n")
+    index = ModelIndex()
+    index.refresh([str(addons)])
+    index.save()
+
+    spec = make_spec(FieldSpec('book_id', 'Many2one', comodel='x.book'),
+                     FieldSpec('order_id', 'Many2one', comodel='sale.order'),
+                     FieldSpec('parent_id', 'Many2one', comodel='test.item'),
+                     FieldSpec('tag_id', 'Many2one', comodel='x.tag'))
+    assert comodel_modules(spec) == {'sale.order': 'sale', 'x.book': 'library', 'x.tag': None}
+    assert [str(issue) for issue in validate_spec(spec)] == [
+        "test.item: field 'tag_id': comodel 'x.tag' is not defined by this module or a known addon, "
+        "add its addon to depends or index its addons path"]
+    spec.depends = ['tags']
+    assert validate_spec(spec) == []
@@ -0,0 +1,46 @@
+import pstats
+
+from odoomaster import generate_bash_script, generate_module, render_module
+from odoomaster.profiling import GenerationStats, profiled, timed
+
+
+def test_generation_stats(library_spec, tmp_path):
+    stats = GenerationStats()
+    with timed(stats):
+        files = render_module(library_spec, stats)
+        generate_module(library_spec, str(tmp_path), files, stats)
+        generate_bash_script(library_spec, str(tmp_path), None, stats)
+
+    assert list(stats.phases) == ['generate_manifest', 'generate_models', 'generate_security',
+                                  'generate_views', 'generate_menu_views', 'write_module',
+                                  'bash_script']
+    rendered = sum(stats.phases[phase].files for phase in list(stats.phases)[:5])
+    # The script renders every file a second time
+    assert rendered == 2 * len(files)
+    assert stats.phases['write_module'].files == len(files)
+    assert stats.phases['write_module'].bytes == sum(len(content) for content in files.values())
+    assert sorted(stats.models) == sorted(model.name for model in library_spec.models)
+    assert stats.total > 0
+
+    text = stats.format(models=1)
+    assert text.splitlines()[0].split() == ['phase', 'time', 'files', 'bytes']
+    assert 'slowest models:' in text
+
+
+def test_phase_context_manager():
+    stats = GenerationStats()
+    with stats.phase('copy') as phase:
+        phase.files, phase.bytes = 2, 10
+    with stats.phase('copy') as phase:
+        phase.files = 1
+    assert (stats.phases['copy'].files, stats.phases['copy'].bytes) == (3, 10)
+
+
+def test_profiled(tmp_path):
+    path = str(tmp_path / 'run.prof')
+    with profiled(path) as profiler:
+        assert profiler is not None
+        sum(range(1000))
+    assert pstats.Stats(path).total_calls > 0
+    with profiled(None) as profiler:
+        assert profiler is None
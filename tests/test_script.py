@@ -0,0 +1,45 @@
+import io
+import os
+import stat
+
+import pytest
+
+from odoomaster import generate_bash_script, render_module
+from odoomaster.generator import iter_module_files
+from odoomaster.script import write_bash_script
+from odoomaster.writer import staged_file
+
+
+def test_streamed_script_matches_rendered_files(library_spec):
+    streamed = io.BytesIO()
+    write_bash_script(streamed, library_spec, iter_module_files(library_spec))
+    rendered = io.BytesIO()
+    write_bash_script(rendered, library_spec, render_module(library_spec).items())
+    assert streamed.getvalue() == rendered.getvalue()
+
+    script = streamed.getvalue()
+    for rel_path, content in render_module(library_spec).items():
+        assert f'$MODULE_NAME/{rel_path}"\n'.encode('utf-8') + content in script
+    assert script.count(b'sudo mkdir -p "$ADDONS_PATH/$MODULE_NAME/views"\n') == 1
+
+
+def test_identical_script_is_left_untouched(library_spec, tmp_path):
+    script_path = generate_bash_script(library_spec, str(tmp_path))
+    assert stat.S_IMODE(os.stat(script_path).st_mode) == 0o755
+    before = os.stat(script_path)
+
+    generate_bash_script(library_spec, str(tmp_path))
+    after = os.stat(script_path)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+    assert os.listdir(tmp_path) == [os.path.basename(script_path)]
+
+
+def test_staged_file_keeps_the_old_file_on_error(tmp_path):
+    path = tmp_path / 'out.sh'
+    path.write_bytes(b'old\n')
+    with pytest.raises(RuntimeError):
+        with staged_file(str(path)) as f:
+            f.write(b'new\n')
+            raise RuntimeError('boom')
+    assert path.read_bytes() == b'old\n'
+    assert os.listdir(tmp_path) == ['out.sh']
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from odoomaster import ModuleSpec, SpecError, load_spec, save_spec
+
+
+def test_save_and_load_round_trip(library_spec, tmp_path):
+    library_spec.demo_rows = 10
+    library_spec.depends = ['mail']
+    path = str(tmp_path / 'library.json')
+    save_spec(library_spec, path)
+    assert load_spec(path).to_dict() == library_spec.to_dict()
+
+
+def test_compact_save_leaves_no_temporary_file(library_spec, tmp_path):
+    path = tmp_path / 'library.json'
+    save_spec(library_spec, str(path), indent=None)
+    assert '\n' not in path.read_text().rstrip('\n')
+    assert [p.name for p in tmp_path.iterdir()] == ['library.json']
+    assert load_spec(str(path)).to_dict() == library_spec.to_dict()
+
+
+def test_name_is_required_unless_partial():
+    with pytest.raises(SpecError):
+        ModuleSpec.from_dict({'models': []})
+    assert ModuleSpec.from_dict({'models': []}, partial=True).name == ''
+
+
+@pytest.mark.parametrize('data', [
+    [],
+    {'name': 'mod', 'models': [1]},
+    {'name': 'mod', 'models': [{'name': 'a.b', 'fields': ['qty']}]},
+    {'name': 'mod', 'models': [{'name': 'a.b', 'fields': [{'name': 'qty', 'type': 'Money'}]}]},
+    {'name': 'mod', 'demo_rows': 'many'},
+])
+def test_malformed_specs_raise_spec_error(data, tmp_path):
+    path = tmp_path / 'spec.json'
+    path.write_text(json.dumps(data))
+    with pytest.raises(SpecError):
+        load_spec(str(path), partial=True)
+
+
+def test_invalid_json_raises_spec_error(tmp_path):
+    path = tmp_path / 'spec.json'
+    path.write_text('{"name": ')
+    with pytest.raises(SpecError):
+        load_spec(str(path))
@@ -0,0 +1,67 @@
+import ast
+
+import pytest
+
+from odoomaster import FieldSpec, ModelSpec, ModuleSpec, save_spec
+from odoomaster.suite import SuiteError, build_suite, generate_suite
+
+
+def write_specs(tmp_path, *specs):
+    paths = []
+    for spec in specs:
+        path = str(tmp_path / f'{spec.name}.json')
+        save_spec(spec, path)
+        paths.append(path)
+    return paths
+
+
+def module(name, model, *comodels, fields=()):
+    fields = [FieldSpec('name')] + list(fields) + \
+        [FieldSpec(f'link{n}_id', 'Many2one', comodel=comodel) for n, comodel in enumerate(comodels)]
+    return ModuleSpec(name, models=[ModelSpec(model, fields)])
+
+
+def test_levels_follow_the_many2one_comodels(tmp_path):
+    suite = build_suite(write_specs(tmp_path,
+                                    module('sales', 'x.order', 'x.partner', 'x.product'),
+                                    module('partners', 'x.partner'),
+                                    module('products', 'x.product', 'x.partner')))
+    assert suite.levels() == [['partners'], ['products'], ['sales']]
+    assert suite.reasons[('sales', 'partners')] == 'x.order.link0_id -> x.partner'
+
+
+def test_generated_manifests_depend_on_the_suite_modules(tmp_path):
+    sales = module('sales', 'x.order', 'x.partner', 'sale.order')
+    sales.depends = ['mail']
+    suite = build_suite(write_specs(tmp_path, sales, module('partners', 'x.partner')))
+    summary = generate_suite(suite, str(tmp_path / 'out'), workers=1, with_script=False)
+    assert not summary.failed
+    manifest = ast.literal_eval((tmp_path / 'out' / 'sales' / '__manifest__.py').read_text())
+    assert manifest['depends'] == ['base', 'mail', 'partners', 'sale']
+
+
+def test_cycles_are_reported(tmp_path):
+    suite = build_suite(write_specs(tmp_path,
+                                    module('a', 'x.a', 'x.b'),
+                                    module('b', 'x.b', 'x.c'),
+                                    module('c', 'x.c', 'x.a')))
+    assert suite.cycles() == [['a', 'b', 'c', 'a']]
+    with pytest.raises(SuiteError, match='dependency cycle: a -> b -> c -> a'):
+        suite.levels()
+
+
+def test_model_defined_twice(tmp_path):
+    with pytest.raises(SuiteError):
+        build_suite(write_specs(tmp_path, module('a', 'x.a'), module('b', 'x.a')))
+
+
+def test_failed_dependency_blocks_dependents(tmp_path):
+    broken = module('partners', 'x.partner', fields=[FieldSpec('class')])
+    suite = build_suite(write_specs(tmp_path, broken, module('sales', 'x.order', 'x.partner'),
+                                    module('other', 'x.other')))
+    summary = generate_suite(suite, str(tmp_path / 'out'), workers=2, with_script=False)
+    results = {result.module_name: result for result in summary.results}
+    assert results['other'].ok
+    assert not results['partners'].ok
+    assert results['sales'].error == 'not generated, depends on failed partners'
+    assert not (tmp_path / 'out' / 'sales').exists()
@@ -0,0 +1,53 @@
+import pytest
+
+from odoomaster import render_module
+from odoomaster.template import (TEMPLATE_PATH_ENV, Template, TemplateError, get_template,
+                                 render, set_template_dirs)
+
+
+@pytest.fixture(autouse=True)
+def builtin_templates():
+    set_template_dirs(None)
+    yield
+    set_template_dirs(None)
+
+
+def test_render():
+    template = Template('t', "{{name}} = {'a': {{ value }}}\n")
+    assert template.variables == {'name', 'value'}
+    assert template.render(name='x', value=1) == "x = {'a': 1}"
+    assert template.render({'name': 'x', 'value': 1}, value=2) == "x = {'a': 2}"
+    assert template.render_rows(('value', 'name', 'other'), [(1, 'a', 0), (2, 'b', 0)]) \
+        == "a = {'a': 1}b = {'a': 2}"
+
+
+def test_errors():
+    with pytest.raises(TemplateError, match='no value for {{value}}'):
+        Template('t', '{{name}} {{value}}').render(name='x')
+    with pytest.raises(TemplateError, match='no value for {{value}}'):
+        Template('t', '{{name}} {{value}}').render_rows(('name',), [('x',)])
+    with pytest.raises(TemplateError, match='reserved word'):
+        Template('t', '{{class}}')
+    with pytest.raises(TemplateError, match="'missing' not found"):
+        get_template('missing')
+
+
+def test_user_templates_override_the_builtin_ones(library_spec, tmp_path, monkeypatch):
+    builtin = render_module(library_spec)['security/ir.model.access.csv']
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    first.mkdir()
+    second.mkdir()
+    (second / 'security_rule.tmpl').write_text('{{model_id}}\n')
+    monkeypatch.setenv(TEMPLATE_PATH_ENV, str(second))
+    set_template_dirs(None)
+    assert render('security_rule', model_id='x') == 'x'
+
+    # Directories given explicitly come before the environment
+    (first / 'security_rule.tmpl').write_text('first {{model_id}}\n')
+    set_template_dirs([str(first)])
+    assert render('security_rule', model_id='x') == 'first x'
+    assert render_module(library_spec)['security/ir.model.access.csv'] != builtin
+
+    monkeypatch.delenv(TEMPLATE_PATH_ENV)
+    set_template_dirs(None)
+    assert render_module(library_spec)['security/ir.model.access.csv'] == builtin
@@ -0,0 +1,80 @@
+import pytest
+
+from odoomaster import FieldSpec, ModelSpec, SpecError, SpecValidator, check_spec, validate_spec
+
+
+def messages(spec):
+    return [str(issue) for issue in validate_spec(spec)]
+
+
+def test_valid_spec_has_no_issues(library_spec):
+    assert validate_spec(library_spec) == []
+    check_spec(library_spec)
+
+
+def test_field_issues(make_spec):
+    spec = make_spec(FieldSpec('class'), FieldSpec('id'), FieldSpec('qty'), FieldSpec('qty'),
+                     FieldSpec('partner_id', 'Many2one'), FieldSpec('state', 'Selection'))
+    assert messages(spec) == [
+        "test.item: field 'class': not a valid Python identifier",
+        "test.item: field 'id': reserved by Odoo",
+        "test.item: field 'qty': duplicate field name, also in row 3",
+        "test.item: field 'partner_id': Many2one fields need a comodel",
+        "test.item: field 'state': Selection fields need at least one option",
+    ]
+
+
+def test_bounds_that_are_not_numbers_are_issues(make_spec):
+    spec = make_spec(FieldSpec('ratio', 'Float', min_value=0.5, max_value='x'),
+                     FieldSpec('qty', 'Integer', min_value=5, max_value=1),
+                     FieldSpec('code', 'Char', min_length=True))
+    assert messages(spec) == [
+        "test.item: field 'ratio': maximum value 'x' is not a number",
+        "test.item: field 'qty': minimum value 5 is greater than the maximum 1",
+        "test.item: field 'code': minimum length True is not a number",
+    ]
+    with pytest.raises(SpecError):
+        check_spec(spec)
+
+
+def test_one_sided_rule_is_valid(make_spec):
+    assert messages(make_spec(FieldSpec('qty', 'Integer', min_value=5000), demo_rows=10)) == []
+
+
+def test_size_order_and_limit_must_be_well_formed(make_spec):
+    spec = make_spec(FieldSpec('code', 'Char', size='10'))
+    spec.models[0].order = "name; drop table"
+    spec.models[0].limit = -5
+    assert messages(spec) == [
+        "test.item: order 'name; drop table' must be field names separated by commas, "
+        "each one optionally followed by asc or desc",
+        "test.item: limit -5 is not a positive integer",
+        "test.item: field 'code': size '10' is not a positive integer",
+    ]
+    spec.models[0].order = 'date DESC, id'
+    spec.models[0].limit = 40
+    spec.models[0].fields[0].size = 10
+    assert messages(spec) == []
+
+
+def test_demo_rows_that_do_not_fit_the_rules(make_spec):
+    spec = make_spec(FieldSpec('code', 'Char', max_length=2, unique=True), demo_rows=100)
+    assert messages(spec) == ["test.item: field 'code': only 99 distinct demo values fit in 2 "
+                              "characters, 100 demo records were asked for"]
+    spec.demo_rows = 99
+    assert messages(spec) == []
+
+
+def test_colliding_models_are_revalidated_incrementally():
+    validator = SpecValidator()
+    validator.set_module('mod')
+    validator.update_model(0, ModelSpec('a.book', [FieldSpec('name')]))
+    validator.update_model(1, ModelSpec('b.other', [FieldSpec('name')]))
+    assert validator.issues(0) == []
+
+    affected = validator.update_model(1, ModelSpec('b.book', [FieldSpec('name')]))
+    assert affected == {0, 1}
+    assert [issue.message for issue in validator.issues(0)] == ["file 'models/book.py' and 1 more also used by b.book"]
+
+    validator.update_model(1, ModelSpec('b.other', [FieldSpec('name')]))
+    assert validator.issues(0) == []
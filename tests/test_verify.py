@@ -0,0 +1,54 @@
+import os
+
+from odoomaster import generate_module, verify_module
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def make_module(root, models_source, access_rows):
+    module = os.path.join(str(root), 'mod')
+    write(os.path.join(module, '__manifest__.py'), "{'name': 'mod', 'data': ['security/ir.model.access.csv']}\n")
+    write(os.path.join(module, 'models', 'a.py'), models_source)
+    write(os.path.join(module, 'security', 'ir.model.access.csv'), 'id,model_id:id\n' + access_rows)
+    return module
+
+
+def test_generated_module_is_ok(library_spec, tmp_path):
+    library_spec.demo_rows = 20
+    report = generate_module(library_spec, str(tmp_path))
+    result = verify_module(report.module_path)
+    assert result.ok, result.problems
+
+
+def test_syntax_error_and_missing_reference(library_spec, tmp_path):
+    report = generate_module(library_spec, str(tmp_path))
+    write(os.path.join(report.module_path, 'models', 'book.py'), 'class Book(:\n')
+    problems = verify_module(report.module_path).problems
+    assert problems[0].startswith('models/book.py: line 1:')
+    assert "security/ir.model.access.csv: reference 'model_library_book' is not defined" in problems
+
+
+def test_tuple_inherit_defines_models(tmp_path):
+    module = make_module(tmp_path, "class A:\n    _inherit = ('x.y', 'z.w')\n",
+                         'access_x,model_x_y\naccess_z,model_z_w\n')
+    assert verify_module(module).ok
+
+
+def test_bad_name_literal_is_one_problem(tmp_path):
+    module = make_module(tmp_path, "class A:\n    _name = {[]: 1}\n", '')
+    assert verify_module(module).problems == [
+        'models/a.py: line 2: _name must be a model name or a list of model names']
+
+
+def test_numbered_references(tmp_path):
+    module = make_module(tmp_path, "class A:\n    _name = 'x.y'\n", 'access_x,model_x_y\n')
+    write(os.path.join(module, '__manifest__.py'),
+          "{'name': 'mod', 'data': ['security/ir.model.access.csv'], 'demo': ['demo/x.y.csv']}\n")
+    rows = ''.join(f'demo_x_{n},demo_x_{n - 1}\n' for n in range(2, 101))
+    write(os.path.join(module, 'demo', 'x.y.csv'),
+          'id,parent_id:id\ndemo_x_1,\n' + rows + 'demo_y_1,demo_x_150\n')
+    assert verify_module(module).problems == ["demo/x.y.csv: reference 'demo_x_150' is not defined"]
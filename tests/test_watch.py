@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+import pytest
+
+from odoomaster import RenderCache, render_module, save_spec
+from odoomaster.watch import InotifyWatcher, PollingWatcher, SpecWatch, wait_for_changes
+
+
+def test_render_cache_renders_only_changed_models(library_spec):
+    cache = RenderCache()
+    files = render_module(library_spec, cache=cache)
+    assert files == render_module(library_spec)
+    assert len(cache.rendered) == len(library_spec.models)
+
+    render_module(library_spec, cache=cache)
+    assert cache.rendered == []
+    model = library_spec.models[0]
+    model.order = 'id desc'
+    assert render_module(library_spec, cache=cache) == render_module(library_spec)
+    assert cache.rendered == [model.name]
+
+
+def test_spec_watch_keeps_going_after_a_bad_save(library_spec, tmp_path):
+    spec_path = tmp_path / 'library.json'
+    save_spec(library_spec, str(spec_path))
+    watch = SpecWatch(str(spec_path), str(tmp_path / 'out'))
+    result = watch.generate()
+    assert result.ok, (result.error, result.problems)
+    assert os.path.isfile(tmp_path / 'out' / 'create_library_module.sh')
+
+    spec_path.write_text('{"name": ')
+    result = watch.generate()
+    assert result.error.startswith('SpecError: ')
+
+    library_spec.models[0].order = 'id desc'
+    save_spec(library_spec, str(spec_path))
+    result = watch.generate()
+    assert result.ok and result.rendered == [library_spec.models[0].name]
+    assert result.report.updated == [f'models/{library_spec.models[0].short_name}.py']
+
+
+def test_polling_watcher_sees_rewrites(tmp_path):
+    path = tmp_path / 'spec.json'
+    path.write_text('{}')
+    watcher = PollingWatcher([str(path)], interval=0.01)
+    assert watcher.changes(0.05) == set()
+    path.write_text('{"name": "x"}')
+    assert watcher.changes(1) == {str(path)}
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is Linux only')
+def test_inotify_watcher_sees_a_rename_over_the_file(tmp_path):
+    path = tmp_path / 'spec.json'
+    path.write_text('{}')
+    watcher = InotifyWatcher([str(path)])
+    try:
+        # An editor saving through a temporary file: one change for the burst
+        (tmp_path / 'other.json').write_text('{}')
+        tmp = tmp_path / 'spec.json.tmp'
+        tmp.write_text(json.dumps({'name': 'x'}))
+        os.replace(tmp, path)
+        assert wait_for_changes(watcher, debounce=0.05) == {str(path)}
+    finally:
+        watcher.close()
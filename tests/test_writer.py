@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+from odoomaster.writer import STATE_FILE, write_module
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_statuses_and_untouched_files(tmp_path):
+    module = str(tmp_path / 'mod')
+    report = write_module(module, {'a.py': b'a\n', 'views/b.xml': b'<b/>\n'})
+    assert (report.created, report.updated, report.deleted) == (['a.py', 'views/b.xml'], [], [])
+    assert os.path.isfile(os.path.join(module, STATE_FILE))
+
+    mtime = os.stat(os.path.join(module, 'a.py')).st_mtime_ns
+    report = write_module(module, {'a.py': b'a\n', 'views/c.xml': b'<c/>\n'})
+    assert report.unchanged == ['a.py']
+    assert report.created == ['views/c.xml']
+    assert report.deleted == ['views/b.xml']
+    assert os.stat(os.path.join(module, 'a.py')).st_mtime_ns == mtime
+
+    report = write_module(module, {'a.py': b'A\n', 'views/c.xml': b'<c/>\n'})
+    assert report.updated == ['a.py']
+    assert read(os.path.join(module, 'a.py')) == b'A\n'
+    assert not report.deleted
+
+
+def test_removed_files_take_their_empty_directories(tmp_path):
+    module = str(tmp_path / 'mod')
+    write_module(module, {'a.py': b'a\n', 'views/b.xml': b'<b/>\n'})
+    write_module(module, {'a.py': b'a\n'})
+    assert not os.path.exists(os.path.join(module, 'views'))
+
+
+def test_files_changed_by_hand_are_rewritten(tmp_path):
+    module = str(tmp_path / 'mod')
+    write_module(module, {'a.py': b'a\n'})
+    with open(os.path.join(module, 'a.py'), 'wb') as f:
+        f.write(b'edited\n')
+    assert write_module(module, {'a.py': b'a\n'}).updated == ['a.py']
+    assert read(os.path.join(module, 'a.py')) == b'a\n'
+
+
+def test_unchanged_files_keep_their_inode(tmp_path):
+    module = str(tmp_path / 'mod')
+    write_module(module, {'a.py': b'a\n', 'b.py': b'b\n'})
+    inode = os.stat(os.path.join(module, 'a.py')).st_ino
+    report = write_module(module, {'a.py': b'a\n', 'b.py': b'B\n'})
+    assert report.updated == ['b.py']
+    assert os.stat(os.path.join(module, 'a.py')).st_ino == inode
+    # No staging directory is left behind
+    assert os.listdir(tmp_path) == ['mod']
+
+
+def test_foreign_files_are_carried_over(tmp_path):
+    module = tmp_path / 'mod'
+    write_module(str(module), {'a.py': b'a'})
+    (module / 'static').mkdir()
+    (module / 'static' / 'icon.png').write_bytes(b'png')
+    write_module(str(module), {'a.py': b'changed'})
+    assert (module / 'static' / 'icon.png').read_bytes() == b'png'
+    assert (module / 'a.py').read_bytes() == b'changed'
+
+
+def test_failed_write_leaves_the_module_untouched(tmp_path):
+    module = tmp_path / 'mod'
+    write_module(str(module), {'a.py': b'old'})
+    # 'a.py' cannot be both a file and a directory
+    with pytest.raises(OSError):
+        write_module(str(module), {'a.py': b'new', 'a.py/b.py': b'b'})
+    assert (module / 'a.py').read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['mod']
+
+
+def test_failed_check_leaves_the_module_untouched(tmp_path):
+    module = tmp_path / 'mod'
+    write_module(str(module), {'a.py': b'old'})
+
+    def check(tree):
+        assert read(os.path.join(tree, 'a.py')) == b'new'
+        raise RuntimeError('rejected')
+
+    with pytest.raises(RuntimeError):
+        write_module(str(module), {'a.py': b'new'}, check=check)
+    assert (module / 'a.py').read_bytes() == b'old'
+    # No staging directory is left behind
+    assert sorted(os.listdir(tmp_path)) == ['mod']
+
+
+def test_streams_are_written_only_when_their_signature_changes(tmp_path):
+    module = tmp_path / 'mod'
+    calls = []
+
+    def write(f):
+        calls.append(1)
+        f.write(b'x' * 10)
+
+    report = write_module(str(module), {'a.py': b'a'}, streams=[('data/big.csv', 'v1', write)])
+    assert report.created == ['a.py', 'data/big.csv'] and len(calls) == 1
+    report = write_module(str(module), {'a.py': b'a'}, streams=[('data/big.csv', 'v1', write)])
+    assert report.unchanged == ['a.py', 'data/big.csv'] and len(calls) == 1
+    report = write_module(str(module), {'a.py': b'a'}, streams=[('data/big.csv', 'v2', write)])
+    # Written again, but the bytes are the same
+    assert 'data/big.csv' in report.unchanged and len(calls) == 2
+    report = write_module(str(module), {'a.py': b'a'})
+    assert report.deleted == ['data/big.csv']
+    assert not (module / 'data' / 'big.csv').exists()
+
+
+def test_failed_stream_leaves_the_module_untouched(tmp_path):
+    module = tmp_path / 'mod'
+    write_module(str(module), {'a.py': b'old'})
+
+    def write(f):
+        f.write(b'partial')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        write_module(str(module), {'a.py': b'new'}, streams=[('data/big.csv', 'v1', write)])
+    assert sorted(os.listdir(module)) == ['.odoomaster_state.json', 'a.py']
+    assert (module / 'a.py').read_bytes() == b'old'